@@ -0,0 +1,74 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pecan
+
+from zun.api.controllers import base
+from zun.api.controllers.v1.views import container_actions_view as view
+from zun.common import exception
+from zun.common import policy
+from zun.common import utils
+from zun import objects
+
+
+def check_policy_on_container(container, action):
+    context = pecan.request.context
+    policy.enforce(context, action, container, action=action)
+
+
+class ContainerActionsController(base.Controller):
+    """Controller for the actions performed on a container."""
+
+    @pecan.expose('json')
+    @base.Controller.api_version("1.13")
+    @exception.wrap_pecan_controller_exception
+    def get_all(self, container_ident, **kwargs):
+        """Retrieve a list of the actions performed on a container.
+
+        :param container_ident: UUID or name of a container.
+        """
+        context = pecan.request.context
+        container = utils.get_container(container_ident)
+        check_policy_on_container(container.as_dict(),
+                                  "container:action:get_all")
+        actions = objects.ContainerAction.get_by_container_uuid(
+            context, container.uuid)
+        return {'container_actions': [view.format_action(action)
+                                      for action in actions]}
+
+    @pecan.expose('json')
+    @base.Controller.api_version("1.13")
+    @exception.wrap_pecan_controller_exception
+    def get_one(self, container_ident, request_id, **kwargs):
+        """Retrieve an action performed on a container and its events.
+
+        :param container_ident: UUID or name of a container.
+        :param request_id: the id of the request of the action.
+        """
+        context = pecan.request.context
+        container = utils.get_container(container_ident)
+        check_policy_on_container(container.as_dict(),
+                                  "container:action:get")
+        action = objects.ContainerAction.get_by_request_id(
+            context, container.uuid, request_id)
+        if action is None:
+            raise exception.ResourceNotFound(name="Action", id=request_id)
+
+        show_traceback = policy.enforce(
+            context, "container:action:events_traceback", do_raise=False,
+            action="container:action:events_traceback")
+        events = objects.ContainerActionEvent.get_by_action(context,
+                                                            action.id)
+        formatted = view.format_action(action)
+        formatted['events'] = [view.format_event(event, show_traceback)
+                               for event in events]
+        return formatted
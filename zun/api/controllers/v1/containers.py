@@ -22,6 +22,7 @@ import pecan
 from zun.api.controllers import base
 from zun.api.controllers import link
 from zun.api.controllers.v1 import collection
+from zun.api.controllers.v1 import container_actions
 from zun.api.controllers.v1.schemas import containers as schema
 from zun.api.controllers.v1.views import containers_view as view
 from zun.api.controllers import versions
@@ -100,6 +101,8 @@ class ContainersController(base.Controller):
         'network_attach': ['POST']
     }
 
+    container_actions = container_actions.ContainerActionsController()
+
     @pecan.expose('json')
     @exception.wrap_pecan_controller_exception
     def get_all(self, **kwargs):
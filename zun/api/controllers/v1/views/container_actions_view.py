@@ -0,0 +1,68 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import itertools
+
+from oslo_utils import timeutils
+
+
+_action_keys = (
+    'action',
+    'container_uuid',
+    'request_id',
+    'user_id',
+    'project_id',
+    'start_time',
+    'finish_time',
+    'message'
+)
+
+
+_event_keys = (
+    'event',
+    'start_time',
+    'finish_time',
+    'result',
+    'traceback'
+)
+
+
+def _duration(event):
+    start_time = event.get('start_time')
+    finish_time = event.get('finish_time')
+    if start_time is None or finish_time is None:
+        return None
+    return timeutils.delta_seconds(start_time, finish_time)
+
+
+def format_action(action):
+    def transform(key, value):
+        if key not in _action_keys:
+            return
+        yield (key, value)
+
+    return dict(itertools.chain.from_iterable(
+        transform(k, v) for k, v in action.as_dict().items()))
+
+
+def format_event(event, show_traceback=False):
+    def transform(key, value):
+        if key not in _event_keys:
+            return
+        if key == 'traceback' and not show_traceback:
+            return
+        yield (key, value)
+
+    formatted = dict(itertools.chain.from_iterable(
+        transform(k, v) for k, v in event.as_dict().items()))
+    formatted['duration'] = _duration(formatted)
+    return formatted
@@ -45,10 +45,11 @@ REST_API_VERSION_HISTORY = """REST API Version History:
     * 1.10 - Make delete container async
     * 1.11 - Add mounts to container create
     * 1.12 - Add support to stop container before delete
+    * 1.13 - Add container actions and their events
 """
 
 BASE_VER = '1.1'
-CURRENT_MAX_VER = '1.12'
+CURRENT_MAX_VER = '1.13'
 
 
 class Version(object):
@@ -77,11 +77,21 @@ class ContextHook(hooks.PecanHook):
 
 
 class RPCHook(hooks.PecanHook):
-    """Attach the rpcapi object to the request so controllers can get to it."""
+    """Attach the rpcapi object to the request so controllers can get to it.
+
+    The compute API, with its RPC client and scheduler, is built on the first
+    request and shared by all the requests served by the API worker. The
+    context of a request is passed to each of its calls.
+    """
+
+    def __init__(self):
+        super(RPCHook, self).__init__()
+        self._compute_api = None
 
     def before(self, state):
-        context = state.request.context
-        state.request.compute_api = compute_api.API(context)
+        if self._compute_api is None:
+            self._compute_api = compute_api.API()
+        state.request.compute_api = self._compute_api
 
 
 class NoExceptionTracebackHook(hooks.PecanHook):
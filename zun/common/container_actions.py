@@ -0,0 +1,54 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Possible actions on a container, and the events recorded within them.
+
+Actions are recorded by the compute API when a request is accepted. The
+compute manager records an event, with its start and finish time and its
+result, for each phase of the action it performs on the host.
+"""
+
+CREATE = 'create'
+DELETE = 'delete'
+START = 'start'
+STOP = 'stop'
+REBOOT = 'reboot'
+PAUSE = 'pause'
+UNPAUSE = 'unpause'
+KILL = 'kill'
+UPDATE = 'update'
+COMMIT = 'commit'
+ADD_SECURITY_GROUP = 'add_security_group'
+NETWORK_ATTACH = 'network_attach'
+NETWORK_DETACH = 'network_detach'
+
+# Phases of a container create
+EVENT_VOLUME_ATTACH = 'compute_volume_attach'
+EVENT_SANDBOX_CREATE = 'compute_sandbox_create'
+EVENT_IMAGE_PULL = 'compute_image_pull'
+EVENT_IMAGE_LOAD = 'compute_image_load'
+EVENT_NETWORK_PROVISION = 'compute_network_provision'
+EVENT_DOCKER_CREATE = 'compute_docker_create'
+EVENT_NETWORK_CONNECT = 'compute_network_connect'
+
+EVENT_START = 'compute_start'
+EVENT_DELETE = 'compute_delete'
+EVENT_STOP = 'compute_stop'
+EVENT_REBOOT = 'compute_reboot'
+EVENT_PAUSE = 'compute_pause'
+EVENT_UNPAUSE = 'compute_unpause'
+EVENT_KILL = 'compute_kill'
+EVENT_UPDATE = 'compute_update'
+EVENT_COMMIT = 'compute_commit'
+EVENT_ADD_SECURITY_GROUP = 'compute_add_security_group'
+EVENT_NETWORK_ATTACH = 'compute_network_attach'
+EVENT_NETWORK_DETACH = 'compute_network_detach'
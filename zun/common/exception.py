@@ -393,6 +393,11 @@ class ImageNotFound(Invalid):
     message = _("Image %(image)s could not be found.")
 
 
+class ImageChecksumMismatch(ZunException):
+    message = _("Checksum of image %(image)s downloaded from glance does "
+                "not match.")
+
+
 class ZunServiceNotFound(HTTPNotFound):
     message = _("Zun service %(binary)s on host %(host)s could not be found.")
 
@@ -563,6 +568,12 @@ class ResourcesUnavailable(ZunException):
     message = _("Insufficient compute resources: %(reason)s.")
 
 
+class ComputeQueueFull(ZunException):
+    message = _("Too many %(op_class)s operations are queued on host "
+                "%(host)s.")
+    code = 503
+
+
 class MakeFileSystemException(ZunException):
     message = _("Unexpected error while make file system")
 
@@ -607,6 +618,11 @@ class PciDevicePoolEmpty(ZunException):
         "from empty pool")
 
 
+class PciDeviceRequestFailed(ZunException):
+    message = _(
+        "PCI device request %(requests)s failed")
+
+
 class CapsuleAlreadyExists(ResourceExists):
     message = _("A capsule with %(field)s %(value)s already exists.")
 
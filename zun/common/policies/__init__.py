@@ -15,6 +15,7 @@ import itertools
 from zun.common.policies import base
 from zun.common.policies import capsule
 from zun.common.policies import container
+from zun.common.policies import container_action
 from zun.common.policies import host
 from zun.common.policies import image
 from zun.common.policies import network
@@ -25,6 +26,7 @@ def list_rules():
     return itertools.chain(
         base.list_rules(),
         container.list_rules(),
+        container_action.list_rules(),
         image.list_rules(),
         zun_service.list_rules(),
         host.list_rules(),
@@ -0,0 +1,62 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+from oslo_policy import policy
+
+from zun.common.policies import base
+
+CONTAINER_ACTION = 'container:action:%s'
+
+rules = [
+    policy.DocumentedRuleDefault(
+        name=CONTAINER_ACTION % 'get_all',
+        check_str=base.RULE_ADMIN_OR_OWNER,
+        description='List the actions performed on a container.',
+        operations=[
+            {
+                'path': '/v1/containers/{container_ident}/container_actions',
+                'method': 'GET'
+            }
+        ]
+    ),
+    policy.DocumentedRuleDefault(
+        name=CONTAINER_ACTION % 'get',
+        check_str=base.RULE_ADMIN_OR_OWNER,
+        description='Show an action performed on a container and the '
+                    'events recorded within it.',
+        operations=[
+            {
+                'path': '/v1/containers/{container_ident}/container_actions/'
+                        '{request_id}',
+                'method': 'GET'
+            }
+        ]
+    ),
+    policy.DocumentedRuleDefault(
+        name=CONTAINER_ACTION % 'events_traceback',
+        check_str=base.RULE_ADMIN_API,
+        description='Show the traceback of the failed events of a '
+                    'container action.',
+        operations=[
+            {
+                'path': '/v1/containers/{container_ident}/container_actions/'
+                        '{request_id}',
+                'method': 'GET'
+            }
+        ]
+    )
+]
+
+
+def list_rules():
+    return rules
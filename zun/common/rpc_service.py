@@ -22,10 +22,8 @@ from oslo_utils import importutils
 from zun.common import context
 from zun.common import profiler
 from zun.common import rpc
-from zun.compute import manager as compute_manager
 import zun.conf
 from zun.objects import base as objects_base
-from zun.service import periodic
 from zun.servicegroup import zun_service_periodic as servicegroup
 
 osprofiler = importutils.try_import("osprofiler.profiler")
@@ -62,11 +60,9 @@ class Service(service.Service):
 
     def start(self):
         servicegroup.setup(CONF, self.binary, self.tg)
-        periodic.setup(CONF, self.tg)
         for endpoint in self.endpoints:
-            if isinstance(endpoint, compute_manager.Manager):
-                endpoint.init_containers(
-                    context.get_admin_context(all_tenants=True))
+            if hasattr(endpoint, 'init_host'):
+                endpoint.init_host(self.tg)
             self.tg.add_dynamic_timer(
                 endpoint.run_periodic_tasks,
                 periodic_interval_max=CONF.periodic_interval_max,
@@ -74,6 +70,12 @@ class Service(service.Service):
             )
         self._server.start()
 
+    def reset(self):
+        for endpoint in self.endpoints:
+            if hasattr(endpoint, 'reset'):
+                endpoint.reset()
+        super(Service, self).reset()
+
     def stop(self):
         if self._server:
             self._server.stop()
@@ -102,13 +104,13 @@ class API(object):
                                            serializer=serializer,
                                            timeout=timeout)
 
-    def _call(self, server, method, *args, **kwargs):
+    def _call(self, context, server, method, *args, **kwargs):
         cctxt = self._client.prepare(server=server)
-        return cctxt.call(self._context, method, *args, **kwargs)
+        return cctxt.call(context, method, *args, **kwargs)
 
-    def _cast(self, server, method, *args, **kwargs):
+    def _cast(self, context, server, method, *args, **kwargs):
         cctxt = self._client.prepare(server=server)
-        return cctxt.cast(self._context, method, *args, **kwargs)
+        return cctxt.cast(context, method, *args, **kwargs)
 
     def echo(self, message):
-        self._cast('echo', message=message)
+        self._cast(self._context, 'echo', message=message)
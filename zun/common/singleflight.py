@@ -0,0 +1,61 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Duplicate call suppression."""
+
+import sys
+import threading
+
+from eventlet import event
+
+
+class SingleFlight(object):
+    """Suppresses duplicate concurrent calls.
+
+    While a call for a key is in flight, further calls with the same key
+    wait for it and receive its result, or its exception, instead of
+    running the function again.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = event.Event()
+                self._calls[key] = call
+
+        if not leader:
+            return call.wait()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            # NOTE: Also forward GreenletExit and the like, otherwise the
+            # waiters of a killed leader would wait forever.
+            call.send_exception(*sys.exc_info())
+            raise
+        else:
+            call.send(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
@@ -36,6 +36,7 @@ from zun.common import consts
 from zun.common import exception
 from zun.common.i18n import _
 import zun.conf
+from zun import objects
 
 CONF = zun.conf.CONF
 LOG = logging.getLogger(__name__)
@@ -153,6 +154,64 @@ def spawn_n(func, *args, **kwargs):
     eventlet.spawn_n(context_wrapper, *args, **kwargs)
 
 
+_container_actions_unsupported_logged = False
+
+
+def container_actions_supported():
+    """Return whether the database backend records container actions."""
+    global _container_actions_unsupported_logged
+    if CONF.db_type == 'sql':
+        return True
+    if not _container_actions_unsupported_logged:
+        _container_actions_unsupported_logged = True
+        LOG.debug('Container actions are not recorded with the %s '
+                  'database backend', CONF.db_type)
+    return False
+
+
+class EventReporter(object):
+    """Context manager to report container action events.
+
+    The start and finish of the event, and its result, are recorded in the
+    container actions of the current request. Failing to record an event
+    does not fail the operation.
+    """
+
+    def __init__(self, context, event_name, *container_uuids):
+        self.context = context
+        self.event_name = event_name
+        self.container_uuids = []
+        if container_actions_supported():
+            self.container_uuids = [uuid for uuid in container_uuids if uuid]
+        self._started = []
+
+    def __enter__(self):
+        for uuid in self.container_uuids:
+            try:
+                objects.ContainerActionEvent.event_start(
+                    self.context, uuid, self.event_name, want_result=False)
+                self._started.append(uuid)
+            except Exception as e:
+                LOG.warning('Failed to record the start of event %(event)s '
+                            'of container %(uuid)s: %(error)s',
+                            {'event': self.event_name, 'uuid': uuid,
+                             'error': six.text_type(e)})
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for uuid in self._started:
+            try:
+                objects.ContainerActionEvent.event_finish(
+                    self.context, uuid, self.event_name, exc_val=exc_val,
+                    exc_tb=exc_tb, want_result=False)
+            except Exception as e:
+                LOG.warning('Failed to record the finish of event '
+                            '%(event)s of container %(uuid)s: %(error)s',
+                            {'event': self.event_name, 'uuid': uuid,
+                             'error': six.text_type(e)})
+        return False
+
+
 def translate_exception(function):
     """Wraps a method to catch exceptions.
 
@@ -13,28 +13,49 @@
 """Handles all requests relating to compute resources (e.g. containers,
 networking and storage of containers, and compute hosts on which they run)."""
 
+from oslo_log import log as logging
+import six
+
 from zun.common import consts
+from zun.common import container_actions
 from zun.common import exception
 from zun.common import profiler
+from zun.common import utils
 from zun.compute import rpcapi
 import zun.conf
+from zun import objects
 from zun.scheduler import client as scheduler_client
 
 CONF = zun.conf.CONF
+LOG = logging.getLogger(__name__)
 
 
 @profiler.trace_cls("rpc")
 class API(object):
     """API for interacting with the compute manager."""
 
-    def __init__(self, context):
-        self.rpcapi = rpcapi.API(context=context)
+    def __init__(self):
+        self.rpcapi = rpcapi.API()
         self.scheduler_client = scheduler_client.SchedulerClient()
         super(API, self).__init__()
 
+    def _record_action_start(self, context, container_uuid, action):
+        if not utils.container_actions_supported():
+            return
+        try:
+            objects.ContainerAction.action_start(context, container_uuid,
+                                                 action, want_result=False)
+        except Exception as e:
+            LOG.warning('Failed to record action %(action)s of container '
+                        '%(uuid)s: %(error)s',
+                        {'action': action, 'uuid': container_uuid,
+                         'error': six.text_type(e)})
+
     def container_create(self, context, new_container, extra_spec,
                          requested_networks, requested_volumes, run,
                          pci_requests=None):
+        self._record_action_start(context, new_container.uuid,
+                                  container_actions.CREATE)
         host_state = None
         try:
             host_state = self._schedule_container(context, new_container,
@@ -67,24 +88,36 @@ class API(object):
         return dests[0]
 
     def container_delete(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.DELETE)
         return self.rpcapi.container_delete(context, container, *args)
 
     def container_show(self, context, container, *args):
         return self.rpcapi.container_show(context, container, *args)
 
     def container_reboot(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.REBOOT)
         return self.rpcapi.container_reboot(context, container, *args)
 
     def container_stop(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.STOP)
         return self.rpcapi.container_stop(context, container, *args)
 
     def container_start(self, context, container):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.START)
         return self.rpcapi.container_start(context, container)
 
     def container_pause(self, context, container):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.PAUSE)
         return self.rpcapi.container_pause(context, container)
 
     def container_unpause(self, context, container):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.UNPAUSE)
         return self.rpcapi.container_unpause(context, container)
 
     def container_logs(self, context, container, stdout, stderr,
@@ -99,9 +132,13 @@ class API(object):
         return self.rpcapi.container_exec_resize(context, container, *args)
 
     def container_kill(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.KILL)
         return self.rpcapi.container_kill(context, container, *args)
 
     def container_update(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.UPDATE)
         return self.rpcapi.container_update(context, container, *args)
 
     def container_attach(self, context, container, *args):
@@ -117,6 +154,8 @@ class API(object):
         return self.rpcapi.container_get_archive(context, container, *args)
 
     def add_security_group(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.ADD_SECURITY_GROUP)
         return self.rpcapi.add_security_group(context, container, *args)
 
     def container_put_archive(self, context, container, *args):
@@ -126,6 +165,8 @@ class API(object):
         return self.rpcapi.container_stats(context, container)
 
     def container_commit(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.COMMIT)
         return self.rpcapi.container_commit(context, container, *args)
 
     def image_pull(self, context, image):
@@ -137,6 +178,9 @@ class API(object):
 
     def capsule_create(self, context, new_capsule,
                        requested_networks=None, extra_spec=None):
+        for uuid in new_capsule.containers_uuids:
+            self._record_action_start(context, uuid,
+                                      container_actions.CREATE)
         host_state = None
         try:
             host_state = self._schedule_container(context, new_capsule,
@@ -150,10 +194,17 @@ class API(object):
                                    requested_networks, host_state['limits'])
 
     def capsule_delete(self, context, capsule, *args):
+        for uuid in capsule.containers_uuids:
+            self._record_action_start(context, uuid,
+                                      container_actions.DELETE)
         return self.rpcapi.capsule_delete(context, capsule, *args)
 
     def network_detach(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.NETWORK_DETACH)
         return self.rpcapi.network_detach(context, container, *args)
 
     def network_attach(self, context, container, *args):
+        self._record_action_start(context, container.uuid,
+                                  container_actions.NETWORK_ATTACH)
         return self.rpcapi.network_attach(context, container, *args)
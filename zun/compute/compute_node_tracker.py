@@ -13,31 +13,71 @@
 #    under the License.
 
 import collections
-import copy
+import time
 
 from oslo_log import log as logging
+from oslo_utils import excutils
+import six
 
 from zun.common import exception
 from zun.common import utils
 from zun.compute import claims
+import zun.conf
 from zun import objects
 from zun.objects import base as obj_base
 from zun.pci import manager as pci_manager
 from zun.scheduler import client as scheduler_client
 
+CONF = zun.conf.CONF
 LOG = logging.getLogger(__name__)
 COMPUTE_RESOURCE_SEMAPHORE = "compute_resources"
+# Fields of the compute node which are compared by value to decide whether
+# the node has to be persisted.
+RESOURCE_FIELDS = ('mem_total', 'mem_free', 'mem_available', 'mem_used',
+                   'total_containers', 'running_containers',
+                   'paused_containers', 'stopped_containers', 'cpus',
+                   'cpu_used', 'architecture', 'os_type', 'os',
+                   'kernel_version', 'labels', 'images')
+# Object fields of the compute node, which are persisted whenever they were
+# set as comparing them is as expensive as writing them.
+RESOURCE_OBJECT_FIELDS = frozenset(['numa_topology', 'pci_device_pools'])
+# Fields reported by the container driver which the claims do not track, so
+# they are refreshed on every update even when no audit is due.
+DRIVER_FIELDS = ('mem_total', 'mem_available', 'total_containers',
+                 'paused_containers', 'stopped_containers', 'cpus',
+                 'architecture', 'os_type', 'os', 'kernel_version', 'labels',
+                 'images')
 
 
 class ComputeNodeTracker(object):
+    """Tracks the resource usage of the compute node.
+
+    The usage is kept in memory: claims and releases apply their delta to
+    ``compute_node`` and a full audit, which recounts the usage from the
+    containers of the host, only runs every
+    ``CONF.compute.resource_audit_interval`` seconds. The other resources
+    reported by the container driver are refreshed on every update. Changes
+    of the compute node are persisted outside of
+    ``COMPUTE_RESOURCE_SEMAPHORE`` by a single writer, so that claims do not
+    wait for the database.
+    """
+
     def __init__(self, host, container_driver):
         self.host = host
         self.container_driver = container_driver
         self.compute_node = None
         self.tracked_containers = {}
-        self.old_resources = collections.defaultdict(objects.ComputeNode)
+        # The fingerprint of the last compute node handed to the Scheduler,
+        # keyed by hostname.
+        self.old_resources = {}
         self.scheduler_client = scheduler_client.SchedulerClient()
         self.pci_tracker = None
+        self._last_audit = None
+        # Claims and releases made while an audit loads the containers of
+        # the host, keyed by container uuid. None when no audit is running.
+        self._audit_journal = None
+        self._dirty = False
+        self._saving = False
 
     def _setup_pci_tracker(self, context, compute_node):
         if not self.pci_tracker:
@@ -50,22 +90,53 @@ class ComputeNodeTracker(object):
             compute_node.pci_device_pools = dev_pools_obj
 
     def update_available_resources(self, context):
-        # Check if the compute_node is already registered
-        node = self._get_compute_node(context)
-        if not node:
-            # If not, register it and pass the object to the driver
-            numa_obj = self.container_driver.get_host_numa_topology()
-            node = objects.ComputeNode(context)
-            node.hostname = self.host
-            node.numa_topology = numa_obj
-            node.create(context)
-            LOG.info('Node created for :%(host)s', {'host': self.host})
+        if self.compute_node is not None and not self._audit_due():
+            node = self.compute_node.obj_clone()
+            self.container_driver.get_available_resources(node)
+            self._update_driver_resources(node)
+            self._persist()
+            return self.compute_node
+
+        if self.compute_node is None:
+            # Check if the compute_node is already registered
+            node = self._get_compute_node(context)
+            if not node:
+                # If not, register it and pass the object to the driver
+                numa_obj = self.container_driver.get_host_numa_topology()
+                node = objects.ComputeNode(context)
+                node.hostname = self.host
+                node.numa_topology = numa_obj
+                node.create(context)
+                LOG.info('Node created for :%(host)s', {'host': self.host})
+        else:
+            # NOTE: Refresh a copy, claims keep using the current node
+            # until the audit replaces it.
+            node = self.compute_node.obj_clone()
         self.container_driver.get_available_resources(node)
         self._setup_pci_tracker(context, node)
-        self.compute_node = node
-        self._update_available_resource(context)
+        self._update_available_resource(context, node)
+        self._persist()
         # NOTE(sbiswas7): Consider removing the return statement if not needed
-        return node
+        return self.compute_node
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _update_driver_resources(self, node):
+        """Refresh the resources of the driver, keeping the tracked usage."""
+        cn = self.compute_node
+        for field in DRIVER_FIELDS:
+            if node.obj_attr_is_set(field):
+                setattr(cn, field, getattr(node, field))
+        cn.mem_free = cn.mem_total - cn.mem_used
+        self._update(cn)
+
+    def reset(self):
+        """Audit the host on the next update, whatever the interval."""
+        self._last_audit = None
+
+    def _audit_due(self):
+        interval = CONF.compute.resource_audit_interval
+        return (self._last_audit is None or
+                time.time() - self._last_audit >= interval)
 
     def _get_compute_node(self, context):
         """Returns compute node for the host"""
@@ -75,7 +146,6 @@ class ComputeNodeTracker(object):
             LOG.warning("No compute node record for: %(host)s",
                         {'host': self.host})
 
-    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
     def container_claim(self, context, container, pci_requests, limits=None):
         """Indicate resources are needed for an upcoming container build.
 
@@ -92,14 +162,25 @@ class ComputeNodeTracker(object):
                   be used to revert the resource usage if an error occurs
                   during the container build.
         """
+        claim = self._container_claim(context, container, pci_requests,
+                                      limits)
+        # NOTE: The claim holds whether or not the node could be saved, the
+        # changes are saved again by the next update.
+        self._persist(reraise=False)
+        return claim
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _container_claim(self, context, container, pci_requests, limits):
         # No memory, cpu, or pci_request specified, no need to claim resource
         # now.
         if not (container.memory or container.cpu or pci_requests):
             self._set_container_host(context, container)
             return claims.NopClaim()
 
-        # We should have the compute node created here, just get it.
-        self.compute_node = self._get_compute_node(context)
+        # NOTE: The usage of the node is tracked in memory, only load the
+        # node if no audit has run yet.
+        if self.compute_node is None:
+            self.compute_node = self._get_compute_node(context)
 
         claim = claims.Claim(context, container, self, self.compute_node,
                              pci_requests, limits=limits)
@@ -110,7 +191,6 @@ class ComputeNodeTracker(object):
 
         self._set_container_host(context, container)
         self._update_usage_from_container(context, container)
-        # persist changes to the compute node:
         self._update(self.compute_node)
 
         return claim
@@ -135,6 +215,9 @@ class ComputeNodeTracker(object):
         is_new_container = uuid not in self.tracked_containers
         is_removed_container = not is_new_container and is_removed
 
+        if self._audit_journal is not None:
+            self._audit_journal[uuid] = None if is_removed else container
+
         if is_new_container:
             self.tracked_containers[uuid] = \
                 obj_base.obj_to_primitive(container)
@@ -189,46 +272,159 @@ class ComputeNodeTracker(object):
         # TODO(Shunli): Calculate the numa usage here
 
     def _update(self, compute_node):
+        """Mark the compute node to be persisted if it has changed.
+
+        Must be called with COMPUTE_RESOURCE_SEMAPHORE held, and be followed
+        by _persist() once the semaphore is released.
+        """
         if not self._resource_change(compute_node):
             return
-        # Persist the stats to the Scheduler
-        self.scheduler_client.update_resource(compute_node)
+        self._dirty = True
 
         if self.pci_tracker:
             self.pci_tracker.save()
 
+    def _persist(self, reraise=True):
+        """Persist the stats of the compute node to the Scheduler.
+
+        Only one greenthread writes at a time. Changes made while it is
+        writing are picked up by its next iteration, so callers never wait
+        for a write that is already in progress. Changes that failed to be
+        written are kept to be written again.
+
+        :param reraise: whether to raise the error of a failed write rather
+                        than only log it.
+        """
+        if self._saving:
+            return
+        self._saving = True
+        try:
+            while True:
+                snapshot, old_fingerprint = self._take_snapshot()
+                if snapshot is None:
+                    break
+                try:
+                    self.scheduler_client.update_resource(snapshot)
+                except Exception as e:
+                    with excutils.save_and_reraise_exception(
+                            reraise=reraise):
+                        LOG.warning('Failed to save the compute node of '
+                                    '%(host)s: %(error)s',
+                                    {'host': self.host,
+                                     'error': six.text_type(e)})
+                        self._restore_changes(snapshot, old_fingerprint)
+                    break
+        finally:
+            self._saving = False
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _take_snapshot(self):
+        """Return a copy of the compute node to be persisted.
+
+        Fields which were set to the value they had when the node was last
+        persisted are not marked as changed in the copy, so that only the
+        changed fields are written.
+        """
+        if not self._dirty:
+            return None, None
+        self._dirty = False
+        cn = self.compute_node
+        snapshot = cn.obj_clone()
+        cn.obj_reset_changes()
+
+        hostname = cn.hostname
+        old_fingerprint = self.old_resources.get(hostname)
+        fingerprint = self._resource_fingerprint(cn)
+        if old_fingerprint is not None:
+            unchanged = [field for field, old, new
+                         in zip(RESOURCE_FIELDS, old_fingerprint, fingerprint)
+                         if old == new]
+            snapshot.obj_reset_changes(unchanged)
+        self.old_resources[hostname] = fingerprint
+        return snapshot, old_fingerprint
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _restore_changes(self, snapshot, old_fingerprint):
+        # Mark the fields that failed to be saved as changed again.
+        for field in snapshot.obj_what_changed():
+            setattr(self.compute_node, field,
+                    getattr(self.compute_node, field))
+        if old_fingerprint is None:
+            self.old_resources.pop(self.compute_node.hostname, None)
+        else:
+            self.old_resources[self.compute_node.hostname] = old_fingerprint
+        self._dirty = True
+
+    @staticmethod
+    def _resource_fingerprint(compute_node):
+        """Return the values of the RESOURCE_FIELDS of the compute node."""
+        fingerprint = []
+        for field in RESOURCE_FIELDS:
+            value = None
+            if compute_node.obj_attr_is_set(field):
+                value = getattr(compute_node, field)
+            if isinstance(value, dict):
+                value = tuple(sorted(value.items()))
+            elif isinstance(value, list):
+                value = tuple(value)
+            fingerprint.append(value)
+        return tuple(fingerprint)
+
     def _resource_change(self, compute_node):
         """Check to see if any resources have changed."""
-        hostname = compute_node.hostname
-        old_compute = self.old_resources[hostname]
-        if not obj_base.obj_equal_prims(
-                compute_node, old_compute, ['updated_at']):
-            self.old_resources[hostname] = copy.deepcopy(compute_node)
+        old_fingerprint = self.old_resources.get(compute_node.hostname)
+        if old_fingerprint != self._resource_fingerprint(compute_node):
             return True
-        return False
+        return bool(RESOURCE_OBJECT_FIELDS &
+                    compute_node.obj_what_changed())
 
-    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
-    def _update_available_resource(self, context):
+    def _update_available_resource(self, context, node):
 
         # if we could not init the compute node the tracker will be
         # disabled and we should quit now
         if self.disabled(self.host):
             return
 
-        # Grab all containers assigned to this node:
-        containers = objects.Container.list_by_host(context, self.host)
+        # NOTE: Do not hold the semaphore while the containers are loaded,
+        # record the claims and releases made meanwhile instead.
+        self._start_audit()
+        try:
+            # Grab all containers assigned to this node:
+            containers = objects.Container.list_by_host(context, self.host)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self._finish_audit()
+        self._audit_usage(context, node, containers)
+        LOG.debug('Compute_service record updated for %(host)s',
+                  {'host': self.host})
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _start_audit(self):
+        self._audit_journal = {}
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _finish_audit(self):
+        self._audit_journal = None
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _audit_usage(self, context, node, containers):
+        journal, self._audit_journal = self._audit_journal or {}, None
+        containers = collections.OrderedDict((c.uuid, c) for c in containers)
+        for uuid, container in journal.items():
+            if container is None:
+                containers.pop(uuid, None)
+            else:
+                containers[uuid] = container
 
         # Now calculate usage based on container utilization:
-        self._update_usage_from_containers(context, containers)
+        self.compute_node = node
+        self._update_usage_from_containers(context, containers.values())
 
         # No migration for docker, is there will be orphan container? Nova has.
 
-        cn = self.compute_node
-
         # update the compute_node
-        self._update(cn)
-        LOG.debug('Compute_service record updated for %(host)s',
-                  {'host': self.host})
+        self._update(self.compute_node)
+        self._last_audit = time.time()
 
     def _get_usage_dict(self, container, **updates):
         """Make a usage dict _update methods expect.
@@ -254,19 +450,27 @@ class ComputeNodeTracker(object):
 
         return usage
 
-    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
     def abort_container_claim(self, context, container):
         """Remove usage from the given container."""
+        self._abort_container_claim(context, container)
+        self._persist(reraise=False)
+
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _abort_container_claim(self, context, container):
         self._update_usage_from_container(context, container, is_removed=True)
 
         self._update(self.compute_node)
 
-    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
     def remove_usage_from_container(self, context, container,
                                     is_removed=True):
-        """Just a wrapper of the private function to hold lock."""
+        """Release the usage of a container and persist the change."""
+        self._remove_usage_from_container(context, container, is_removed)
+        self._persist(reraise=False)
 
-        # We need to get the latest compute node info
-        self.compute_node = self._get_compute_node(context)
+    @utils.synchronized(COMPUTE_RESOURCE_SEMAPHORE)
+    def _remove_usage_from_container(self, context, container, is_removed):
+        if self.compute_node is None:
+            # NOTE: The usage is recounted by the first audit.
+            return
         self._update_usage_from_container(context, container, is_removed)
         self._update(self.compute_node)
@@ -0,0 +1,119 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded execution of the background operations of zun-compute."""
+
+import time
+
+from eventlet import semaphore
+from oslo_log import log as logging
+
+from zun.common import exception
+from zun.common import utils
+import zun.conf
+
+CONF = zun.conf.CONF
+LOG = logging.getLogger(__name__)
+
+CREATE = 'create'
+ACTION = 'action'
+DELETE = 'delete'
+
+
+class Lane(object):
+    """Runs operations of one class with a bounded concurrency.
+
+    At most ``workers`` operations run at the same time and at most
+    ``queue_size`` more wait for a worker. Operations are submitted from
+    the RPC dispatcher, which must never wait, so a full lane rejects new
+    operations with ComputeQueueFull instead of holding back the caller.
+    """
+
+    def __init__(self, name, workers, queue_size):
+        self.name = name
+        self._workers = semaphore.Semaphore(workers)
+        self._slots = semaphore.Semaphore(workers + queue_size)
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.run_time = 0.0
+
+    def submit(self, func, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise exception.ComputeQueueFull(op_class=self.name,
+                                             host=CONF.host)
+        self.queued += 1
+        utils.spawn_n(self._run, time.time(), func, *args, **kwargs)
+
+    def _run(self, enqueued_at, func, *args, **kwargs):
+        try:
+            with self._workers:
+                started_at = time.time()
+                self.queued -= 1
+                self.running += 1
+                wait_time = started_at - enqueued_at
+                self.wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+                try:
+                    func(*args, **kwargs)
+                except Exception:
+                    self.failed += 1
+                    raise
+                finally:
+                    self.running -= 1
+                    self.completed += 1
+                    self.run_time += time.time() - started_at
+        finally:
+            self._slots.release()
+
+    def stats(self):
+        completed = self.completed or 1
+        return {'queued': self.queued,
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'avg_wait_time': self.wait_time / completed,
+                'max_wait_time': self.max_wait_time,
+                'avg_run_time': self.run_time / completed}
+
+
+class Executor(object):
+    """Runs the background operations of the compute manager.
+
+    Operations are split into classes, each of which has its own lane, so
+    that cheap operations such as stop or delete never wait behind a burst
+    of creates.
+    """
+
+    def __init__(self):
+        queue_size = CONF.compute.operation_queue_size
+        self.lanes = {
+            CREATE: Lane(CREATE, CONF.compute.create_concurrency,
+                         queue_size),
+            ACTION: Lane(ACTION, CONF.compute.action_concurrency,
+                         queue_size),
+            DELETE: Lane(DELETE, CONF.compute.delete_concurrency,
+                         queue_size),
+        }
+
+    def submit(self, op_class, func, *args, **kwargs):
+        self.lanes[op_class].submit(func, *args, **kwargs)
+
+    def stats(self):
+        return {name: lane.stats() for name, lane in self.lanes.items()}
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
+from eventlet import semaphore
 import six
 
 from oslo_log import log as logging
@@ -20,16 +22,20 @@ from oslo_utils import excutils
 from oslo_utils import uuidutils
 
 from zun.common import consts
+from zun.common import container_actions
+from zun.common import context as zun_context
 from zun.common import exception
 from zun.common.i18n import _
+from zun.common import singleflight
 from zun.common import utils
 from zun.common.utils import translate_exception
 from zun.compute import compute_node_tracker
+from zun.compute import executor
 import zun.conf
 from zun.container import driver
 from zun.image import driver as image_driver
-from zun.image.glance import driver as glance
 from zun import objects
+from zun.service import periodic
 
 CONF = zun.conf.CONF
 LOG = logging.getLogger(__name__)
@@ -43,11 +49,27 @@ class Manager(periodic_task.PeriodicTasks):
         self.driver = driver.load_container_driver(container_driver)
         self.host = CONF.host
         self._resource_tracker = None
+        self._image_pulls = singleflight.SingleFlight()
+        self._executor = executor.Executor()
+        image_driver.init_image_drivers()
         if self._use_sandbox():
             self.use_sandbox = True
         else:
             self.use_sandbox = False
 
+    def reset(self):
+        """Probe the host again, e.g. after hardware was added."""
+        LOG.info('Refreshing the capabilities of host %s', self.host)
+        self.driver.refresh_host_capabilities()
+        if self._resource_tracker:
+            self._resource_tracker.reset()
+
+    def init_host(self, tg):
+        """Start the background tasks of the host and recover containers."""
+        periodic.setup(CONF, tg)
+        self.start_sandbox_pool(tg)
+        self.init_containers(zun_context.get_admin_context(all_tenants=True))
+
     def init_containers(self, context):
         containers = objects.Container.list_by_host(context, self.host)
         for container in containers:
@@ -129,6 +151,27 @@ class Manager(periodic_task.PeriodicTasks):
             container.host = None
         container.save(context)
 
+    def _submit(self, context, op_class, func, containers=(), fail=False):
+        """Hands an operation over to its lane without waiting.
+
+        The RPC caller is gone by the time a full lane rejects the
+        operation, so the rejection is recorded on the given containers:
+        with ``fail`` they are put in error, otherwise only their status
+        reason is set. Returns whether the operation was accepted.
+        """
+        try:
+            self._executor.submit(op_class, func)
+            return True
+        except exception.ComputeQueueFull as e:
+            LOG.warning(six.text_type(e))
+            for container in containers:
+                if fail:
+                    container.status = consts.ERROR
+                    container.task_state = None
+                container.status_reason = six.text_type(e)
+                container.save(context)
+            return False
+
     def container_create(self, context, limits, requested_networks,
                          requested_volumes, container, run, pci_requests=None):
         @utils.synchronized(container.uuid)
@@ -141,7 +184,8 @@ class Manager(periodic_task.PeriodicTasks):
             if run and created_container:
                 self._do_container_start(context, created_container)
 
-        utils.spawn_n(do_container_create)
+        self._submit(context, executor.CREATE, do_container_create,
+                     [container], fail=True)
 
     def _do_sandbox_cleanup(self, context, container):
         sandbox_id = container.get_sandbox_id()
@@ -158,20 +202,66 @@ class Manager(periodic_task.PeriodicTasks):
         container.task_state = task_state
         container.save(context)
 
+    def _pull_image(self, context, repo, tag, image_pull_policy='always',
+                    image_driver_name=None, container_uuid=None):
+        """Pull an image and load it into the container driver.
+
+        Concurrent pulls of the same image on this host are collapsed into
+        a single pull whose result, or error, is shared by all callers.
+
+        :param container_uuid: the container the image is pulled for. The
+                               load of the image is recorded as an event of
+                               its action.
+        """
+        def do_pull_image():
+            image, image_loaded = image_driver.pull_image(
+                context, repo, tag, image_pull_policy, image_driver_name,
+                load_image=self.driver.load_image,
+                image_exists=self.driver.image_exists)
+            if not image_loaded:
+                with utils.EventReporter(context,
+                                         container_actions.EVENT_IMAGE_LOAD,
+                                         container_uuid):
+                    self.driver.load_image(image['path'])
+            return image
+
+        # NOTE: Images of drivers other than docker (i.e. glance) can be
+        # private to a project, so do not share those pulls across projects.
+        project_id = None
+        if image_driver_name != 'docker':
+            project_id = context.project_id
+        # NOTE: Do not let a caller which asks for the image to be
+        # refreshed join a pull which may skip the refresh.
+        key = (image_driver_name, repo, tag, image_pull_policy, project_id)
+        image = self._image_pulls.do(key, do_pull_image)
+        # Callers modify the returned image, give each of them a copy.
+        return dict(image)
+
     def _do_container_create_base(self, context, container, requested_networks,
                                   requested_volumes, sandbox=None, limits=None,
-                                  reraise=False):
+                                  reraise=False, image_pull=None):
+        """Pull the image of a container and create it.
+
+        :param image_pull: an optional greenthread that is already pulling
+                           the image of the container.
+        """
         self._update_task_state(context, container, consts.IMAGE_PULLING)
         repo, tag = utils.parse_image_name(container.image)
         image_pull_policy = utils.get_image_pull_policy(
             container.image_pull_policy, tag)
         image_driver_name = container.image_driver
         try:
-            image, image_loaded = image_driver.pull_image(
-                context, repo, tag, image_pull_policy, image_driver_name)
+            with utils.EventReporter(context,
+                                     container_actions.EVENT_IMAGE_PULL,
+                                     container.uuid):
+                if image_pull is not None:
+                    image = image_pull.wait()
+                else:
+                    image = self._pull_image(context, repo, tag,
+                                             image_pull_policy,
+                                             image_driver_name,
+                                             container_uuid=container.uuid)
             image['repo'], image['tag'] = repo, tag
-            if not image_loaded:
-                self.driver.load_image(image['path'])
         except exception.ImageNotFound as e:
             with excutils.save_and_reraise_exception(reraise=reraise):
                 LOG.error(six.text_type(e))
@@ -197,7 +287,12 @@ class Manager(periodic_task.PeriodicTasks):
         container.image_driver = image.get('driver')
         container.save(context)
         try:
-            if image['driver'] == 'glance':
+            if image.get('loaded_image'):
+                # The image was streamed into the container driver, use
+                # the name it was loaded as.
+                image['repo'], image['tag'] = utils.parse_image_name(
+                    image['loaded_image'])
+            elif image['driver'] == 'glance':
                 self.driver.read_tar_image(image)
             container = self.driver.create(context, container, image,
                                            requested_networks,
@@ -256,9 +351,12 @@ class Manager(periodic_task.PeriodicTasks):
 
     def _attach_volumes(self, context, container, volumes):
         try:
-            for volume in volumes:
-                volume.container_uuid = container.uuid
-                self._attach_volume(context, volume)
+            with utils.EventReporter(context,
+                                     container_actions.EVENT_VOLUME_ATTACH,
+                                     container.uuid):
+                for volume in volumes:
+                    volume.container_uuid = container.uuid
+                    self._attach_volume(context, volume)
             return True
         except Exception as e:
             with excutils.save_and_reraise_exception(reraise=False):
@@ -322,15 +420,16 @@ class Manager(periodic_task.PeriodicTasks):
         sandbox_image_pull_policy = CONF.sandbox_image_pull_policy
         repo, tag = utils.parse_image_name(sandbox_image)
         try:
-            image, image_loaded = image_driver.pull_image(
-                context, repo, tag, sandbox_image_pull_policy,
-                sandbox_image_driver)
-            if not image_loaded:
-                self.driver.load_image(image['path'])
-            sandbox_id = self.driver.create_sandbox(
-                context, container, image=sandbox_image,
-                requested_networks=requested_networks,
-                requested_volumes=requested_volumes)
+            with utils.EventReporter(context,
+                                     container_actions.EVENT_SANDBOX_CREATE,
+                                     container.uuid):
+                self._pull_image(context, repo, tag,
+                                 sandbox_image_pull_policy,
+                                 sandbox_image_driver)
+                sandbox_id = self.driver.create_sandbox(
+                    context, container, image=sandbox_image,
+                    requested_networks=requested_networks,
+                    requested_volumes=requested_volumes)
             return sandbox_id
         except Exception as e:
             with excutils.save_and_reraise_exception(reraise=reraise):
@@ -338,11 +437,25 @@ class Manager(periodic_task.PeriodicTasks):
                               six.text_type(e))
                 self._fail_container(context, container, six.text_type(e))
 
+    def start_sandbox_pool(self, tg):
+        """Keeps the sandbox pool of the container driver filled, if any."""
+        pool = self.driver.get_sandbox_pool()
+        if pool is not None:
+            tg.add_thread(pool.run, self._pull_sandbox_image)
+
+    def _pull_sandbox_image(self):
+        repo, tag = utils.parse_image_name(CONF.sandbox_image)
+        self._pull_image(zun_context.get_admin_context(all_tenants=True),
+                         repo, tag, CONF.sandbox_image_pull_policy,
+                         CONF.sandbox_image_driver)
+
     def _do_container_start(self, context, container, reraise=False):
         LOG.debug('Starting container: %s', container.uuid)
         self._update_task_state(context, container, consts.CONTAINER_STARTING)
         try:
-            container = self.driver.start(context, container)
+            with utils.EventReporter(context, container_actions.EVENT_START,
+                                     container.uuid):
+                container = self.driver.start(context, container)
             self._update_task_state(context, container, None)
             return container
         except exception.DockerError as e:
@@ -362,16 +475,20 @@ class Manager(periodic_task.PeriodicTasks):
         def do_container_delete():
             self._do_container_delete(context, container, force)
 
-        utils.spawn_n(do_container_delete)
+        self._submit(context, executor.DELETE, do_container_delete,
+                     [container], fail=True)
 
-    def _do_container_delete(self, context, container, force):
+    def _do_container_delete(self, context, container, force, reraise=None):
         LOG.debug('Deleting container: %s', container.uuid)
         self._update_task_state(context, container, consts.CONTAINER_DELETING)
-        reraise = not force
+        if reraise is None:
+            reraise = not force
         try:
-            self.driver.delete(context, container, force)
-            if self.use_sandbox:
-                self._delete_sandbox(context, container, reraise)
+            with utils.EventReporter(context, container_actions.EVENT_DELETE,
+                                     container.uuid):
+                self.driver.delete(context, container, force)
+                if self.use_sandbox:
+                    self._delete_sandbox(context, container, reraise)
         except exception.DockerError as e:
             with excutils.save_and_reraise_exception(reraise=reraise):
                 LOG.error("Error occurred while calling Docker  "
@@ -409,12 +526,17 @@ class Manager(periodic_task.PeriodicTasks):
         def do_add_security_group():
             self._add_security_group(context, container, security_group)
 
-        utils.spawn_n(do_add_security_group)
+        self._submit(context, executor.ACTION, do_add_security_group,
+                     [container])
 
     def _add_security_group(self, context, container, security_group):
         LOG.debug('Adding security_group to container: %s', container.uuid)
         try:
-            self.driver.add_security_group(context, container, security_group)
+            with utils.EventReporter(
+                    context, container_actions.EVENT_ADD_SECURITY_GROUP,
+                    container.uuid):
+                self.driver.add_security_group(context, container,
+                                               security_group)
             container.security_groups += [security_group]
             container.save(context)
         except Exception as e:
@@ -454,7 +576,9 @@ class Manager(periodic_task.PeriodicTasks):
         LOG.debug('Rebooting container: %s', container.uuid)
         self._update_task_state(context, container, consts.CONTAINER_REBOOTING)
         try:
-            container = self.driver.reboot(context, container, timeout)
+            with utils.EventReporter(context, container_actions.EVENT_REBOOT,
+                                     container.uuid):
+                container = self.driver.reboot(context, container, timeout)
             self._update_task_state(context, container, None)
             return container
         except exception.DockerError as e:
@@ -473,13 +597,16 @@ class Manager(periodic_task.PeriodicTasks):
         def do_container_reboot():
             self._do_container_reboot(context, container, timeout)
 
-        utils.spawn_n(do_container_reboot)
+        self._submit(context, executor.ACTION, do_container_reboot,
+                     [container])
 
     def _do_container_stop(self, context, container, timeout, reraise=False):
         LOG.debug('Stopping container: %s', container.uuid)
         self._update_task_state(context, container, consts.CONTAINER_STOPPING)
         try:
-            container = self.driver.stop(context, container, timeout)
+            with utils.EventReporter(context, container_actions.EVENT_STOP,
+                                     container.uuid):
+                container = self.driver.stop(context, container, timeout)
             self._update_task_state(context, container, None)
             return container
         except exception.DockerError as e:
@@ -498,19 +625,23 @@ class Manager(periodic_task.PeriodicTasks):
         def do_container_stop():
             self._do_container_stop(context, container, timeout)
 
-        utils.spawn_n(do_container_stop)
+        self._submit(context, executor.ACTION, do_container_stop,
+                     [container])
 
     def container_start(self, context, container):
         @utils.synchronized(container.uuid)
         def do_container_start():
             self._do_container_start(context, container)
 
-        utils.spawn_n(do_container_start)
+        self._submit(context, executor.ACTION, do_container_start,
+                     [container])
 
     def _do_container_pause(self, context, container, reraise=False):
         LOG.debug('Pausing container: %s', container.uuid)
         try:
-            container = self.driver.pause(context, container)
+            with utils.EventReporter(context, container_actions.EVENT_PAUSE,
+                                     container.uuid):
+                container = self.driver.pause(context, container)
             container.save(context)
             return container
         except exception.DockerError as e:
@@ -529,12 +660,15 @@ class Manager(periodic_task.PeriodicTasks):
         def do_container_pause():
             self._do_container_pause(context, container)
 
-        utils.spawn_n(do_container_pause)
+        self._submit(context, executor.ACTION, do_container_pause,
+                     [container])
 
     def _do_container_unpause(self, context, container, reraise=False):
         LOG.debug('Unpausing container: %s', container.uuid)
         try:
-            container = self.driver.unpause(context, container)
+            with utils.EventReporter(context, container_actions.EVENT_UNPAUSE,
+                                     container.uuid):
+                container = self.driver.unpause(context, container)
             container.save(context)
             return container
         except exception.DockerError as e:
@@ -554,7 +688,8 @@ class Manager(periodic_task.PeriodicTasks):
         def do_container_unpause():
             self._do_container_unpause(context, container)
 
-        utils.spawn_n(do_container_unpause)
+        self._submit(context, executor.ACTION, do_container_unpause,
+                     [container])
 
     @translate_exception
     def container_logs(self, context, container, stdout, stderr,
@@ -610,7 +745,9 @@ class Manager(periodic_task.PeriodicTasks):
     def _do_container_kill(self, context, container, signal, reraise=False):
         LOG.debug('Killing a container: %s', container.uuid)
         try:
-            container = self.driver.kill(context, container, signal)
+            with utils.EventReporter(context, container_actions.EVENT_KILL,
+                                     container.uuid):
+                container = self.driver.kill(context, container, signal)
             container.save(context)
             return container
         except exception.DockerError as e:
@@ -624,7 +761,8 @@ class Manager(periodic_task.PeriodicTasks):
         def do_container_kill():
             self._do_container_kill(context, container, signal)
 
-        utils.spawn_n(do_container_kill)
+        self._submit(context, executor.ACTION, do_container_kill,
+                     [container])
 
     @translate_exception
     def container_update(self, context, container, patch):
@@ -635,7 +773,9 @@ class Manager(periodic_task.PeriodicTasks):
                 setattr(container, field, patch_val)
 
         try:
-            self.driver.update(context, container)
+            with utils.EventReporter(context, container_actions.EVENT_UPDATE,
+                                     container.uuid):
+                self.driver.update(context, container)
             container.save(context)
             return container
         except exception.DockerError as e:
@@ -736,8 +876,8 @@ class Manager(periodic_task.PeriodicTasks):
             # NOTE(miaohb): Glance is the only driver that support image
             # uploading in the current version, so we have hard-coded here.
             # https://bugs.launchpad.net/zun/+bug/1697342
-            snapshot_image = image_driver.create_image(context, repository,
-                                                       glance.GlanceDriver())
+            snapshot_image = image_driver.create_image(
+                context, repository, image_driver.get_image_driver('glance'))
         except exception.DockerError as e:
             LOG.error("Error occurred while calling glance "
                       "create_image API: %s",
@@ -748,19 +888,28 @@ class Manager(periodic_task.PeriodicTasks):
             self._do_container_commit(context, snapshot_image, container,
                                       repository, tag)
 
-        utils.spawn_n(do_container_commit)
+        try:
+            self._executor.submit(executor.CREATE, do_container_commit)
+        except exception.ComputeQueueFull:
+            # NOTE: Commit is an RPC call, so the caller gets the error
+            # right away and the empty snapshot image is cleaned up.
+            with excutils.save_and_reraise_exception():
+                image_driver.delete_image(
+                    context, snapshot_image.id,
+                    image_driver.get_image_driver('glance'))
         return {"uuid": snapshot_image.id}
 
     def _do_container_image_upload(self, context, snapshot_image,
                                    container_image_id, data, tag):
+        glance_driver = image_driver.get_image_driver('glance')
         try:
             image_driver.upload_image_data(context, snapshot_image,
-                                           tag, data, glance.GlanceDriver())
+                                           tag, data, glance_driver)
         except Exception as e:
             LOG.exception("Unexpected exception while uploading image: %s",
                           six.text_type(e))
             image_driver.delete_image(context, snapshot_image.id,
-                                      glance.GlanceDriver())
+                                      glance_driver)
             self.driver.delete_image(container_image_id)
             raise
 
@@ -771,47 +920,59 @@ class Manager(periodic_task.PeriodicTasks):
         if tag is None:
             tag = 'latest'
 
-        try:
-            container_image_id = self.driver.commit(context, container,
-                                                    repository, tag)
-            container_image = self.driver.get_image(repository + ':' + tag)
-        except exception.DockerError as e:
-            LOG.error("Error occurred while calling docker commit API: %s",
-                      six.text_type(e))
-            image_driver.delete_image(context, snapshot_image.id,
-                                      glance.GlanceDriver())
-            raise
-        LOG.debug('Upload image %s to glance', container_image_id)
-        self._do_container_image_upload(context, snapshot_image,
-                                        container_image_id,
-                                        container_image, tag)
+        with utils.EventReporter(context, container_actions.EVENT_COMMIT,
+                                 container.uuid):
+            try:
+                container_image_id = self.driver.commit(context, container,
+                                                        repository, tag)
+                container_image = self.driver.get_image(
+                    repository + ':' + tag)
+            except exception.DockerError as e:
+                LOG.error("Error occurred while calling docker commit "
+                          "API: %s", six.text_type(e))
+                image_driver.delete_image(
+                    context, snapshot_image.id,
+                    image_driver.get_image_driver('glance'))
+                raise
+            LOG.debug('Upload image %s to glance', container_image_id)
+            self._do_container_image_upload(context, snapshot_image,
+                                            container_image_id,
+                                            container_image, tag)
 
     def image_pull(self, context, image):
-        utils.spawn_n(self._do_image_pull, context, image)
+        def do_image_pull():
+            self._do_image_pull(context, image)
+
+        if not self._submit(context, executor.CREATE, do_image_pull):
+            self._fail_image(image)
+
+    def _fail_image(self, image):
+        image.status = consts.ERROR
+        image.save()
 
     def _do_image_pull(self, context, image):
         LOG.debug('Creating image...')
         repo_tag = image.repo + ":" + image.tag
         try:
-            pulled_image, image_loaded = image_driver.pull_image(
-                context, image.repo, image.tag)
-            if not image_loaded:
-                self.driver.load_image(pulled_image['path'])
+            self._pull_image(context, image.repo, image.tag)
             image_dict = self.driver.inspect_image(repo_tag)
             image.image_id = image_dict['Id']
             image.size = image_dict['Size']
             image.save()
         except exception.ImageNotFound as e:
             LOG.error(six.text_type(e))
+            self._fail_image(image)
             return
         except exception.DockerError as e:
-            LOG.error("Error occurred while calling Docker image API: %s",
-                      six.text_type(e))
-            raise
-        except Exception as e:
-            LOG.exception("Unexpected exception: %s",
+            with excutils.save_and_reraise_exception():
+                LOG.error("Error occurred while calling Docker image API: %s",
                           six.text_type(e))
-            raise
+                self._fail_image(image)
+        except Exception as e:
+            with excutils.save_and_reraise_exception():
+                LOG.exception("Unexpected exception: %s",
+                              six.text_type(e))
+                self._fail_image(image)
 
     @translate_exception
     def image_search(self, context, image, image_driver_name, exact_match):
@@ -824,6 +985,18 @@ class Manager(periodic_task.PeriodicTasks):
                           six.text_type(e))
             raise
 
+    @periodic_task.periodic_task(spacing=60)
+    def report_executor_stats(self, context):
+        for op_class, stats in sorted(self._executor.stats().items()):
+            LOG.info('Stats of %(class)s operations: %(stats)s',
+                     {'class': op_class, 'stats': stats})
+
+    @periodic_task.periodic_task(spacing=60)
+    def report_sandbox_pool_stats(self, context):
+        pool = self.driver.get_sandbox_pool()
+        if pool is not None:
+            LOG.info('Stats of the sandbox pool: %s', pool.stats())
+
     @periodic_task.periodic_task(run_immediately=True)
     def inventory_host(self, context):
         rt = self._get_resource_tracker()
@@ -872,15 +1045,34 @@ class Manager(periodic_task.PeriodicTasks):
             self._do_capsule_create(context, capsule, requested_networks,
                                     limits)
 
-        utils.spawn_n(do_capsule_create)
+        self._submit(context, executor.CREATE, do_capsule_create,
+                     capsule.containers, fail=True)
 
     def _do_capsule_create(self, context, capsule, requested_networks=None,
                            limits=None, reraise=False):
+        capsule.host = self.host
+        capsule.save(context)
         capsule.containers[0].image = CONF.sandbox_image
         capsule.containers[0].image_driver = CONF.sandbox_image_driver
         capsule.containers[0].image_pull_policy = \
             CONF.sandbox_image_pull_policy
         capsule.containers[0].save(context)
+
+        # NOTE: Pull the images of the functional containers while the
+        # sandbox is being created. Every pull gets its own greenthread so
+        # that spawning never blocks the sandbox creation; the number of
+        # concurrent pulls is bounded inside the workers instead.
+        members = capsule.containers[1:]
+        pull_slots = semaphore.Semaphore(
+            CONF.compute.capsule_container_concurrency)
+
+        def do_pull(container):
+            with pull_slots:
+                return self._pull_capsule_image(context, container)
+
+        image_pulls = [eventlet.spawn(do_pull, container)
+                       for container in members]
+
         sandbox = self._create_sandbox(context,
                                        capsule.containers[0],
                                        requested_networks, reraise)
@@ -889,45 +1081,127 @@ class Manager(periodic_task.PeriodicTasks):
         sandbox_id = capsule.containers[0].get_sandbox_id()
         capsule.containers[0].container_id = sandbox_id
         capsule.containers[0].save(context)
-        count = len(capsule.containers)
-        for k in range(1, count):
-            capsule.containers[k].set_sandbox_id(sandbox_id)
-            capsule.containers[k].addresses = capsule.containers[0].addresses
+
+        def do_create(container, image_pull):
+            container.set_sandbox_id(sandbox_id)
+            container.addresses = capsule.containers[0].addresses
             created_container = \
                 self._do_container_create_base(context,
-                                               capsule.containers[k],
+                                               container,
                                                requested_networks,
                                                sandbox=sandbox,
-                                               limits=limits)
-            if created_container:
-                self._do_container_start(context, created_container)
+                                               limits=limits,
+                                               reraise=True,
+                                               image_pull=image_pull)
+            self._do_container_start(context, created_container,
+                                     reraise=True)
+
+        create_pool = eventlet.GreenPool(
+            CONF.compute.capsule_container_concurrency)
+        creates = [create_pool.spawn(do_create, container, image_pull)
+                   for container, image_pull in zip(members, image_pulls)]
+        failed = self._wait_capsule_containers(
+            [container.uuid for container in members], creates)
+        if failed:
+            self._fail_capsule(
+                context, capsule,
+                _('Failed to create containers %s') % ', '.join(failed))
+
+    def _wait_capsule_containers(self, uuids, threads):
+        """Waits for the greenthreads working on the containers of a capsule.
+
+        :param uuids: the uuids of the containers, in the order of their
+                      greenthreads.
+        :returns: the uuids of the containers whose greenthread failed.
+        """
+        failed = []
+        for uuid, thread in zip(uuids, threads):
+            try:
+                thread.wait()
+            except Exception as e:
+                LOG.error("Error occurred in container %(uuid)s of a "
+                          "capsule: %(error)s",
+                          {'uuid': uuid, 'error': six.text_type(e)})
+                failed.append(uuid)
+        return failed
+
+    def _fail_capsule(self, context, capsule, error):
+        capsule.status = consts.ERROR
+        capsule.status_reason = error
+        capsule.task_state = None
+        capsule.save(context)
+
+    def _pull_capsule_image(self, context, container):
+        repo, tag = utils.parse_image_name(container.image)
+        image_pull_policy = utils.get_image_pull_policy(
+            container.image_pull_policy, tag)
+        return self._pull_image(context, repo, tag, image_pull_policy,
+                                container.image_driver,
+                                container_uuid=container.uuid)
 
     def capsule_delete(self, context, capsule):
+        @utils.synchronized("capsule-" + capsule.uuid)
+        def do_capsule_delete():
+            self._do_capsule_delete(context, capsule)
+
+        try:
+            self._executor.submit(executor.DELETE, do_capsule_delete)
+        except exception.ComputeQueueFull:
+            # NOTE: Capsule delete is an RPC call, so the caller gets the
+            # error right away.
+            with excutils.save_and_reraise_exception():
+                capsule.task_state = None
+                capsule.save(context)
+
+    def _do_capsule_delete(self, context, capsule):
         # NOTE(kevinz): Delete functional containers first and then delete
         # sandbox container
-        for uuid in capsule.containers_uuids[1:]:
+        uuids = capsule.containers_uuids[1:]
+        pool = eventlet.GreenPool(CONF.compute.capsule_container_concurrency)
+        deletes = [pool.spawn(self._delete_capsule_container, context, uuid)
+                   for uuid in uuids]
+        failed = self._wait_capsule_containers(uuids, deletes)
+        if not failed:
+            # NOTE: The functional containers left behind by a failure
+            # still need the sandbox, so keep it until they are deleted.
+            sandbox_uuid = capsule.containers_uuids[0]
             try:
-                container = \
-                    objects.Container.get_by_uuid(context, uuid)
-                self.container_delete(context, container, force=True)
+                self._delete_capsule_container(context, sandbox_uuid)
             except Exception as e:
-                LOG.exception(e)
-        try:
-            container = \
-                objects.Container.get_by_uuid(context,
-                                              capsule.containers_uuids[0])
-            self.container_delete(context, container, force=True)
-        except Exception as e:
-            LOG.exception(e)
+                LOG.error("Error occurred while deleting the sandbox "
+                          "container %(uuid)s of a capsule: %(error)s",
+                          {'uuid': sandbox_uuid, 'error': six.text_type(e)})
+                failed = [sandbox_uuid]
+        if failed:
+            self._fail_capsule(
+                context, capsule,
+                _('Failed to delete containers %s') % ', '.join(failed))
+            return
         capsule.task_state = None
         capsule.save(context)
         capsule.destroy(context)
 
+    def _delete_capsule_container(self, context, uuid):
+        try:
+            container = objects.Container.get_by_uuid(context, uuid)
+        except exception.ContainerNotFound:
+            return
+
+        @utils.synchronized(container.uuid)
+        def do_container_delete():
+            self._do_container_delete(context, container, force=True,
+                                      reraise=True)
+
+        do_container_delete()
+
     def network_detach(self, context, container, network):
         LOG.debug('Detach network: %(network)s from container: %(container)s.',
                   {'container': container, 'network': network})
         try:
-            self.driver.network_detach(context, container, network)
+            with utils.EventReporter(context,
+                                     container_actions.EVENT_NETWORK_DETACH,
+                                     container.uuid):
+                self.driver.network_detach(context, container, network)
         except Exception as e:
             with excutils.save_and_reraise_exception(reraise=False):
                 LOG.exception("Unexpected exception: %s", six.text_type(e))
@@ -936,7 +1210,10 @@ class Manager(periodic_task.PeriodicTasks):
         LOG.debug('Attach network: %(network)s to container: %(container)s.',
                   {'container': container, 'network': network})
         try:
-            self.driver.network_attach(context, container, network)
+            with utils.EventReporter(context,
+                                     container_actions.EVENT_NETWORK_ATTACH,
+                                     container.uuid):
+                self.driver.network_attach(context, container, network)
         except Exception as e:
             with excutils.save_and_reraise_exception(reraise=False):
                 LOG.exception("Unexpected exception: %s", six.text_type(e))
@@ -58,7 +58,7 @@ class API(rpc_service.API):
     def container_create(self, context, host, container, limits,
                          requested_networks, requested_volumes, run,
                          pci_requests):
-        self._cast(host, 'container_create', limits=limits,
+        self._cast(context, host, 'container_create', limits=limits,
                    requested_networks=requested_networks,
                    requested_volumes=requested_volumes,
                    container=container,
@@ -67,96 +67,99 @@ class API(rpc_service.API):
 
     @check_container_host
     def container_delete(self, context, container, force):
-        return self._cast(container.host, 'container_delete',
+        return self._cast(context, container.host, 'container_delete',
                           container=container, force=force)
 
     @check_container_host
     def container_show(self, context, container):
-        return self._call(container.host, 'container_show',
+        return self._call(context, container.host, 'container_show',
                           container=container)
 
     def container_reboot(self, context, container, timeout):
-        self._cast(container.host, 'container_reboot', container=container,
-                   timeout=timeout)
+        self._cast(context, container.host, 'container_reboot',
+                   container=container, timeout=timeout)
 
     def container_stop(self, context, container, timeout):
-        self._cast(container.host, 'container_stop', container=container,
-                   timeout=timeout)
+        self._cast(context, container.host, 'container_stop',
+                   container=container, timeout=timeout)
 
     def container_start(self, context, container):
-        self._cast(container.host, 'container_start', container=container)
+        self._cast(context, container.host, 'container_start',
+                   container=container)
 
     def container_pause(self, context, container):
-        self._cast(container.host, 'container_pause', container=container)
+        self._cast(context, container.host, 'container_pause',
+                   container=container)
 
     def container_unpause(self, context, container):
-        self._cast(container.host, 'container_unpause', container=container)
+        self._cast(context, container.host, 'container_unpause',
+                   container=container)
 
     @check_container_host
     def container_logs(self, context, container, stdout, stderr,
                        timestamps, tail, since):
-        return self._call(container.host, 'container_logs',
+        return self._call(context, container.host, 'container_logs',
                           container=container, stdout=stdout, stderr=stderr,
                           timestamps=timestamps, tail=tail, since=since)
 
     @check_container_host
     def container_exec(self, context, container, command, run, interactive):
-        return self._call(container.host, 'container_exec',
+        return self._call(context, container.host, 'container_exec',
                           container=container, command=command, run=run,
                           interactive=interactive)
 
     @check_container_host
     def container_exec_resize(self, context, container, exec_id, height,
                               width):
-        return self._call(container.host, 'container_exec_resize',
+        return self._call(context, container.host, 'container_exec_resize',
                           exec_id=exec_id, height=height, width=width)
 
     def container_kill(self, context, container, signal):
-        self._cast(container.host, 'container_kill', container=container,
-                   signal=signal)
+        self._cast(context, container.host, 'container_kill',
+                   container=container, signal=signal)
 
     @check_container_host
     def container_update(self, context, container, patch):
-        return self._call(container.host, 'container_update',
+        return self._call(context, container.host, 'container_update',
                           container=container, patch=patch)
 
     @check_container_host
     def container_attach(self, context, container):
-        return self._call(container.host, 'container_attach',
+        return self._call(context, container.host, 'container_attach',
                           container=container)
 
     @check_container_host
     def container_resize(self, context, container, height, width):
-        return self._call(container.host, 'container_resize',
+        return self._call(context, container.host, 'container_resize',
                           container=container, height=height, width=width)
 
     @check_container_host
     def container_top(self, context, container, ps_args):
-        return self._call(container.host, 'container_top',
+        return self._call(context, container.host, 'container_top',
                           container=container, ps_args=ps_args)
 
     @check_container_host
     def container_get_archive(self, context, container, path):
-        return self._call(container.host, 'container_get_archive',
+        return self._call(context, container.host, 'container_get_archive',
                           container=container, path=path)
 
     @check_container_host
     def container_put_archive(self, context, container, path, data):
-        return self._call(container.host, 'container_put_archive',
+        return self._call(context, container.host, 'container_put_archive',
                           container=container, path=path, data=data)
 
     @check_container_host
     def container_stats(self, context, container):
-        return self._call(container.host, 'container_stats',
+        return self._call(context, container.host, 'container_stats',
                           container=container)
 
     @check_container_host
     def container_commit(self, context, container, repository, tag):
-        return self._call(container.host, 'container_commit',
+        return self._call(context, container.host, 'container_commit',
                           container=container, repository=repository, tag=tag)
 
     def add_security_group(self, context, container, security_group):
-        return self._cast(container.host, 'add_security_group',
+        return self._cast(context, container.host, 'add_security_group',
                           container=container, security_group=security_group)
 
     def image_pull(self, context, image):
@@ -164,29 +167,29 @@ class API(rpc_service.API):
         # scenario yet, so we temporarily set host to None and rpc will
         # choose an arbitrary host.
         host = None
-        self._cast(host, 'image_pull', image=image)
+        self._cast(context, host, 'image_pull', image=image)
 
     def image_search(self, context, image, image_driver, exact_match,
                      host=None):
-        return self._call(host, 'image_search', image=image,
+        return self._call(context, host, 'image_search', image=image,
                           image_driver_name=image_driver,
                           exact_match=exact_match)
 
     def capsule_create(self, context, host, capsule,
                        requested_networks, limits):
-        self._cast(host, 'capsule_create',
+        self._cast(context, host, 'capsule_create',
                    capsule=capsule,
                    requested_networks=requested_networks,
                    limits=limits)
 
     def capsule_delete(self, context, capsule):
-        return self._call(capsule.host, 'capsule_delete',
+        return self._call(context, capsule.host, 'capsule_delete',
                           capsule=capsule)
 
     def network_detach(self, context, container, network):
-        return self._call(container.host, 'network_detach',
+        return self._call(context, container.host, 'network_detach',
                           container=container, network=network)
 
     def network_attach(self, context, container, network):
-        return self._call(container.host, 'network_attach',
+        return self._call(context, container.host, 'network_attach',
                           container=container, network=network)
@@ -44,10 +44,98 @@ Possible values:
 """),
 ]
 
+sync_opts = [
+    cfg.IntOpt(
+        'container_state_sync_interval',
+        default=600,
+        min=0,
+        help="""
+Interval in seconds between full syncs of container states while container
+state changes are received from the container driver's event stream (see
+``[docker]enable_event_watcher``). If no event stream is available, the full
+sync runs on every periodic tick.
+"""),
+]
+
+resource_opts = [
+    cfg.IntOpt(
+        'resource_audit_interval',
+        default=600,
+        min=0,
+        help="""
+Interval in seconds between full audits of the resource usage of the compute
+node, which reload all containers of the host from the database. Between
+audits the usage is kept in memory and updated by the claims and releases of
+resources, while the other resources reported by the container driver are
+still refreshed on every periodic tick. 0 audits the usage on every periodic
+tick.
+"""),
+    cfg.IntOpt(
+        'max_reported_images',
+        default=100,
+        min=0,
+        help="""
+Maximum number of local images reported by the compute node on each update of
+its resources. The largest images are reported first, as they take the
+longest to pull. The scheduler uses them to prefer the hosts which already
+have the image of a container. 0 disables the report.
+"""),
+]
+
+capsule_opts = [
+    cfg.IntOpt(
+        'capsule_container_concurrency',
+        default=4,
+        min=1,
+        help="""
+Maximum number of containers of a capsule that are pulled, created or deleted
+concurrently.
+"""),
+]
+
+executor_opts = [
+    cfg.IntOpt(
+        'create_concurrency',
+        default=10,
+        min=1,
+        help="""
+Maximum number of create, capsule create, commit and image pull operations
+that run concurrently.
+"""),
+    cfg.IntOpt(
+        'action_concurrency',
+        default=50,
+        min=1,
+        help="""
+Maximum number of start, stop, reboot, pause, unpause, kill and add security
+group operations that run concurrently. These operations do not wait for
+create operations.
+"""),
+    cfg.IntOpt(
+        'delete_concurrency',
+        default=50,
+        min=1,
+        help="""
+Maximum number of container and capsule delete operations that run
+concurrently. These operations do not wait for create operations.
+"""),
+    cfg.IntOpt(
+        'operation_queue_size',
+        default=500,
+        min=0,
+        help="""
+Maximum number of operations of each class (create, action or delete) that
+wait for a free worker. Once the queue of a class is full, new requests of
+that class are rejected: containers that were to be created or deleted are
+put in the Error state and commit requests fail.
+"""),
+]
+
 opt_group = cfg.OptGroup(
     name='compute', title='Options for the zun-compute service')
 
-ALL_OPTS = (service_opts + db_opts)
+ALL_OPTS = (service_opts + db_opts + sync_opts + resource_opts +
+            capsule_opts + executor_opts)
 
 
 def register_opts(conf):
@@ -53,6 +53,42 @@ docker_opts = [
                default=5,
                help='Timeout in seconds for executing a command in a docker '
                     'container.'),
+    cfg.IntOpt('client_pool_size',
+               default=10,
+               min=0,
+               help='Maximum number of idle docker clients kept in the '
+                    'process-wide client pool. Pooled clients reuse their '
+                    'keep-alive connections to the docker daemon. Set to 0 '
+                    'to create a new client for every docker call.'),
+    cfg.IntOpt('client_idle_timeout',
+               default=60,
+               min=0,
+               help='Time in seconds after which an idle docker client is '
+                    'closed and removed from the client pool.'),
+    cfg.BoolOpt('enable_event_watcher',
+                default=True,
+                help='If set, zun-compute watches the docker events stream '
+                     'and updates the state of a container as soon as it '
+                     'changes. The periodic full sync of container states '
+                     'then only runs every '
+                     '[compute]container_state_sync_interval seconds.'),
+    cfg.IntOpt('event_watcher_retry_interval',
+               default=5,
+               min=1,
+               help='Time in seconds to wait before reconnecting to the '
+                    'docker events stream after it was interrupted.'),
+    cfg.IntOpt('sandbox_pool_size',
+               default=0,
+               min=0,
+               help='Number of sandbox containers that zun-compute creates '
+                    'ahead of time, so that creating a container can claim '
+                    'one instead of creating its sandbox. Only used if '
+                    'use_sandbox is enabled. 0 disables the pool.'),
+    cfg.FloatOpt('sandbox_pool_refill_rate',
+                 default=1.0,
+                 min=0.01,
+                 help='Maximum number of sandbox containers created per '
+                      'second to refill the sandbox pool.'),
 ]
 
 ALL_OPTS = (docker_opts)
@@ -52,6 +52,32 @@ glance_driver_opts = [
         help='Shared directory where glance images located. If '
              'specified, docker will try to load the image from '
              'the shared directory by image ID.'),
+    cfg.IntOpt(
+        'images_cache_max_size',
+        default=0,
+        min=0,
+        help='Maximum size in MB of the image tarballs cached in '
+             'images_directory. When it is exceeded, the least recently '
+             'used tarballs that are not used by any container on the '
+             'host are evicted. 0 means unlimited.'),
+    cfg.BoolOpt(
+        'stream_images',
+        default=False,
+        help='Load images downloaded from glance into the container '
+             'driver without keeping them in images_directory. An image '
+             'is written to a temporary file, which is removed once the '
+             'image is verified and loaded. Images without a checksum in '
+             'glance are never streamed. If streaming fails for another '
+             'reason than a checksum mismatch, the image is downloaded to '
+             'images_directory instead.'),
+    cfg.IntOpt(
+        'image_lookup_cache_ttl',
+        default=10,
+        min=0,
+        help='Number of seconds for which the result of looking up an '
+             'image in glance by its name or ID is cached. The cache is '
+             'per project and is invalidated when the images are changed '
+             'through zun. 0 disables the cache.'),
 ]
 
 glance_opt_group = cfg.OptGroup(name='glance',
@@ -20,6 +20,21 @@ scheduler_group = cfg.OptGroup(name="scheduler",
                                title="Scheduler configuration")
 
 scheduler_opts = [
+    cfg.StrOpt("topic",
+               default="zun-scheduler",
+               help="The queue to add scheduler tasks to."),
+    cfg.BoolOpt("use_scheduler_service",
+                default=False,
+                help="""
+Whether the containers are placed by the zun-scheduler service.
+
+By default, every zun-api worker runs its own scheduler, with its own view of
+the compute hosts. When enabled, the API workers ask the zun-scheduler service
+over RPC to place the containers, and the compute nodes push the changes of
+their resources to it, so that all the placements are made from the same
+up-to-date view of the hosts. The zun-scheduler service must be running, and
+this option must be set for zun-api and zun-compute.
+"""),
     cfg.StrOpt("driver",
                default="filter_scheduler",
                choices=("chance_scheduler", "fake_scheduler",
@@ -89,6 +104,198 @@ Related options:
 * All of the filters in this option *must* be present in the
   'scheduler_available_filters' option, or a SchedulerHostFilterNotFound
   exception will be raised.
+"""),
+    cfg.ListOpt("weight_classes",
+                default=["zun.scheduler.weights.all_weighers"],
+                help="""
+Weighers that the scheduler will use.
+
+Only hosts which pass the filters are weighed. The weight for any host starts
+at 0, and the weighers order these hosts by adding to or subtracting from the
+weight assigned by the previous weigher. Weights may become negative. A
+container is placed on one of the hosts with the highest weight, picked at
+random among them.
+
+By default, this is set to all weighers that are included with zun.
+
+This option is only used by the FilterScheduler and its subclasses; if you use
+a different scheduler, this option has no effect.
+
+Possible values:
+
+* A list of zero or more strings, where each string corresponds to the name of
+  a weigher that will be used for selecting a host
+"""),
+    cfg.FloatOpt("ram_weight_multiplier",
+                 default=1.0,
+                 help="""
+Ram weight multiplier ratio.
+
+This option determines how hosts with more or less available RAM are weighed.
+A positive value will result in the scheduler preferring hosts with more
+available RAM, and a negative number will result in the scheduler preferring
+hosts with less available RAM. Another way to look at it is that positive
+values for this option will tend to spread containers across many hosts, while
+negative values will tend to fill up (stack) hosts as much as possible before
+scheduling to a less-used host. The absolute value, whether positive or
+negative, controls how strong the RAM weigher is relative to other weighers.
+
+This option is only used by the FilterScheduler and its subclasses; if you use
+a different scheduler, this option has no effect. Also note that this setting
+only affects scheduling if the 'RAMWeigher' weigher is enabled.
+
+Possible values:
+
+* An integer or float value, where the value corresponds to the multipler
+  ratio for this weigher.
+"""),
+    cfg.FloatOpt("cpu_weight_multiplier",
+                 default=1.0,
+                 help="""
+CPU weight multiplier ratio.
+
+This option determines how hosts with more or less available CPUs are weighed.
+A positive value spreads containers across hosts, a negative value stacks
+them on the busiest hosts first.
+
+This option is only used by the FilterScheduler and its subclasses; if you use
+a different scheduler, this option has no effect. Also note that this setting
+only affects scheduling if the 'CPUWeigher' weigher is enabled.
+
+Possible values:
+
+* An integer or float value, where the value corresponds to the multipler
+  ratio for this weigher.
+"""),
+    cfg.FloatOpt("container_weight_multiplier",
+                 default=-1.0,
+                 help="""
+Container count weight multiplier ratio.
+
+This option determines how hosts with more or less containers are weighed.
+A negative value will result in the scheduler preferring hosts with fewer
+containers, and a positive value will result in the scheduler preferring
+hosts with more containers.
+
+This option is only used by the FilterScheduler and its subclasses; if you use
+a different scheduler, this option has no effect. Also note that this setting
+only affects scheduling if the 'ContainerCountWeigher' weigher is enabled.
+
+Possible values:
+
+* An integer or float value, where the value corresponds to the multipler
+  ratio for this weigher.
+"""),
+    cfg.FloatOpt("label_weight_multiplier",
+                 default=1.0,
+                 help="""
+Label weight multiplier ratio.
+
+This option determines how strongly the scheduler prefers the hosts having
+the labels requested by the 'label:<key>=<value>' scheduler hints of a
+container. Set it to 0 to ignore the labels when weighing the hosts.
+
+This option is only used by the FilterScheduler and its subclasses; if you use
+a different scheduler, this option has no effect. Also note that this setting
+only affects scheduling if the 'LabelWeigher' weigher is enabled.
+
+Possible values:
+
+* An integer or float value, where the value corresponds to the multipler
+  ratio for this weigher.
+"""),
+    cfg.FloatOpt("image_weight_multiplier",
+                 default=1.0,
+                 help="""
+Image locality weight multiplier ratio.
+
+This option determines how strongly the scheduler prefers the hosts which
+already have the image of a container, as reported by the compute nodes. A
+container placed on such a host does not wait for its image to be pulled. Set
+it to 0 to ignore the images of the hosts.
+
+This option is only used by the FilterScheduler and its subclasses; if you use
+a different scheduler, this option has no effect. Also note that this setting
+only affects scheduling if the 'ImageWeigher' weigher is enabled.
+
+Possible values:
+
+* An integer or float value, where the value corresponds to the multiplier
+  ratio for this weigher.
+
+Related options:
+
+* [compute]max_reported_images
+"""),
+    cfg.IntOpt("host_subset_size",
+               default=1,
+               min=1,
+               help="""
+Size of subset of best hosts selected by scheduler.
+
+New containers will be scheduled on a host chosen randomly from a subset of
+the N best hosts, where N is the value set by this option. The hosts weighed
+as high as the last host of the subset are part of it too, so that equally
+good hosts share the load.
+
+Setting this to a value greater than 1 reduces the chance that multiple
+scheduler processes handling similar requests will select the same host,
+creating a potential race condition. By selecting a host randomly from the N
+hosts that best fit the request, the chance of a conflict is reduced. However,
+the higher you set this value, the less optimal the chosen host may be for a
+given request.
+
+This option is only used by the FilterScheduler and its subclasses; if you use
+a different scheduler, this option has no effect.
+
+Possible values:
+
+* A positive integer, where the integer corresponds to the size of a host
+  subset.
+"""),
+    cfg.IntOpt("host_state_refresh_interval",
+               default=5,
+               min=0,
+               help="""
+Seconds during which the scheduler reuses the states of the compute hosts.
+
+After this interval, only the compute nodes updated since the previous refresh
+are loaded from the database. In between, the resources requested by the
+containers placed by the scheduler are subtracted from the cached states.
+Set it to 0 to refresh the states on every request.
+
+Related options:
+
+* host_state_max_age
+* host_state_refresh_margin
+"""),
+    cfg.IntOpt("host_state_refresh_margin",
+               default=60,
+               min=0,
+               help="""
+Seconds subtracted from the time of the previous refresh to select the compute
+nodes to load.
+
+The margin covers the clock skew between the scheduler and the compute hosts,
+which set the update times of their nodes. The nodes whose resources did not
+change are not loaded again, so a larger margin only costs a larger query.
+
+Related options:
+
+* host_state_refresh_interval
+"""),
+    cfg.IntOpt("host_state_max_age",
+               default=300,
+               min=0,
+               help="""
+Seconds after which the states of all compute hosts are reloaded.
+
+A full reload drops the hosts which have been removed, and recovers from
+updates missed by the incremental refresh.
+
+Related options:
+
+* host_state_refresh_interval
 """),
 ]
 
@@ -21,12 +21,15 @@ from oslo_log import log as logging
 from oslo_utils import timeutils
 
 from zun.common import consts
+from zun.common import container_actions
 from zun.common import exception
 from zun.common.i18n import _
 from zun.common import utils
 from zun.common.utils import check_container_id
 import zun.conf
+from zun.container.docker import events as docker_events
 from zun.container.docker import host
+from zun.container.docker import sandbox_pool
 from zun.container.docker import utils as docker_utils
 from zun.container import driver
 from zun.network import network as zun_network
@@ -96,19 +99,33 @@ class DockerDriver(driver.ContainerDriver):
     def __init__(self):
         super(DockerDriver, self).__init__()
         self._host = host.Host()
+        # The CPUs allocated to each docker container, keyed by container
+        # id, so that they do not need to be inspected on every update of
+        # the resources of the host.
+        self._cpu_allocations = {}
 
-    def load_image(self, image_path=None):
+    def load_image(self, image_path=None, data=None):
         with docker_utils.docker_client() as docker:
             if image_path:
                 with open(image_path, 'rb') as fd:
                     LOG.debug('Loading local image %s into docker', image_path)
                     docker.load_image(fd)
+            elif data is not None:
+                LOG.debug('Loading image stream into docker')
+                return docker.load_image_stream(data)
 
     def inspect_image(self, image):
         with docker_utils.docker_client() as docker:
             LOG.debug('Inspecting image %s', image)
             return docker.inspect_image(image)
 
+    def image_exists(self, image):
+        try:
+            self.inspect_image(image)
+        except errors.NotFound:
+            return False
+        return True
+
     def get_image(self, name):
         LOG.debug('Obtaining image %s', name)
         with docker_utils.docker_client() as docker:
@@ -123,6 +140,23 @@ class DockerDriver(driver.ContainerDriver):
         with docker_utils.docker_client() as docker:
             return docker.images(repo, quiet)
 
+    def get_local_images(self):
+        limit = CONF.compute.max_reported_images
+        if not limit:
+            return []
+        with docker_utils.docker_client() as docker:
+            images = docker.images()
+        # NOTE: Report the largest images first, pulling them is what
+        # delays the creation of a container the most.
+        images = sorted(images, key=lambda image: image.get('Size') or 0,
+                        reverse=True)
+        refs = []
+        for image in images:
+            for tag in image.get('RepoTags') or []:
+                if tag != '<none>:<none>':
+                    refs.append(tag)
+        return sorted(refs[:limit])
+
     def read_tar_image(self, image):
         with docker_utils.docker_client() as docker:
             LOG.debug('Reading local tar image %s ', image['path'])
@@ -140,7 +174,6 @@ class DockerDriver(driver.ContainerDriver):
             name = container.name
             LOG.debug('Creating container with image %(image)s name %(name)s',
                       {'image': image['image'], 'name': name})
-            self._provision_network(context, network_api, requested_networks)
             binds = self._get_binds(context, requested_volumes)
             kwargs = {
                 'name': self.get_container_name(container),
@@ -161,6 +194,15 @@ class DockerDriver(driver.ContainerDriver):
 
             host_config = {}
             host_config['runtime'] = runtime
+            with utils.EventReporter(
+                    context, container_actions.EVENT_NETWORK_PROVISION,
+                    container.uuid):
+                self._provision_network(context, network_api,
+                                        requested_networks)
+                if not sandbox_id:
+                    self._process_networking_config(
+                        context, container, requested_networks, host_config,
+                        kwargs, docker)
             if sandbox_id:
                 host_config['network_mode'] = 'container:%s' % sandbox_id
                 # TODO(hongbin): Uncomment this after docker-py add support for
@@ -169,9 +211,6 @@ class DockerDriver(driver.ContainerDriver):
                 host_config['ipc_mode'] = 'container:%s' % sandbox_id
                 host_config['volumes_from'] = sandbox_id
             else:
-                self._process_networking_config(
-                    context, container, requested_networks, host_config,
-                    kwargs, docker)
                 host_config['binds'] = binds
                 kwargs['volumes'] = [b['bind'] for b in binds.values()]
             if container.auto_remove:
@@ -188,14 +227,22 @@ class DockerDriver(driver.ContainerDriver):
                                                  'MaximumRetryCount': count}
             kwargs['host_config'] = docker.create_host_config(**host_config)
             image_repo = image['repo'] + ":" + image['tag']
-            response = docker.create_container(image_repo, **kwargs)
+            with utils.EventReporter(context,
+                                     container_actions.EVENT_DOCKER_CREATE,
+                                     container.uuid):
+                response = docker.create_container(image_repo, **kwargs)
             container.container_id = response['Id']
 
-            addresses = self._setup_network_for_container(
-                context, container, requested_networks, network_api)
+            with utils.EventReporter(context,
+                                     container_actions.EVENT_NETWORK_CONNECT,
+                                     container.uuid):
+                addresses = self._setup_network_for_container(
+                    context, container, requested_networks, network_api)
             container.addresses = addresses
 
             response = docker.inspect_container(container.container_id)
+            self._cpu_allocations[container.container_id] = \
+                self._get_cpu_allocation(response['HostConfig'])
             self._populate_container(container, response)
             container.save(context)
             return container
@@ -279,6 +326,7 @@ class DockerDriver(driver.ContainerDriver):
                 self._cleanup_network_for_container(container, network_api)
 
             if container.container_id:
+                self._cpu_allocations.pop(container.container_id, None)
                 try:
                     docker.remove_container(container.container_id,
                                             force=force)
@@ -295,13 +343,15 @@ class DockerDriver(driver.ContainerDriver):
             network_api.disconnect_container_from_network(
                 container, docker_net, neutron_network_id=neutron_net)
 
-    def list(self, context):
+    def list(self, context, db_containers=None):
         id_to_container_map = {}
         with docker_utils.docker_client() as docker:
             id_to_container_map = {c['Id']: c
                                    for c in docker.list_containers()}
 
-        db_containers = objects.Container.list_by_host(context, CONF.host)
+        if db_containers is None:
+            db_containers = objects.Container.list_by_host(context,
+                                                           CONF.host)
         for db_container in db_containers:
             if db_container.status in (consts.CREATING, consts.DELETING,
                                        consts.DELETED):
@@ -325,7 +375,10 @@ class DockerDriver(driver.ContainerDriver):
         return db_containers
 
     def update_containers_states(self, context, containers):
-        db_containers = self.list(context)
+        # NOTE: The containers are already loaded from the DB, populate
+        # copies of them rather than loading them again.
+        db_containers = self.list(
+            context, [container.obj_clone() for container in containers])
         if not db_containers:
             return
 
@@ -636,7 +689,10 @@ class DockerDriver(driver.ContainerDriver):
             args['cpu_period'] = 100000
 
         with docker_utils.docker_client() as docker:
-            return docker.update_container(container.container_id, **args)
+            result = docker.update_container(container.container_id, **args)
+            if cpu is not None:
+                self._cpu_allocations[container.container_id] = float(cpu)
+            return result
 
     @check_container_id
     def get_websocket_url(self, context, container):
@@ -752,21 +808,25 @@ class DockerDriver(driver.ContainerDriver):
         with docker_utils.docker_client() as docker:
             network_api = zun_network.api(context=context, docker_api=docker)
             self._provision_network(context, network_api, requested_networks)
-            binds = self._get_binds(context, requested_volumes)
-            host_config = {'binds': binds}
             name = self.get_sandbox_name(container)
-            volumes = [b['bind'] for b in binds.values()]
-            kwargs = {
-                'name': name,
-                'hostname': name[:63],
-                'volumes': volumes,
-            }
-            self._process_networking_config(
-                context, container, requested_networks, host_config,
-                kwargs, docker)
-            kwargs['host_config'] = docker.create_host_config(**host_config)
-            sandbox = docker.create_container(image, **kwargs)
-            container.set_sandbox_id(sandbox['Id'])
+            sandbox_id = self._claim_pooled_sandbox(
+                docker, container, name, requested_volumes, image)
+            if sandbox_id is None:
+                binds = self._get_binds(context, requested_volumes)
+                host_config = {'binds': binds}
+                volumes = [b['bind'] for b in binds.values()]
+                kwargs = {
+                    'name': name,
+                    'hostname': name[:63],
+                    'volumes': volumes,
+                }
+                self._process_networking_config(
+                    context, container, requested_networks, host_config,
+                    kwargs, docker)
+                kwargs['host_config'] = docker.create_host_config(
+                    **host_config)
+                sandbox_id = docker.create_container(image, **kwargs)['Id']
+            container.set_sandbox_id(sandbox_id)
             addresses = self._setup_network_for_container(
                 context, container, requested_networks, network_api)
             if addresses is None:
@@ -776,8 +836,22 @@ class DockerDriver(driver.ContainerDriver):
             container.addresses = addresses
             container.save(context)
 
-            docker.start(sandbox['Id'])
-            return sandbox['Id']
+            docker.start(sandbox_id)
+            return sandbox_id
+
+    def _claim_pooled_sandbox(self, docker, container, name,
+                              requested_volumes, image):
+        # NOTE: Pooled sandboxes are created without volumes, and docker
+        # cannot change their hostname, so they can only be used by
+        # containers that do not request volumes or a hostname.
+        pool = sandbox_pool.get_sandbox_pool()
+        if (pool is None or requested_volumes or container.hostname or
+                image != CONF.sandbox_image):
+            return None
+        return pool.claim(docker, name)
+
+    def get_sandbox_pool(self):
+        return sandbox_pool.get_sandbox_pool()
 
     def attach_volume(self, context, volume_mapping):
         volume_driver = vol_driver.driver(
@@ -855,24 +929,43 @@ class DockerDriver(driver.ContainerDriver):
             return (total, running, paused, stopped, cpus,
                     architecture, os_type, os, kernel_version, labels)
 
+    @staticmethod
+    def _get_cpu_allocation(host_config):
+        cpu_period = host_config.get('CpuPeriod')
+        cpu_quota = host_config.get('CpuQuota')
+        if cpu_period and cpu_quota:
+            return float(cpu_quota) / cpu_period
+        nanocpus = host_config.get('NanoCpus')
+        if nanocpus:
+            return float(nanocpus) / 1e9
+        return 0.0
+
+    def invalidate_cpu_allocation(self, container_id):
+        """Inspect the container again on the next update of resources."""
+        self._cpu_allocations.pop(container_id, None)
+
     def get_cpu_used(self):
         cpu_used = 0
         with docker_utils.docker_client() as docker:
-            containers = docker.containers()
+            containers = docker.containers(all=True)
+            existing = set()
             for container in containers:
                 cnt_id = container['Id']
-                # Fixme: if there is a way to get all container inspect info
-                # for one call only?
-                inspect = docker.inspect_container(cnt_id)
-                cpu_period = inspect['HostConfig']['CpuPeriod']
-                cpu_quota = inspect['HostConfig']['CpuQuota']
-                if cpu_period and cpu_quota:
-                    cpu_used += float(cpu_quota) / cpu_period
-                else:
-                    if 'NanoCpus' in inspect['HostConfig']:
-                        nanocpus = inspect['HostConfig']['NanoCpus']
-                        cpu_used += float(nanocpus) / 1e9
-            return cpu_used
+                existing.add(cnt_id)
+                # NOTE: A paused container still holds its CPUs.
+                if container.get('State') not in ('running', 'paused'):
+                    continue
+                if cnt_id not in self._cpu_allocations:
+                    # Only the containers created out of Zun, or changed
+                    # behind its back, are inspected.
+                    inspect = docker.inspect_container(cnt_id)
+                    self._cpu_allocations[cnt_id] = \
+                        self._get_cpu_allocation(inspect['HostConfig'])
+                cpu_used += self._cpu_allocations[cnt_id]
+        # Forget the containers removed without Zun knowing it.
+        for cnt_id in set(self._cpu_allocations) - existing:
+            del self._cpu_allocations[cnt_id]
+        return cpu_used
 
     def add_security_group(self, context, container, security_group):
 
@@ -885,6 +978,11 @@ class DockerDriver(driver.ContainerDriver):
     def get_available_nodes(self):
         return [self._host.get_hostname()]
 
+    def get_event_watcher(self):
+        if not CONF.docker.enable_event_watcher:
+            return None
+        return docker_events.EventWatcher(self)
+
     def network_detach(self, context, container, network):
         with docker_utils.docker_client() as docker:
             network_api = zun_network.api(context,
@@ -0,0 +1,118 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Keeps container states in sync by watching the docker events stream.
+"""
+
+import eventlet
+import six
+
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+from zun.common import consts
+from zun.common import context as zun_context
+from zun.common import exception
+import zun.conf
+from zun.container.docker import utils as docker_utils
+from zun import objects
+
+CONF = zun.conf.CONF
+LOG = logging.getLogger(__name__)
+
+# Docker events that may change the state of a container.
+SYNC_EVENTS = ('start', 'die', 'oom', 'kill', 'stop', 'pause', 'unpause',
+               'restart', 'destroy')
+# Docker events that may change the CPUs allocated to a container.
+ALLOCATION_EVENTS = ('update', 'destroy')
+CONTAINER_PREFIX = 'zun-'
+SANDBOX_PREFIX = 'zun-sandbox-'
+
+
+class EventWatcher(object):
+    """Watches docker events and syncs the affected containers.
+
+    Each relevant event triggers an inspect of only the container it refers
+    to, instead of re-listing every container on the host.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.connected_since = None
+
+    @property
+    def connected(self):
+        return self.connected_since is not None
+
+    def run(self):
+        ctx = zun_context.get_admin_context(all_tenants=True)
+        filters = {'type': 'container',
+                   'event': sorted(set(SYNC_EVENTS + ALLOCATION_EVENTS))}
+        while True:
+            try:
+                with docker_utils.docker_client() as docker:
+                    events = docker.events(decode=True, filters=filters)
+                    self.connected_since = timeutils.utcnow()
+                    LOG.debug('Watching docker events.')
+                    for event in events:
+                        self._safe_process_event(ctx, event)
+            except Exception as e:
+                LOG.warning('Docker events stream is interrupted: %s',
+                            six.text_type(e))
+            self.connected_since = None
+            eventlet.sleep(CONF.docker.event_watcher_retry_interval)
+
+    def _safe_process_event(self, ctx, event):
+        try:
+            self.process_event(ctx, event)
+        except Exception as e:
+            LOG.exception('Failed to process docker event %(event)s: %(e)s',
+                          {'event': event, 'e': six.text_type(e)})
+
+    def process_event(self, ctx, event):
+        action = event.get('Action') or event.get('status')
+        if action in ALLOCATION_EVENTS:
+            self.driver.invalidate_cpu_allocation(event.get('id'))
+        if action not in SYNC_EVENTS:
+            return
+
+        attributes = event.get('Actor', {}).get('Attributes', {})
+        name = attributes.get('name', '')
+        if (not name.startswith(CONTAINER_PREFIX) or
+                name.startswith(SANDBOX_PREFIX)):
+            return
+
+        uuid = name[len(CONTAINER_PREFIX):]
+        try:
+            container = objects.Container.get_by_uuid(ctx, uuid)
+        except exception.ContainerNotFound:
+            return
+
+        if container.container_id != event.get('id'):
+            return
+        if (container.status in (consts.CREATING, consts.DELETING,
+                                 consts.DELETED) or
+                container.task_state is not None):
+            # The compute manager is operating on this container and will
+            # record its state once the operation is done.
+            return
+
+        old_status = container.status
+        self.driver.show(ctx, container)
+        if container.obj_what_changed():
+            container.save(ctx)
+        if container.status != old_status:
+            LOG.info('Status of container %s changed from %s to %s on '
+                     'docker event %s', container.uuid, old_status,
+                     container.status, action)
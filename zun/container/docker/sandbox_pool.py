@@ -0,0 +1,198 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A pool of sandbox containers created ahead of time.
+"""
+
+import collections
+import threading
+import time
+
+import eventlet
+import six
+
+from oslo_log import log as logging
+from oslo_utils import uuidutils
+
+import zun.conf
+from zun.container.docker import utils as docker_utils
+
+CONF = zun.conf.CONF
+LOG = logging.getLogger(__name__)
+
+POOL_PREFIX = 'zun-sandbox-pool-'
+# The network the pooled sandboxes are created on. A sandbox created with
+# the 'none' network mode keeps it after it is disconnected, so use the
+# default bridge network, which can be swapped for any other network.
+POOL_NETWORK = 'bridge'
+# Interval in seconds at which a full pool checks whether it needs refill.
+IDLE_INTERVAL = 1
+# Maximum interval in seconds between attempts of a failing refill.
+MAX_BACKOFF = 60
+
+
+class SandboxPool(object):
+    """Keeps sandbox containers ready to be claimed.
+
+    The pooled sandboxes are created from ``CONF.sandbox_image`` on the
+    ``POOL_NETWORK`` network and are not started. A claimed sandbox is
+    renamed and disconnected from that network so that the driver can
+    connect it to the requested networks and start it. Its hostname is the
+    one it was created with, since docker cannot change it afterwards. The
+    pool is refilled in the background at no more than
+    ``CONF.docker.sandbox_pool_refill_rate`` sandboxes per second. The
+    sandbox image is pulled before the pool is filled, and again after a
+    refill failed. Consecutive failures back off exponentially up to
+    ``MAX_BACKOFF`` seconds.
+    """
+
+    def __init__(self):
+        self._sandboxes = collections.deque()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.failures = 0
+        self._consecutive_failures = 0
+        self._image_ready = False
+        self._started_at = time.time()
+
+    def __len__(self):
+        return len(self._sandboxes)
+
+    def stats(self):
+        """Return the counters of the pool.
+
+        ``refill_rate`` is the average number of sandboxes added per second
+        since the pool was created.
+        """
+        elapsed = max(time.time() - self._started_at, 1)
+        return {'size': len(self), 'hits': self.hits, 'misses': self.misses,
+                'refills': self.refills, 'failures': self.failures,
+                'refill_rate': round(self.refills / elapsed, 3)}
+
+    def run(self, pull_image):
+        """Keep the pool filled.
+
+        :param pull_image: a function which pulls ``CONF.sandbox_image`` and
+                           loads it into docker.
+        """
+        self._remove_stale_sandboxes()
+        while True:
+            if len(self) >= CONF.docker.sandbox_pool_size:
+                eventlet.sleep(IDLE_INTERVAL)
+                continue
+            self._refill(pull_image)
+            eventlet.sleep(self._refill_interval())
+
+    def _refill(self, pull_image):
+        try:
+            if not self._image_ready:
+                pull_image()
+                self._image_ready = True
+            self._add_sandbox()
+            self._consecutive_failures = 0
+        except Exception as e:
+            # NOTE: The image may have been removed in the meantime, so
+            # make sure it is there before the next attempt.
+            self._image_ready = False
+            self.failures += 1
+            self._consecutive_failures += 1
+            LOG.warning('Failed to create a sandbox for the pool, retrying '
+                        'in %(interval)s seconds: %(e)s',
+                        {'interval': self._refill_interval(),
+                         'e': six.text_type(e)})
+
+    def _refill_interval(self):
+        interval = 1.0 / CONF.docker.sandbox_pool_refill_rate
+        if not self._consecutive_failures:
+            return interval
+        backoff = interval * 2 ** min(self._consecutive_failures, 16)
+        return max(interval, min(backoff, MAX_BACKOFF))
+
+    def _remove_stale_sandboxes(self):
+        """Remove the pooled sandboxes left over by a previous run."""
+        try:
+            with docker_utils.docker_client() as docker:
+                for c in docker.containers(all=True,
+                                           filters={'name': POOL_PREFIX}):
+                    docker.remove_container(c['Id'], force=True)
+        except Exception as e:
+            LOG.warning('Failed to remove stale pooled sandboxes: %s',
+                        six.text_type(e))
+
+    def _add_sandbox(self):
+        name = POOL_PREFIX + uuidutils.generate_uuid()
+        with docker_utils.docker_client() as docker:
+            host_config = docker.create_host_config(
+                network_mode=POOL_NETWORK)
+            sandbox = docker.create_container(
+                CONF.sandbox_image, name=name, hostname=name[:63],
+                host_config=host_config)
+        with self._lock:
+            self._sandboxes.append(sandbox['Id'])
+            self.refills += 1
+        LOG.debug('Added sandbox %(id)s to the pool: %(stats)s',
+                  {'id': sandbox['Id'], 'stats': self.stats()})
+
+    def claim(self, docker, name):
+        """Take a sandbox out of the pool.
+
+        :param docker: the docker client to use.
+        :param name: the name to give to the sandbox.
+        :returns: the id of the sandbox, or None if the pool is empty.
+        """
+        with self._lock:
+            sandbox_id = (self._sandboxes.popleft() if self._sandboxes
+                          else None)
+        if sandbox_id is not None:
+            try:
+                docker.rename(sandbox_id, name)
+                docker.disconnect_container_from_network(sandbox_id,
+                                                         POOL_NETWORK)
+            except Exception as e:
+                LOG.warning('Failed to claim pooled sandbox %(id)s: %(e)s',
+                            {'id': sandbox_id, 'e': six.text_type(e)})
+                self._remove_sandbox(docker, sandbox_id)
+                sandbox_id = None
+
+        with self._lock:
+            if sandbox_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return sandbox_id
+
+    def _remove_sandbox(self, docker, sandbox_id):
+        try:
+            docker.remove_container(sandbox_id, force=True)
+        except Exception as e:
+            LOG.warning('Failed to remove sandbox %(id)s: %(e)s',
+                        {'id': sandbox_id, 'e': six.text_type(e)})
+
+
+_SANDBOX_POOL = None
+_SANDBOX_POOL_LOCK = threading.Lock()
+
+
+def get_sandbox_pool():
+    """Return the sandbox pool of this process, or None if it is disabled."""
+    global _SANDBOX_POOL
+    if not CONF.use_sandbox or CONF.docker.sandbox_pool_size <= 0:
+        return None
+    if _SANDBOX_POOL is None:
+        with _SANDBOX_POOL_LOCK:
+            if _SANDBOX_POOL is None:
+                _SANDBOX_POOL = SandboxPool()
+    return _SANDBOX_POOL
@@ -10,15 +10,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import contextlib
 import six
 import sys
 import tarfile
+import threading
+import time
 
 import docker
 from docker import errors
+from oslo_log import log as logging
 from oslo_serialization import jsonutils
 from oslo_utils import encodeutils
+import requests
 
 from zun.common import exception
 from zun.common.i18n import _
@@ -26,26 +31,116 @@ import zun.conf
 
 
 CONF = zun.conf.CONF
+LOG = logging.getLogger(__name__)
 
+LOADED_IMAGE_PREFIX = 'Loaded image: '
 
-@contextlib.contextmanager
-def docker_client():
-    client_kwargs = dict()
-    if not CONF.docker.api_insecure:
-        client_kwargs['ca_cert'] = CONF.docker.ca_file
-        client_kwargs['client_key'] = CONF.docker.key_file
-        client_kwargs['client_cert'] = CONF.docker.cert_file
 
-    try:
-        yield DockerHTTPClient(
+class DockerClientPool(object):
+    """A process-wide pool of reusable docker clients.
+
+    Each ``DockerHTTPClient`` owns a requests session whose connections are
+    kept alive between calls, so handing the same clients out again avoids
+    paying for a new connection (and TLS handshake) on every docker call.
+    The pool never blocks: if no idle client is available a new one is
+    created, and at most ``max_size`` idle clients are kept around.
+    """
+
+    def __init__(self, max_size, idle_timeout):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle = collections.deque()
+        self._lock = threading.Lock()
+
+    def _create_client(self):
+        client_kwargs = dict()
+        if not CONF.docker.api_insecure:
+            client_kwargs['ca_cert'] = CONF.docker.ca_file
+            client_kwargs['client_key'] = CONF.docker.key_file
+            client_kwargs['client_cert'] = CONF.docker.cert_file
+
+        return DockerHTTPClient(
             CONF.docker.api_url,
             CONF.docker.docker_remote_api_version,
             CONF.docker.default_timeout,
             **client_kwargs
         )
+
+    def _evict_idle(self, now):
+        # NOTE: The deque is ordered by the time each client was returned,
+        # so expired clients are always at the left end.
+        expired = []
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            expired.append(self._idle.popleft()[0])
+        return expired
+
+    def get(self):
+        client = None
+        with self._lock:
+            expired = self._evict_idle(time.time())
+            if self._idle:
+                client = self._idle.pop()[0]
+        for stale in expired:
+            self._close(stale)
+        if client is None:
+            client = self._create_client()
+        return client
+
+    def put(self, client, discard=False):
+        if not discard:
+            with self._lock:
+                if len(self._idle) < self.max_size:
+                    self._idle.append((client, time.time()))
+                    return
+        self._close(client)
+
+    def clear(self):
+        with self._lock:
+            clients = [c for c, _used in self._idle]
+            self._idle.clear()
+        for client in clients:
+            self._close(client)
+
+    def _close(self, client):
+        try:
+            client.close()
+        except Exception:
+            LOG.debug('Failed to close docker client', exc_info=True)
+
+
+_CLIENT_POOL = None
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def get_client_pool():
+    global _CLIENT_POOL
+    if _CLIENT_POOL is None:
+        with _CLIENT_POOL_LOCK:
+            if _CLIENT_POOL is None:
+                _CLIENT_POOL = DockerClientPool(
+                    CONF.docker.client_pool_size,
+                    CONF.docker.client_idle_timeout)
+    return _CLIENT_POOL
+
+
+@contextlib.contextmanager
+def docker_client():
+    pool = get_client_pool()
+    client = pool.get()
+    discard = False
+    try:
+        yield client
     except errors.APIError as e:
         desired_exc = exception.DockerError(error_msg=six.text_type(e))
         six.reraise(type(desired_exc), desired_exc, sys.exc_info()[2])
+    except requests.exceptions.RequestException:
+        # NOTE: The connection to the docker daemon is broken (i.e. docker
+        # was restarted). Drop this client so that the next caller
+        # reconnects with a fresh session.
+        discard = True
+        raise
+    finally:
+        pool.put(client, discard=discard)
 
 
 class DockerHTTPClient(docker.APIClient):
@@ -98,6 +193,23 @@ class DockerHTTPClient(docker.APIClient):
             repo, tag = repo_tag.split(":")
             image['repo'], image['tag'] = repo, tag
 
+    def load_image_stream(self, data):
+        """Load an image from an iterable of tarball chunks.
+
+        :returns: the name of the loaded image as repo:tag.
+        """
+        repo_tag = None
+        for line in self.load_image(data) or []:
+            if 'error' in line:
+                raise exception.DockerError(line['error'])
+            stream = line.get('stream', '')
+            if stream.startswith(LOADED_IMAGE_PREFIX):
+                repo_tag = stream[len(LOADED_IMAGE_PREFIX):].strip()
+        if not repo_tag:
+            raise exception.DockerError(
+                _('Unable to find the name of the loaded image'))
+        return repo_tag
+
     def exec_resize(self, exec_id, height=None, width=None):
         # NOTE(hongbin): This is a temporary work-around for a docker issue
         # See: https://github.com/moby/moby/issues/35561
@@ -60,6 +60,10 @@ def load_container_driver(container_driver=None):
 class ContainerDriver(object):
     """Base class for container drivers."""
 
+    # The facts about the host which do not change while the service runs,
+    # probed on first use and kept until refresh_host_capabilities().
+    _host_capabilities = None
+
     def create(self, context, container, **kwargs):
         """Create a container."""
         raise NotImplementedError()
@@ -72,8 +76,12 @@ class ContainerDriver(object):
         """Delete a container."""
         raise NotImplementedError()
 
-    def list(self, context):
-        """List all containers."""
+    def list(self, context, db_containers=None):
+        """List all containers.
+
+        :param db_containers: the containers of this host, if they are
+                              already loaded from the DB.
+        """
         raise NotImplementedError()
 
     def update_containers_states(self, context, containers):
@@ -192,9 +200,38 @@ class ContainerDriver(object):
     def get_host_info(self):
         raise NotImplementedError()
 
+    def get_container_counts(self):
+        """Return the number of containers of the host by state.
+
+        :returns: a tuple (total, running, paused, stopped)
+        """
+        return self.get_host_info()[:4]
+
+    def refresh_host_capabilities(self):
+        """Probe the static facts about the host again on next use."""
+        self._host_capabilities = None
+
+    def _get_host_capabilities(self):
+        if self._host_capabilities is None:
+            info = self.get_host_info()
+            self._host_capabilities = {
+                'numa_topology': self.get_host_numa_topology(),
+                'cpus': info[4],
+                'architecture': info[5],
+                'os_type': info[6],
+                'os': info[7],
+                'kernel_version': info[8],
+                'labels': info[9],
+            }
+        return self._host_capabilities
+
     def get_cpu_used(self):
         raise NotImplementedError()
 
+    def get_local_images(self):
+        """Return the references ('repo:tag') of the images of the host."""
+        raise NotImplementedError()
+
     def attach_volume(self, context, volume_mapping):
         raise NotImplementedError()
 
@@ -211,29 +248,30 @@ class ContainerDriver(object):
         pass
 
     def get_available_resources(self, node):
-        numa_topo_obj = self.get_host_numa_topology()
-        node.numa_topology = numa_topo_obj
+        capabilities = self._get_host_capabilities()
+        # NOTE: The topology gets CPUs pinned by the resource tracker, so
+        # every node gets its own copy.
+        node.numa_topology = capabilities['numa_topology'].obj_clone()
         meminfo = self.get_host_mem()
         (mem_total, mem_free, mem_ava, mem_used) = meminfo
         node.mem_total = mem_total // units.Ki
         node.mem_free = mem_free // units.Ki
         node.mem_available = mem_ava // units.Ki
         node.mem_used = mem_used // units.Ki
-        info = self.get_host_info()
-        (total, running, paused, stopped, cpus,
-         architecture, os_type, os, kernel_version, labels) = info
+        (total, running, paused, stopped) = self.get_container_counts()
         node.total_containers = total
         node.running_containers = running
         node.paused_containers = paused
         node.stopped_containers = stopped
-        node.cpus = cpus
-        node.architecture = architecture
-        node.os_type = os_type
-        node.os = os
-        node.kernel_version = kernel_version
+        node.cpus = capabilities['cpus']
+        node.architecture = capabilities['architecture']
+        node.os_type = capabilities['os_type']
+        node.os = capabilities['os']
+        node.kernel_version = capabilities['kernel_version']
         cpu_used = self.get_cpu_used()
         node.cpu_used = cpu_used
-        node.labels = labels
+        node.labels = dict(capabilities['labels'])
+        node.images = self.get_local_images()
 
     def node_is_available(self, nodename):
         """Return whether this compute service manages a particular node."""
@@ -241,6 +279,24 @@ class ContainerDriver(object):
             return True
         return False
 
+    def get_event_watcher(self):
+        """Return a watcher of container state change events.
+
+        The returned object must provide a blocking ``run()`` method and a
+        ``connected_since`` attribute. Return None if the driver does not
+        support event notification.
+        """
+        return None
+
+    def get_sandbox_pool(self):
+        """Return a pool of sandboxes created ahead of time.
+
+        The returned object must provide a blocking ``run(pull_image)``
+        method that keeps the pool filled, and a ``stats()`` method. Return
+        None if the driver has no such pool.
+        """
+        return None
+
     def network_detach(self, context, container, network):
         raise NotImplementedError()
 
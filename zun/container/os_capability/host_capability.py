@@ -13,8 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+
 from oslo_concurrency import processutils
+from oslo_log import log as logging
 from oslo_serialization import jsonutils
+import six
 
 from zun.common import exception
 from zun.common import utils
@@ -22,6 +26,13 @@ from zun import objects
 from zun.objects import fields
 from zun.pci import utils as pci_utils
 
+LOG = logging.getLogger(__name__)
+
+SYSFS_PCI_DEVICES = '/sys/bus/pci/devices'
+# The result of the last scan of the PCI devices, keyed by the tuple of the
+# addresses of the devices it found.
+_PCI_DEVICES_CACHE = {}
+
 
 class Host(object):
 
@@ -75,29 +86,44 @@ class Host(object):
         return int(mem_total), int(mem_free), int(mem_ava), int(mem_used)
 
     def get_pci_resources(self):
-        addresses = []
-        try:
-            output, status = processutils.execute('lspci', '-D', '-nnmm')
-            lines = output.split('\n')
-            for line in lines:
-                if not line:
-                    continue
-                columns = line.split()
-                address = columns[0]
-                addresses.append(address)
-        except processutils.ProcessExecutionError:
-            raise exception.CommandError(cmd='lspci')
+        """Returns the PCI devices of the host as a JSON list.
 
-        pci_info = []
-        for addr in addresses:
-            pci_info.append(self._get_pci_dev_info(addr))
+        The devices are read from sysfs. A scan is only done when the set of
+        devices of the host changed since the previous one, e.g. because
+        virtual functions were added, otherwise the cached result is used.
+        """
+        try:
+            addresses = tuple(sorted(os.listdir(SYSFS_PCI_DEVICES)))
+        except OSError as e:
+            LOG.warning("Unable to list the PCI devices of the host: %s",
+                        six.text_type(e))
+            addresses = ()
+
+        pci_info = _PCI_DEVICES_CACHE.get(addresses)
+        if pci_info is None:
+            pci_info = [self._get_pci_dev_info(addr) for addr in addresses]
+            _PCI_DEVICES_CACHE.clear()
+            _PCI_DEVICES_CACHE[addresses] = pci_info
 
         return jsonutils.dumps(pci_info)
 
     def _get_pci_dev_info(self, address):
         """Returns a dict of PCI device."""
+        path = os.path.join(SYSFS_PCI_DEVICES, address)
+
+        def _read(name):
+            try:
+                with open(os.path.join(path, name)) as fd:
+                    return fd.read().strip()
+            except IOError:
+                return None
 
-        def _get_device_type(address):
+        def _get_id(name):
+            # The ids are written as hex numbers, e.g. 0x8086
+            value = _read(name) or ''
+            return value[2:] if value.startswith('0x') else value
+
+        def _get_device_type():
             """Get a PCI device's device type.
 
             An assignable PCI device can be a normal PCI device,
@@ -105,30 +131,16 @@ class Host(object):
             Function (VF). Only normal PCI devices or SR-IOV VFs
             are assignable.
             """
-            try:
-                path = '/sys/bus/pci/devices/' + address + '/'
-                output, status = processutils.execute('ls', path)
-                if "physfn" in output:
-                    phys_address = None
-                    upath = '/sys/bus/pci/devices/%s/physfn/uevent' % address
-                    try:
-                        ou, st = processutils.execute('cat', upath)
-                        lines = ou.split('\n')
-                        for line in lines:
-                            if 'PCI_SLOT_NAME' in line:
-                                columns = line.split("=")
-                                phys_address = columns[1]
-                    except processutils.ProcessExecutionError:
-                        raise exception.CommandError(cmd='cat')
-                    return {'dev_type': fields.PciDeviceType.SRIOV_VF,
-                            'parent_addr': phys_address}
-                if "virtfn" in output:
-                    return {'dev_type': fields.PciDeviceType.SRIOV_PF}
-            except processutils.ProcessExecutionError:
-                raise exception.CommandError(cmd='ls')
+            physfn = os.path.join(path, 'physfn')
+            if os.path.islink(physfn):
+                return {'dev_type': fields.PciDeviceType.SRIOV_VF,
+                        'parent_addr': os.path.basename(
+                            os.readlink(physfn))}
+            if any(entry.startswith('virtfn') for entry in os.listdir(path)):
+                return {'dev_type': fields.PciDeviceType.SRIOV_PF}
             return {'dev_type': fields.PciDeviceType.STANDARD}
 
-        def _get_device_capabilities(device, address):
+        def _get_device_capabilities(device):
             """Get PCI VF device's additional capabilities.
 
             If a PCI device is a virtual function, this function reads the PCI
@@ -142,42 +154,25 @@ class Host(object):
                             {'network': pcinet_info.get('capabilities')}}
             return {}
 
-        def _get_product_and_vendor(address):
-            try:
-                output, status = processutils.execute('lspci', '-n', '-s',
-                                                      address)
-                value = output.split()[2]
-                result = value.split(":")
-                return result[0], result[1]
-            except processutils.ProcessExecutionError:
-                raise exception.CommandError(cmd='lspci')
-
-        def _get_numa_node(address):
-            numa_node = None
+        def _get_numa_node():
+            # The kernel reports -1 if the device has no NUMA affinity.
             try:
-                output, status = processutils.execute('lspci', '-vmm', '-s',
-                                                      address)
-                lines = output.split('\n')
-                for line in lines:
-                    if 'NUMANode' in line:
-                        numa_node = int(line.split(":")[1])
-            except processutils.ProcessExecutionError:
-                raise exception.CommandError(cmd='lspci')
-            return numa_node
+                numa_node = int(_read('numa_node'))
+            except (TypeError, ValueError):
+                return None
+            return numa_node if numa_node >= 0 else None
 
         dev_name = 'pci_' + address.replace(":", "_").replace(".", "_")
-        product_id, vendor_id = _get_product_and_vendor(address)
-        numa_node = _get_numa_node(address)
         device = {
             "dev_id": dev_name,
             "address": address,
-            "product_id": product_id,
-            "vendor_id": vendor_id,
-            "numa_node": numa_node
+            "product_id": _get_id('device'),
+            "vendor_id": _get_id('vendor'),
+            "numa_node": _get_numa_node()
         }
         device['label'] = 'label_%(vendor_id)s_%(product_id)s' % device
-        device.update(_get_device_type(address))
-        device.update(_get_device_capabilities(device, address))
+        device.update(_get_device_type())
+        device.update(_get_device_capabilities(device))
         return device
 
     def _get_pcinet_info(self, vf_address):
@@ -859,6 +859,19 @@ def update_pci_device(node_id, address, value):
     return _get_dbdriver_instance().update_pci_device(node_id, address, value)
 
 
+@profiler.trace("db")
+def bulk_update_pci_devices(node_id, updates, deletes):
+    """Update, create and delete PCI devices of a host at once.
+
+    :param node_id: The uuid of the compute node of the devices.
+    :param updates: A dict of the values to be set, keyed by the address of
+                    the device. Devices which do not exist are created.
+    :param deletes: A list of the addresses of the devices to be deleted.
+    """
+    return _get_dbdriver_instance().bulk_update_pci_devices(
+        node_id, updates, deletes)
+
+
 @profiler.trace("db")
 def action_start(context, values):
     """Start an action for an container."""
@@ -597,6 +597,7 @@ class EtcdAPI(object):
         try:
             target = self.client.read('/compute_nodes/' + node_uuid)
             target_value = json.loads(target.value)
+            values['updated_at'] = datetime.isoformat(timeutils.utcnow())
             target_value.update(values)
             target.value = json.dumps(target_value)
             self.client.update(target)
@@ -639,6 +640,13 @@ class EtcdAPI(object):
         for c in res:
             if c.value is not None:
                 compute_nodes.append(translate_etcd_result(c, 'compute_node'))
+        if filters and 'updated_since' in filters:
+            filters = dict(filters)
+            since = datetime.isoformat(filters.pop('updated_since'))
+            compute_nodes = [
+                node for node in compute_nodes
+                if (node.get('updated_at') or
+                    node.get('created_at') or '') >= since]
         if filters:
             compute_nodes = self._filter_resources(compute_nodes, filters)
         return self._process_list_result(compute_nodes, limit=limit,
@@ -864,6 +872,34 @@ class EtcdAPI(object):
 
         return translate_etcd_result(target, 'pcidevice')
 
+    @lockutils.synchronized('etcd_pcidevice')
+    def bulk_update_pci_devices(self, node_id, updates, deletes):
+        # NOTE: etcd has no transactions over several keys, so the devices
+        # are written one by one, but the devices of the node are only read
+        # once.
+        existing = {pci_device.address: pci_device for pci_device in
+                    self.get_all_pci_device_by_node(node_id)}
+        for address in deletes:
+            if address in existing:
+                self.client.delete('/pcidevices/' + existing[address].uuid)
+        for address, values in updates.items():
+            if address not in existing:
+                values = dict(values, compute_node_uuid=node_id,
+                              address=address)
+                self._create_pci_device(values)
+                continue
+            try:
+                target = self.client.read(
+                    '/pcidevices/' + existing[address].uuid)
+                target_value = json.loads(target.value)
+                target_value.update(values)
+                target.value = json.dump_as_bytes(target_value)
+                self.client.update(target)
+            except Exception as e:
+                LOG.error('Error occurred while updating pci device: %s',
+                          six.text_type(e))
+                raise
+
     def list_volume_mappings(self, context, filters=None, limit=None,
                              marker=None, sort_key=None, sort_dir=None):
         try:
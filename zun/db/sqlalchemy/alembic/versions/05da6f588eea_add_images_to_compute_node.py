@@ -0,0 +1,37 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""add images to compute node
+
+Revision ID: 05da6f588eea
+Revises: b6bfca998431
+Create Date: 2018-06-04 10:12:37.204731
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '05da6f588eea'
+down_revision = 'b6bfca998431'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+import zun
+
+
+def upgrade():
+    op.add_column('compute_node',
+                  sa.Column('images',
+                            zun.db.sqlalchemy.models.JSONEncodedList(),
+                            nullable=True))
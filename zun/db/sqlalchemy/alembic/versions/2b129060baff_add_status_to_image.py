@@ -0,0 +1,33 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""add status to image
+
+Revision ID: 2b129060baff
+Revises: 05da6f588eea
+Create Date: 2018-06-12 09:41:05.318290
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '2b129060baff'
+down_revision = '05da6f588eea'
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('image',
+                  sa.Column('status', sa.String(length=20), nullable=True))
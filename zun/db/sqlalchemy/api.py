@@ -212,9 +212,21 @@ class Connection(object):
         with session.begin():
             query = model_query(models.Container, session=session)
             query = add_identity_filter(query, container_id)
-            count = query.delete()
-            if count != 1:
+            container = query.first()
+            if container is None:
                 raise exception.ContainerNotFound(container_id)
+            # The actions of a container are deleted along with it.
+            actions = model_query(models.ContainerAction, session=session)
+            actions = actions.filter_by(container_uuid=container.uuid)
+            action_ids = [action.id for action in actions]
+            if action_ids:
+                events = model_query(models.ContainerActionEvent,
+                                     session=session)
+                events.filter(
+                    models.ContainerActionEvent.action_id.in_(action_ids)
+                ).delete(synchronize_session=False)
+                actions.delete(synchronize_session=False)
+            query.delete()
 
     def update_container(self, context, container_id, values):
         # NOTE(dtantsur): this can lead to very strange errors
@@ -746,6 +758,12 @@ class Connection(object):
             if name in filters:
                 query = query.filter_by(**{name: filters[name]})
 
+        if 'updated_since' in filters:
+            since = filters['updated_since']
+            query = query.filter(sa.or_(
+                models.ComputeNode.updated_at >= since,
+                models.ComputeNode.created_at >= since))
+
         return query
 
     def list_compute_nodes(self, context, filters=None, limit=None,
@@ -900,7 +918,7 @@ class Connection(object):
             return query
 
         # filter_names = ['uuid', 'project_id', 'user_id', 'containers']
-        filter_names = ['uuid', 'project_id', 'user_id']
+        filter_names = ['uuid', 'project_id', 'user_id', 'host']
         for name in filter_names:
             if name in filters:
                 query = query.filter_by(**{name: filters[name]})
@@ -963,6 +981,36 @@ class Connection(object):
             device.save()
         return query.one()
 
+    def bulk_update_pci_devices(self, node_id, updates, deletes):
+        session = get_session()
+        with session.begin():
+            if deletes:
+                model_query(models.PciDevice, session=session).\
+                    filter_by(compute_node_uuid=node_id).\
+                    filter(models.PciDevice.address.in_(deletes)).\
+                    delete(synchronize_session=False)
+            if not updates:
+                return
+
+            query = model_query(models.PciDevice.id,
+                                models.PciDevice.address,
+                                session=session).\
+                filter_by(compute_node_uuid=node_id).\
+                filter(models.PciDevice.address.in_(list(updates)))
+            ids = {address: id for id, address in query}
+            to_update = []
+            to_insert = []
+            for address, values in updates.items():
+                if address in ids:
+                    to_update.append(dict(values, id=ids[address]))
+                else:
+                    to_insert.append(dict(values, compute_node_uuid=node_id,
+                                          address=address))
+            if to_update:
+                session.bulk_update_mappings(models.PciDevice, to_update)
+            if to_insert:
+                session.bulk_insert_mappings(models.PciDevice, to_insert)
+
     def action_start(self, context, values):
         action = models.ContainerAction()
         action.update(values)
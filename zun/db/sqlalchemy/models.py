@@ -206,6 +206,7 @@ class Image(Base):
     repo = Column(String(255))
     tag = Column(String(255))
     size = Column(String(255))
+    status = Column(String(20))
 
 
 class ResourceProvider(Base):
@@ -321,6 +322,7 @@ class ComputeNode(Base):
     os = Column(String(64), nullable=True)
     kernel_version = Column(String(128), nullable=True)
     labels = Column(JSONEncodedDict)
+    images = Column(JSONEncodedList)
     # Json string PCI Stats
     # '[{"vendor_id":"8086", "product_id":"1234", "count":3 }, ...]'
     pci_stats = Column(Text)
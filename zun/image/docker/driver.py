@@ -52,7 +52,8 @@ class DockerDriver(driver.ContainerImageDriver):
             except errors.NotFound as e:
                 raise exception.ImageNotFound(message=six.text_type(e))
 
-    def pull_image(self, context, repo, tag, image_pull_policy):
+    def pull_image(self, context, repo, tag, image_pull_policy,
+                   load_image=None, image_exists=None):
         image_loaded = True
         image = self._search_image_on_host(repo, tag)
         if not utils.should_pull_image(image_pull_policy, bool(image)):
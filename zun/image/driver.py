@@ -14,6 +14,7 @@
 
 import six
 import sys
+import threading
 
 from oslo_log import log as logging
 import stevedore
@@ -26,6 +27,10 @@ import zun.conf
 CONF = zun.conf.CONF
 LOG = logging.getLogger(__name__)
 
+# Process-level registry of instantiated image drivers, keyed by name.
+_IMAGE_DRIVERS = {}
+_IMAGE_DRIVERS_LOCK = threading.Lock()
+
 
 def load_image_driver(image_driver=None):
     """Load an image driver module.
@@ -58,8 +63,32 @@ def load_image_driver(image_driver=None):
         sys.exit(1)
 
 
+def get_image_driver(image_driver):
+    """Return the shared instance of an image driver.
+
+    The driver is loaded on first use and reused afterwards so that it can
+    keep state (i.e. clients and caches) across calls.
+    :param image_driver: container image driver name
+    :returns: a ContainerImageDriver instance
+    """
+    driver = _IMAGE_DRIVERS.get(image_driver)
+    if driver is None:
+        with _IMAGE_DRIVERS_LOCK:
+            driver = _IMAGE_DRIVERS.get(image_driver)
+            if driver is None:
+                driver = load_image_driver(image_driver)
+                _IMAGE_DRIVERS[image_driver] = driver
+    return driver
+
+
+def init_image_drivers():
+    """Load the image drivers of CONF.image_driver_list up front."""
+    for image_driver in CONF.image_driver_list:
+        get_image_driver(image_driver)
+
+
 def pull_image(context, repo, tag, image_pull_policy='always',
-               image_driver=None):
+               image_driver=None, load_image=None, image_exists=None):
     if image_driver:
         image_driver_list = [image_driver.lower()]
     else:
@@ -67,9 +96,10 @@ def pull_image(context, repo, tag, image_pull_policy='always',
 
     for driver in image_driver_list:
         try:
-            image_driver = load_image_driver(driver)
+            image_driver = get_image_driver(driver)
             image, image_loaded = image_driver.pull_image(
-                context, repo, tag, image_pull_policy)
+                context, repo, tag, image_pull_policy, load_image=load_image,
+                image_exists=image_exists)
             if image:
                 image['driver'] = driver.split('.')[0]
                 break
@@ -93,7 +123,7 @@ def search_image(context, image_name, image_driver, exact_match):
         image_driver_list = CONF.image_driver_list
     for driver in image_driver_list:
         try:
-            image_driver = load_image_driver(driver)
+            image_driver = get_image_driver(driver)
             imgs = image_driver.search_image(context, repo, tag,
                                              exact_match)
             images.extend(imgs)
@@ -148,8 +178,17 @@ def delete_image(context, img_id, image_driver):
 class ContainerImageDriver(object):
     """Base class for container image driver."""
 
-    def pull_image(self, context, repo, tag, image_pull_policy):
-        """Pull an image."""
+    def pull_image(self, context, repo, tag, image_pull_policy,
+                   load_image=None, image_exists=None):
+        """Pull an image.
+
+        :param load_image: a callable that loads the image data given as
+                           ``data`` into the container driver and returns
+                           the loaded image name. Drivers may use it to
+                           load an image without saving it to disk.
+        :param image_exists: a callable that tells whether the container
+                             driver has the image of the given name.
+        """
         raise NotImplementedError()
 
     def search_image(self, context, repo, tag, exact_match):
@@ -0,0 +1,251 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local cache of image tarballs downloaded from glance."""
+
+import hashlib
+import os
+import tempfile
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import fileutils
+
+import zun.conf
+
+CONF = zun.conf.CONF
+
+LOG = logging.getLogger(__name__)
+
+IMAGE_SUFFIX = '.tar'
+META_SUFFIX = '.meta'
+LOADED_SUFFIX = '.loaded'
+CHUNK_SIZE = 10 * 1024 * 1024
+
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r') as fd:
+            return jsonutils.loads(fd.read())
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as fd:
+        fd.write(jsonutils.dumps(data))
+    os.rename(tmp_path, path)
+
+
+class ImageCache(object):
+    """Manages the image tarballs in ``CONF.glance.images_directory``.
+
+    Each tarball has a metadata sidecar recording the repo it was pulled
+    for and, once verified, the checksum, size and mtime of the tarball.
+    A tarball is hashed only if its sidecar is missing or no longer matches
+    the file, so verification happens once per download. The mtime of the
+    sidecar records when the tarball was last used.
+
+    Images streamed into the container driver have no tarball, only a
+    record of the checksum of the image and the name it was loaded as. The
+    records are evicted along with the tarballs, least recently used first.
+    """
+
+    @property
+    def directory(self):
+        return CONF.glance.images_directory
+
+    def get_path(self, image_id):
+        return os.path.join(self.directory, image_id + IMAGE_SUFFIX)
+
+    def _meta_path(self, path):
+        return path + META_SUFFIX
+
+    def _read_meta(self, path):
+        return _read_json(self._meta_path(path))
+
+    def _write_meta(self, path, meta):
+        _write_json(self._meta_path(path), meta)
+
+    def _loaded_path(self, image_id):
+        return os.path.join(self.directory, image_id + LOADED_SUFFIX)
+
+    def record_loaded(self, image_id, repo, checksum, loaded_image):
+        """Records that a verified image was loaded as ``loaded_image``."""
+        fileutils.ensure_tree(self.directory)
+        _write_json(self._loaded_path(image_id),
+                    {'repo': repo,
+                     'checksum': checksum,
+                     'loaded_image': loaded_image})
+
+    def get_loaded(self, image_id, checksum):
+        """Returns the name an image with the checksum was loaded as."""
+        path = self._loaded_path(image_id)
+        record = _read_json(path)
+        if not record or not checksum or record.get('checksum') != checksum:
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return record.get('loaded_image')
+
+    def remove_loaded(self, image_id):
+        _remove(self._loaded_path(image_id))
+
+    def _touch(self, path):
+        try:
+            os.utime(self._meta_path(path), None)
+        except OSError:
+            pass
+
+    def open_for_write(self, image_id):
+        """Opens the tarball of an image for writing a new download."""
+        fileutils.ensure_tree(self.directory)
+        path = self.get_path(image_id)
+        _remove(self._meta_path(path))
+        return open(path, 'wb')
+
+    def open_temporary(self):
+        """Opens an anonymous file which is removed once it is closed."""
+        fileutils.ensure_tree(self.directory)
+        return tempfile.TemporaryFile(dir=self.directory)
+
+    def remove(self, path):
+        _remove(path)
+        _remove(self._meta_path(path))
+
+    def record(self, path, repo, checksum=None):
+        """Records the metadata of a tarball.
+
+        :param checksum: the checksum of the tarball content if it has been
+                         verified, otherwise it will be verified on its
+                         next use.
+        """
+        st = _stat(path)
+        if st is None:
+            return
+        self._write_meta(path, {'repo': repo,
+                                'checksum': checksum,
+                                'size': st.st_size,
+                                'mtime': st.st_mtime})
+
+    def verify(self, path, repo, checksum):
+        """Checks that a cached tarball has the expected checksum."""
+        st = _stat(path)
+        if st is None or not checksum:
+            return False
+
+        meta = self._read_meta(path)
+        if (meta and meta.get('checksum') == checksum and
+                meta.get('size') == st.st_size and
+                meta.get('mtime') == st.st_mtime):
+            self._touch(path)
+            return True
+
+        LOG.debug('Verifying checksum of image tarball %s', path)
+        md5sum = hashlib.md5()
+        with open(path, 'rb') as fd:
+            while True:
+                data = fd.read(CHUNK_SIZE)
+                if not data:
+                    break
+                md5sum.update(data)
+        if md5sum.hexdigest() != checksum:
+            return False
+
+        self._write_meta(path, {'repo': repo,
+                                'checksum': checksum,
+                                'size': st.st_size,
+                                'mtime': st.st_mtime})
+        return True
+
+    def _list_entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name.endswith(LOADED_SUFFIX):
+                st = _stat(path)
+                record = _read_json(path)
+                if st is None or record is None:
+                    continue
+                entries.append({'path': path,
+                                'repo': record.get('repo'),
+                                'size': st.st_size,
+                                'last_used': st.st_mtime})
+                continue
+            if not name.endswith(IMAGE_SUFFIX):
+                continue
+            st = _stat(path)
+            if st is None:
+                continue
+            meta_st = _stat(self._meta_path(path))
+            meta = self._read_meta(path) or {}
+            last_used = meta_st.st_mtime if meta_st else st.st_mtime
+            entries.append({'path': path,
+                            'repo': meta.get('repo'),
+                            'size': st.st_size,
+                            'last_used': last_used})
+        return entries
+
+    def evict(self, in_use_repos, keep=None):
+        """Evicts least recently used tarballs and records until under quota.
+
+        :param in_use_repos: repos of the containers on this host. The
+                             tarballs recorded for them are never evicted,
+                             whichever glance image they were pulled from.
+        :param keep: the path of a tarball that must not be evicted.
+        :returns: the paths of the evicted tarballs and records.
+        """
+        max_size = CONF.glance.images_cache_max_size * 1024 * 1024
+        if max_size <= 0:
+            return []
+
+        entries = self._list_entries()
+        total = sum(e['size'] for e in entries)
+        evicted = []
+        for entry in sorted(entries, key=lambda e: e['last_used']):
+            if total <= max_size:
+                break
+            if entry['path'] == keep or entry['repo'] in in_use_repos:
+                continue
+            LOG.info('Evicting %s from the image cache', entry['path'])
+            self.remove(entry['path'])
+            total -= entry['size']
+            evicted.append(entry['path'])
+
+        if total > max_size:
+            LOG.warning('Size of the image cache %(total)d bytes exceeds '
+                        'the quota of %(max)d bytes, but the remaining '
+                        'images are in use.',
+                        {'total': total, 'max': max_size})
+        return evicted
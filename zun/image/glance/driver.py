@@ -16,14 +16,17 @@ import os
 import six
 
 from oslo_log import log as logging
-from oslo_utils import fileutils
+from oslo_utils import excutils
 
+from zun.common import context as zun_context
 from zun.common import exception
 from zun.common.i18n import _
 from zun.common import utils as common_utils
 import zun.conf
 from zun.image import driver
+from zun.image.glance import cache
 from zun.image.glance import utils
+from zun import objects
 
 CONF = zun.conf.CONF
 
@@ -34,10 +37,10 @@ class GlanceDriver(driver.ContainerImageDriver):
 
     def __init__(self):
         super(GlanceDriver, self).__init__()
+        self._cache = cache.ImageCache()
 
-    def _search_image_on_host(self, context, repo):
+    def _search_image_on_host(self, context, repo, image_exists=None):
         LOG.debug('Searching for image %s locally', repo)
-        images_directory = CONF.glance.images_directory
         try:
             # TODO(mkrai): Change this to search image entry in zun db
             #              after the image endpoint is merged.
@@ -45,34 +48,40 @@ class GlanceDriver(driver.ContainerImageDriver):
         except exception.ImageNotFound:
             return None
         if image_meta:
-            out_path = os.path.join(images_directory,
-                                    image_meta.id + '.tar')
+            out_path = self._cache.get_path(image_meta.id)
             if os.path.isfile(out_path):
                 return {
                     'image': repo,
                     'path': out_path,
                     'checksum': image_meta.checksum}
-            else:
-                return None
+            # NOTE: Streamed images leave no tarball behind, look for the
+            # image they were loaded as instead.
+            loaded_image = self._cache.get_loaded(image_meta.id,
+                                                  image_meta.checksum)
+            if loaded_image and image_exists:
+                if image_exists(loaded_image):
+                    return {
+                        'image': repo,
+                        'path': None,
+                        'checksum': image_meta.checksum,
+                        'loaded_image': loaded_image}
+                # The image was removed from the container driver since.
+                self._cache.remove_loaded(image_meta.id)
+            return None
 
-    def pull_image(self, context, repo, tag, image_pull_policy):
+    def pull_image(self, context, repo, tag, image_pull_policy,
+                   load_image=None, image_exists=None):
         # TODO(shubhams): glance driver does not handle tags
         #              once metadata is stored in db then handle tags
         image_loaded = False
-        image = self._search_image_on_host(context, repo)
+        image = self._search_image_on_host(context, repo,
+                                           image_exists=image_exists)
         if image:
-            image_path = image['path']
-            image_checksum = image['checksum']
-            md5sum = hashlib.md5()
-            with open(image_path, 'rb') as fd:
-                while True:
-                    # read 10MB of data each time
-                    data = fd.read(10 * 1024 * 1024)
-                    if not data:
-                        break
-                    md5sum.update(data)
-            md5sum = md5sum.hexdigest()
-            if md5sum == image_checksum:
+            if image.get('loaded_image'):
+                LOG.debug('Image %s was already loaded', repo)
+                image_loaded = True
+                return image, image_loaded
+            if self._cache.verify(image['path'], repo, image['checksum']):
                 image_loaded = True
                 return image, image_loaded
 
@@ -89,28 +98,118 @@ class GlanceDriver(driver.ContainerImageDriver):
         LOG.debug('Pulling image from glance %s', repo)
         try:
             image_meta = utils.find_image(context, repo)
-            LOG.debug('Image %s was found in glance, downloading now...', repo)
-            image_chunks = utils.download_image_in_chunks(context,
-                                                          image_meta.id)
         except exception.ImageNotFound:
             LOG.error('Image %s was not found in glance', repo)
             raise
         except Exception as e:
             msg = _('Cannot download image from glance: {0}')
             raise exception.ZunException(msg.format(e))
+
+        # NOTE: An image can only be verified while it is streamed if glance
+        # has its checksum.
+        if (load_image and CONF.glance.stream_images and
+                image_meta.checksum):
+            try:
+                loaded_image = self._stream_image(context, image_meta, repo,
+                                                  load_image)
+            except exception.ImageChecksumMismatch:
+                # NOTE: The image in glance is corrupted, downloading it
+                # again would not help.
+                raise
+            except Exception as e:
+                LOG.warning('Failed to stream image %(repo)s into the '
+                            'container driver, downloading it instead: '
+                            '%(e)s', {'repo': repo, 'e': six.text_type(e)})
+            else:
+                image_loaded = True
+                self._evict_images(keep=None)
+                return {'image': repo, 'path': None,
+                        'loaded_image': loaded_image}, image_loaded
+
+        out_path = self._download_image(context, image_meta, repo)
+        self._evict_images(keep=out_path)
+        return {'image': repo, 'path': out_path}, image_loaded
+
+    def _hash_chunks(self, chunks, md5sum):
+        for chunk in chunks:
+            md5sum.update(chunk)
+            yield chunk
+
+    def _check_checksum(self, image_meta, md5sum):
+        if image_meta.checksum and md5sum.hexdigest() != image_meta.checksum:
+            raise exception.ImageChecksumMismatch(image=image_meta.id)
+
+    def _stream_image(self, context, image_meta, repo, load_image):
+        """Load an image into the container driver without caching it.
+
+        The image is spooled to a temporary file as it is hashed, and only
+        handed over to the container driver once its checksum is verified,
+        since the container driver may accept a corrupted image. The file
+        is removed as soon as the image is loaded.
+        """
+        LOG.debug('Image %s was found in glance, streaming now...',
+                  image_meta.id)
+        image_chunks = utils.download_image_in_chunks(context, image_meta.id)
+        md5sum = hashlib.md5()
+        with self._cache.open_temporary() as fd:
+            for chunk in self._hash_chunks(image_chunks, md5sum):
+                fd.write(chunk)
+            self._check_checksum(image_meta, md5sum)
+            fd.seek(0)
+            repo_tag = load_image(data=fd)
+        self._cache.record_loaded(image_meta.id, repo, image_meta.checksum,
+                                  repo_tag)
+        return repo_tag
+
+    def _download_image(self, context, image_meta, repo):
+        LOG.debug('Image %s was found in glance, downloading now...', repo)
+        try:
+            image_chunks = utils.download_image_in_chunks(context,
+                                                          image_meta.id)
+        except Exception as e:
+            msg = _('Cannot download image from glance: {0}')
+            raise exception.ZunException(msg.format(e))
+
+        md5sum = hashlib.md5()
+        out_path = self._cache.get_path(image_meta.id)
         try:
-            images_directory = CONF.glance.images_directory
-            fileutils.ensure_tree(images_directory)
-            out_path = os.path.join(images_directory, image_meta.id + '.tar')
-            with open(out_path, 'wb') as fd:
-                for chunk in image_chunks:
+            with self._cache.open_for_write(image_meta.id) as fd:
+                for chunk in self._hash_chunks(image_chunks, md5sum):
                     fd.write(chunk)
         except Exception as e:
             msg = _('Error occurred while writing image: {0}')
             raise exception.ZunException(msg.format(e))
+
+        try:
+            self._check_checksum(image_meta, md5sum)
+        except exception.ZunException:
+            with excutils.save_and_reraise_exception():
+                self._cache.remove(out_path)
+        # The content was verified while it was written, so there is no
+        # need to hash the tarball again on its next use.
+        self._cache.record(out_path, repo, md5sum.hexdigest())
         LOG.debug('Image %(repo)s was downloaded to path : %(path)s',
                   {'repo': repo, 'path': out_path})
-        return {'image': repo, 'path': out_path}, image_loaded
+        return out_path
+
+    def _evict_images(self, keep):
+        if CONF.glance.images_cache_max_size <= 0:
+            return
+        try:
+            ctx = zun_context.get_admin_context(all_tenants=True)
+            containers = objects.Container.list_by_host(ctx, CONF.host)
+            # NOTE: The driver of a container is only known once its image
+            # is pulled, so containers without one might use glance too.
+            in_use_repos = set(
+                common_utils.parse_image_name(c.image)[0]
+                for c in containers if c.image_driver in (None, 'glance'))
+            # NOTE: Image names are not unique, so the tarballs are matched
+            # on the repo recorded in their metadata rather than resolved
+            # through glance.
+            self._cache.evict(in_use_repos, keep=keep)
+        except Exception as e:
+            LOG.warning('Failed to evict images from the cache: %s',
+                        six.text_type(e))
 
     def search_image(self, context, repo, tag, exact_match):
         # TODO(mkrai): glance driver does not handle tags
@@ -13,16 +13,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import time
+
 from glanceclient.common import exceptions as glance_exceptions
 from oslo_utils import uuidutils
 
 from zun.common import clients
 from zun.common import exception
+import zun.conf
 
 from oslo_log import log as logging
 
+CONF = zun.conf.CONF
 LOG = logging.getLogger(__name__)
 
+# Recent exact lookups of images, keyed by (project_id, name or uuid) and
+# holding (expiration time, images).
+_LOOKUP_CACHE = {}
+_LOOKUP_CACHE_LOCK = threading.Lock()
+_LOOKUP_CACHE_PRUNE_SIZE = 256
+
 
 def create_glanceclient(context):
     """Creates glance client object.
@@ -47,7 +58,50 @@ def find_image(context, image_ident):
     return matches[0]
 
 
+def _project_id(context):
+    return getattr(context, 'project_id', None)
+
+
+def _get_cached_images(context, image_ident):
+    key = (_project_id(context), image_ident)
+    with _LOOKUP_CACHE_LOCK:
+        entry = _LOOKUP_CACHE.get(key)
+    if entry and entry[0] > time.time():
+        return list(entry[1])
+    return None
+
+
+def _cache_images(context, image_ident, images):
+    now = time.time()
+    key = (_project_id(context), image_ident)
+    with _LOOKUP_CACHE_LOCK:
+        if len(_LOOKUP_CACHE) >= _LOOKUP_CACHE_PRUNE_SIZE:
+            for k, (expires, _images) in list(_LOOKUP_CACHE.items()):
+                if expires <= now:
+                    del _LOOKUP_CACHE[k]
+        _LOOKUP_CACHE[key] = (now + CONF.glance.image_lookup_cache_ttl,
+                              list(images))
+
+
+def invalidate_image_cache(context=None):
+    """Drop the cached image lookups of a project, or of all projects."""
+    with _LOOKUP_CACHE_LOCK:
+        if context is None:
+            _LOOKUP_CACHE.clear()
+            return
+        project_id = _project_id(context)
+        for key in list(_LOOKUP_CACHE):
+            if key[0] == project_id:
+                del _LOOKUP_CACHE[key]
+
+
 def find_images(context, image_ident, exact_match):
+    use_cache = exact_match and CONF.glance.image_lookup_cache_ttl > 0
+    if use_cache:
+        images = _get_cached_images(context, image_ident)
+        if images is not None:
+            return images
+
     glance = create_glanceclient(context)
     if uuidutils.is_uuid_like(image_ident):
         images = []
@@ -60,18 +114,26 @@ def find_images(context, image_ident, exact_match):
             pass
     else:
         filters = {'container_format': 'docker'}
+        if exact_match:
+            # Let glance filter by name instead of listing every image.
+            filters['name'] = image_ident
         images = list(glance.images.list(filters=filters))
         if exact_match:
             images = [i for i in images if i.name == image_ident]
         else:
             images = [i for i in images if image_ident in i.name]
 
+    # NOTE: Do not cache misses, so that an image shows up as soon as it
+    # is uploaded by anyone.
+    if use_cache and images:
+        _cache_images(context, image_ident, images)
     return images
 
 
 def create_image(context, image_name):
     """Create an image."""
     glance = create_glanceclient(context)
+    invalidate_image_cache(context)
     return glance.images.create(name=image_name)
 
 
@@ -79,6 +141,7 @@ def update_image(context, img_id, disk_format,
                  container_format, tags):
     """Update an image (container format, disk format & tags)"""
     glance = create_glanceclient(context)
+    invalidate_image_cache(context)
     return glance.images.update(img_id, disk_format=disk_format,
                                 container_format=container_format, tags=tags)
 
@@ -87,7 +150,10 @@ def upload_image_data(context, img_id, data):
     """Upload an image."""
     LOG.debug('Upload image %s ', img_id)
     glance = create_glanceclient(context)
-    return glance.images.upload(img_id, data)
+    try:
+        return glance.images.upload(img_id, data)
+    finally:
+        invalidate_image_cache(context)
 
 
 def download_image_in_chunks(context, img_id):
@@ -101,4 +167,7 @@ def delete_image(context, img_id):
     """Delete an image."""
     LOG.debug('Delete image %s', img_id)
     glance = create_glanceclient(context)
-    return glance.images.delete(img_id)
+    try:
+        return glance.images.delete(img_id)
+    finally:
+        invalidate_image_cache(context)
@@ -31,7 +31,8 @@ class ComputeNode(base.ZunPersistentObject, base.ZunObject):
     # Version 1.7: Change get_by_hostname to get_by_name
     # Version 1.8: Add pci_device_pools to compute node
     # Version 1.9: Change PciDevicePoolList to ObjectField
-    VERSION = '1.9'
+    # Version 1.10: Add images to compute node
+    VERSION = '1.10'
 
     fields = {
         'uuid': fields.UUIDField(read_only=True, nullable=False),
@@ -52,6 +53,7 @@ class ComputeNode(base.ZunPersistentObject, base.ZunObject):
         'os': fields.StringField(nullable=True),
         'kernel_version': fields.StringField(nullable=True),
         'labels': fields.DictOfStringsField(nullable=True),
+        'images': fields.ListOfStringsField(nullable=True),
         # NOTE(pmurray): the pci_device_pools field maps to the
         # pci_stats field in the database
         'pci_device_pools': fields.ObjectField('PciDevicePoolList',
@@ -166,6 +168,8 @@ class ComputeNode(base.ZunPersistentObject, base.ZunObject):
         :param context: Security context.
         """
         updates = self.obj_get_changes()
+        if not updates:
+            return
         numa_obj = updates.pop('numa_topology', None)
         if numa_obj is not None:
             updates['numa_topology'] = numa_obj._to_dict()
@@ -19,7 +19,8 @@ from zun.objects import base
 @base.ZunObjectRegistry.register
 class Image(base.ZunPersistentObject, base.ZunObject):
     # Version 1.0: Initial version
-    VERSION = '1.0'
+    # Version 1.1: Add status field
+    VERSION = '1.1'
 
     fields = {
         'id': fields.IntegerField(),
@@ -30,6 +31,7 @@ class Image(base.ZunPersistentObject, base.ZunObject):
         'repo': fields.StringField(nullable=True),
         'tag': fields.StringField(nullable=True),
         'size': fields.StringField(nullable=True),
+        'status': fields.StringField(nullable=True),
     }
 
     @staticmethod
@@ -207,6 +207,35 @@ class PciDevice(base.ZunPersistentObject, base.ZunObject):
                 dbapi.update_pci_device(self.compute_node_uuid,
                                         self.address, updates)
 
+    @classmethod
+    def bulk_save(cls, context, devices):
+        """Save the changes of several devices with one call per host.
+
+        Removed devices are deleted, the changes of the other devices are
+        written, created if they do not exist yet.
+
+        :returns: the devices, with their changes reset.
+        """
+        hosts = {}
+        for dev in devices:
+            if dev.status == z_fields.PciDeviceStatus.DELETED:
+                continue
+            updates, deletes = hosts.setdefault(dev.compute_node_uuid,
+                                                ({}, []))
+            if dev.status == z_fields.PciDeviceStatus.REMOVED:
+                dev.status = z_fields.PciDeviceStatus.DELETED
+                deletes.append(dev.address)
+            else:
+                changes = dev.obj_get_changes()
+                changes['extra_info'] = jsonutils.dumps(dev.extra_info)
+                updates[dev.address] = changes
+
+        for node_id, (updates, deletes) in hosts.items():
+            dbapi.bulk_update_pci_devices(node_id, updates, deletes)
+        for dev in devices:
+            dev.obj_reset_changes()
+        return devices
+
     @staticmethod
     def _bulk_update_status(dev_list, status):
         for dev in dev_list:
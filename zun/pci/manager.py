@@ -71,6 +71,7 @@ class PciDevTracker(object):
                 context, node_id)
         else:
             self.pci_devs = []
+        self.pci_devs_by_addr = {dev.address: dev for dev in self.pci_devs}
         self._build_device_tree(self.pci_devs)
         self._initial_instance_usage()
 
@@ -87,11 +88,17 @@ class PciDevTracker(object):
                 self.stats.add_device(dev)
 
     def save(self):
-        for dev in self.pci_devs:
-            if dev.obj_what_changed():
-                dev.save()
-                if dev.status == fields.PciDeviceStatus.DELETED:
-                    self.pci_devs.remove(dev)
+        changed = [dev for dev in self.pci_devs if dev.obj_what_changed()]
+        if not changed:
+            return
+        objects.PciDevice.bulk_save(self._context, changed)
+        deleted = set(dev.address for dev in changed
+                      if dev.status == fields.PciDeviceStatus.DELETED)
+        if deleted:
+            self.pci_devs[:] = [dev for dev in self.pci_devs
+                                if dev.address not in deleted]
+            for address in deleted:
+                self.pci_devs_by_addr.pop(address, None)
 
     @property
     def pci_stats(self):
@@ -156,11 +163,13 @@ class PciDevTracker(object):
                     parents[dev.parent_addr].child_devices.append(dev)
 
     def _set_hvdevs(self, devices):
-        exist_addrs = set([dev.address for dev in self.pci_devs])
-        new_addrs = set([dev['address'] for dev in devices])
+        devices_by_addr = {dev['address']: dev for dev in devices}
+        exist_addrs = set(self.pci_devs_by_addr)
+        new_addrs = set(devices_by_addr)
+        removed_addrs = exist_addrs - new_addrs
 
         for existed in self.pci_devs:
-            if existed.address in exist_addrs - new_addrs:
+            if existed.address in removed_addrs:
                 try:
                     existed.remove()
                 except exception.PciDeviceInvalidStatus as e:
@@ -178,8 +187,7 @@ class PciDevTracker(object):
                     # device is hot removed.
                     self.stats.remove_device(existed)
             else:
-                new_value = next((dev for dev in devices if
-                                 dev['address'] == existed.address))
+                new_value = devices_by_addr[existed.address]
                 new_value['compute_node_id'] = self.node_id
                 if existed.status in (fields.PciDeviceStatus.CLAIMED,
                                       fields.PciDeviceStatus.ALLOCATED):
@@ -200,11 +208,12 @@ class PciDevTracker(object):
                 else:
                     existed.update_device(new_value)
 
-        for dev in [dev for dev in devices if
-                    dev['address'] in new_addrs - exist_addrs]:
+        for address in sorted(new_addrs - exist_addrs):
+            dev = devices_by_addr[address]
             dev['compute_node_uuid'] = self.node_id
             dev_obj = objects.PciDevice.create(self._context, dev)
             self.pci_devs.append(dev_obj)
+            self.pci_devs_by_addr[address] = dev_obj
             self.stats.add_device(dev_obj)
 
         self._build_device_tree(self.pci_devs)
@@ -243,17 +252,16 @@ class PciDevTracker(object):
         :param container: the container that this pci device
                           is allocated to
         """
-        for pci_dev in self.pci_devs:
-            # Find the matching pci device in the pci resource tracker.
-            # Once found, free it.
-            if (dev.id == pci_dev.id and
-                    dev.container_uuid == container.uuid):
-                self._remove_device_from_pci_mapping(
-                    container.uuid, pci_dev, self.allocations)
-                self._remove_device_from_pci_mapping(
-                    container.uuid, pci_dev, self.claims)
-                self._free_device(pci_dev)
-                break
+        # Find the matching pci device in the pci resource tracker.
+        # Once found, free it.
+        pci_dev = self.pci_devs_by_addr.get(dev.address)
+        if (pci_dev is not None and dev.id == pci_dev.id and
+                dev.container_uuid == container.uuid):
+            self._remove_device_from_pci_mapping(
+                container.uuid, pci_dev, self.allocations)
+            self._remove_device_from_pci_mapping(
+                container.uuid, pci_dev, self.claims)
+            self._free_device(pci_dev)
 
     def _remove_device_from_pci_mapping(self, container_uuid,
                                         pci_device, pci_mapping):
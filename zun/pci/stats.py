@@ -14,8 +14,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import copy
-
 from oslo_config import cfg
 from oslo_log import log as logging
 import six
@@ -63,23 +61,39 @@ class PciDeviceStats(object):
         self.pools = [pci_pool.to_dict()
                       for pci_pool in stats] if stats else []
         self.pools.sort(key=lambda item: len(item))
+        self._index_pools()
         self.dev_filter = dev_filter or whitelist.Whitelist(
             CONF.pci.passthrough_whitelist)
 
-    def _equal_properties(self, dev, entry, matching_keys):
-        return all(dev.get(prop) == entry.get(prop)
-                   for prop in matching_keys)
+    @staticmethod
+    def _pool_key(pool):
+        """Return the properties of a pool as a hashable key."""
+        return tuple(sorted((k, v) for k, v in pool.items()
+                            if k not in ('count', 'devices')))
 
-    def _find_pool(self, dev_pool):
-        """Return the first pool that matches dev."""
+    @staticmethod
+    def _spec_key(specs):
+        return tuple(tuple(sorted((k, tuple(v) if isinstance(v, list) else v)
+                                  for k, v in spec.items()))
+                     for spec in specs)
+
+    def _index_pools(self):
+        # The pools keyed by their properties, and the pools matching each
+        # request spec seen so far. The latter only changes when a pool is
+        # added or removed.
+        self._pools_by_key = {}
         for pool in self.pools:
-            pool_keys = pool.copy()
-            del pool_keys['count']
-            del pool_keys['devices']
-            equal = self._equal_properties(dev_pool, pool_keys,
-                                           dev_pool.keys())
-            if (len(pool_keys.keys()) == len(dev_pool.keys()) and equal):
-                return pool
+            self._pools_by_key.setdefault(self._pool_key(pool), pool)
+        self._spec_matches = {}
+
+    def _find_pool(self, dev_pool):
+        """Return the pool that matches dev."""
+        return self._pools_by_key.get(self._pool_key(dev_pool))
+
+    def _remove_pool(self, pool):
+        self.pools.remove(pool)
+        self._pools_by_key.pop(self._pool_key(pool), None)
+        self._spec_matches = {}
 
     def _create_pool_keys_from_dev(self, dev):
         """create a stats pool dict that this dev is supposed to be part of
@@ -108,22 +122,23 @@ class PciDeviceStats(object):
                 dev_pool['devices'] = []
                 self.pools.append(dev_pool)
                 self.pools.sort(key=lambda item: len(item))
+                self._pools_by_key[self._pool_key(dev_pool)] = dev_pool
+                self._spec_matches = {}
                 pool = dev_pool
             pool['count'] += 1
             pool['devices'].append(dev)
 
-    @staticmethod
-    def _decrease_pool_count(pool_list, pool, count=1):
+    def _decrease_pool_count(self, pool, count=1):
         """Decrement pool's size by count.
 
-        If pool becomes empty, remove pool from pool_list.
+        If pool becomes empty, remove pool from the pools.
         """
         if pool['count'] > count:
             pool['count'] -= count
             count = 0
         else:
             count -= pool['count']
-            pool_list.remove(pool)
+            self._remove_pool(pool)
         return count
 
     def remove_device(self, dev):
@@ -136,7 +151,12 @@ class PciDeviceStats(object):
                     compute_node_uuid=dev.compute_node_uuid,
                     address=dev.address)
             pool['devices'].remove(dev)
-            self._decrease_pool_count(self.pools, pool)
+            self._decrease_pool_count(pool)
+
+    def _is_free(self, dev):
+        dev_pool = self._create_pool_keys_from_dev(dev)
+        pool = self._find_pool(dev_pool) if dev_pool else None
+        return pool is not None and dev in pool['devices']
 
     def get_free_devs(self):
         free_devs = []
@@ -148,13 +168,10 @@ class PciDeviceStats(object):
         alloc_devices = []
         for request in pci_requests:
             count = request.count
-            spec = request.spec
             # For now, keep the same algorithm as during scheduling:
             # a spec may be able to match multiple pools.
-            pools = self._filter_pools_for_spec(self.pools, spec)
-            if numa_cells:
-                pools = self._filter_pools_for_numa_cells(pools, numa_cells)
-            pools = self._filter_non_requested_pfs(request, pools)
+            pools = [pool for key, pool in
+                     self._matching_pools(request, numa_cells)]
             # Failed to allocate the required number of devices
             # Return the devices already allocated back to their pools
             if sum([pool['count'] for pool in pools]) < count:
@@ -201,7 +218,7 @@ class PciDeviceStats(object):
                 parent = pci_dev.parent_device
                 # Make sure not to decrease PF pool count if this parent has
                 # been already removed from pools
-                if parent in self.get_free_devs():
+                if parent is not None and self._is_free(parent):
                     self.remove_device(parent)
             except exception.PciDeviceNotFound:
                 return
@@ -211,17 +228,6 @@ class PciDeviceStats(object):
         return [pool for pool in pools
                 if utils.pci_device_prop_match(pool, request_specs)]
 
-    @staticmethod
-    def _filter_pools_for_numa_cells(pools, numa_cells):
-        # Some systems don't report numa node info for pci devices, in
-        # that case None is reported in pci_device.numa_node, by adding None
-        # to numa_cells we allow assigning those devices to instances with
-        # numa topology
-        numa_cells = [None] + [cell.id for cell in numa_cells]
-        # filter out pools which numa_node is not included in numa_cells
-        return [pool for pool in pools if any(utils.pci_device_prop_match(
-                pool, [{'numa_node': cell}]) for cell in numa_cells)]
-
     def _filter_non_requested_pfs(self, request, matching_pools):
         # Remove SRIOV_PFs from pools, unless it has been explicitly requested
         # This is especially needed in cases where PFs and VFs has the same
@@ -236,24 +242,48 @@ class PciDeviceStats(object):
         return [pool for pool in pools
                 if not pool.get('dev_type') == fields.PciDeviceType.SRIOV_PF]
 
-    def _apply_request(self, pools, request, numa_cells=None):
+    def _matching_pools(self, request, numa_cells=None):
+        """Return the (key, pool) pairs of the pools matching a request."""
+        try:
+            spec_key = self._spec_key(request.spec)
+            matches = self._spec_matches.get(spec_key)
+        except TypeError:
+            # The spec has unhashable values, match it every time.
+            spec_key = matches = None
+        if matches is None:
+            pools = self._filter_pools_for_spec(self.pools, request.spec)
+            pools = self._filter_non_requested_pfs(request, pools)
+            matches = [(self._pool_key(pool), pool) for pool in pools]
+            if spec_key is not None:
+                self._spec_matches[spec_key] = matches
+        if numa_cells:
+            # Some systems don't report numa node info for pci devices, in
+            # that case None is reported in pci_device.numa_node, by adding
+            # None to numa_cells we allow assigning those devices to
+            # containers with numa topology
+            cells = [None] + [cell.id for cell in numa_cells]
+            matches = [(key, pool) for key, pool in matches
+                       if pool.get('numa_node') in cells]
+        return matches
+
+    def _free_counts(self):
+        return {key: pool['count']
+                for key, pool in self._pools_by_key.items()}
+
+    def _apply_request(self, counts, request, numa_cells=None):
         # NOTE(vladikr): This code maybe open to race conditions.
         # Two concurrent requests may succeed when called support_requests
         # because this method does not remove related devices from the pools
         count = request.count
-        matching_pools = self._filter_pools_for_spec(pools, request.spec)
-        if numa_cells:
-            matching_pools = self._filter_pools_for_numa_cells(matching_pools,
-                                                               numa_cells)
-        matching_pools = self._filter_non_requested_pfs(request,
-                                                        matching_pools)
-        if sum([pool['count'] for pool in matching_pools]) < count:
+        matches = self._matching_pools(request, numa_cells)
+        if sum(counts[key] for key, pool in matches) < count:
             return False
-        else:
-            for pool in matching_pools:
-                count = self._decrease_pool_count(pools, pool, count)
-                if not count:
-                    break
+        for key, pool in matches:
+            taken = min(counts[key], count)
+            counts[key] -= taken
+            count -= taken
+            if not count:
+                break
         return True
 
     def support_requests(self, requests, numa_cells=None):
@@ -267,9 +297,9 @@ class PciDeviceStats(object):
         """
         # note (yjiang5): this function has high possibility to fail,
         # so no exception should be triggered for performance reason.
-        pools = copy.deepcopy(self.pools)
-        return all([self._apply_request(pools, r, numa_cells)
-                   for r in requests])
+        counts = self._free_counts()
+        return all(self._apply_request(counts, r, numa_cells)
+                   for r in requests)
 
     def apply_requests(self, requests, numa_cells=None):
         """Apply PCI requests to the PCI stats.
@@ -279,9 +309,18 @@ class PciDeviceStats(object):
         If numa_cells is provided then only devices contained in
         those nodes are considered.
         """
-        if not all([self._apply_request(self.pools, r, numa_cells)
-                   for r in requests]):
+        counts = self._free_counts()
+        if not all(self._apply_request(counts, r, numa_cells)
+                   for r in requests):
             raise exception.PciDeviceRequestFailed(requests=requests)
+        for key, count in counts.items():
+            pool = self._pools_by_key[key]
+            if count == pool['count']:
+                continue
+            if count:
+                pool['count'] = count
+            else:
+                self._remove_pool(pool)
 
     def __iter__(self):
         # 'devices' shouldn't be part of stats
@@ -294,6 +333,7 @@ class PciDeviceStats(object):
     def clear(self):
         """Clear all the stats maintained."""
         self.pools = []
+        self._index_pools()
 
     def __eq__(self, other):
         return self.pools == other.pools
@@ -0,0 +1,130 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Pluggable Weighing support
+"""
+
+import abc
+
+import six
+
+from zun.scheduler import loadables
+
+
+def normalize(weight_list, minval=None, maxval=None):
+    """Normalize the values in a list between 0 and 1.0.
+
+    The normalization is made regarding the lower and upper values present in
+    weight_list. If the minval and/or maxval parameters are set, these values
+    will be used instead of the minimum and maximum from the list.
+
+    If all the values are equal, they are normalized to 0.
+    """
+
+    if not weight_list:
+        return ()
+
+    if maxval is None:
+        maxval = max(weight_list)
+
+    if minval is None:
+        minval = min(weight_list)
+
+    maxval = float(maxval)
+    minval = float(minval)
+
+    if minval == maxval:
+        return [0] * len(weight_list)
+
+    range_ = maxval - minval
+    return [(i - minval) / range_ for i in weight_list]
+
+
+class WeighedObject(object):
+    """Object with weight information."""
+    def __init__(self, obj, weight):
+        self.obj = obj
+        self.weight = weight
+
+    def __repr__(self):
+        return "<WeighedObject '%s': %s>" % (self.obj, self.weight)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class BaseWeigher(object):
+    """Base class for pluggable weighers.
+
+    The attributes maxval and minval can be specified to set up the maximum
+    and minimum values for the weighed objects. These values will then be
+    taken into account in the normalization step, instead of taking the values
+    from the calculated weights.
+    """
+
+    minval = None
+    maxval = None
+
+    def weight_multiplier(self):
+        """How weighted this weigher should be.
+
+        Override this method in a subclass, so that the returned value is
+        read from a configuration option to permit operators specify a
+        multiplier for the weigher.
+        """
+        return 1.0
+
+    @abc.abstractmethod
+    def _weigh_object(self, obj, container, extra_spec):
+        """Weigh a specific object."""
+
+    def weigh_objects(self, weighed_obj_list, container, extra_spec):
+        """Weigh multiple objects.
+
+        Override in a subclass if you need access to all objects in order
+        to calculate weights. Do not modify the weight of an object here,
+        just return a list of weights in the order of the objects.
+        """
+        return [self._weigh_object(obj, container, extra_spec)
+                for obj in weighed_obj_list]
+
+
+class BaseWeightHandler(loadables.BaseLoader):
+    object_class = WeighedObject
+
+    def get_weighed_objects(self, weighers, obj_list, container, extra_spec):
+        """Return a sorted (descending), normalized list of WeighedObjects.
+
+        The weights of all the objects are computed column by column: each
+        weigher scores every object at once, and its normalized scores are
+        added to the totals.
+        """
+        if not obj_list:
+            return []
+
+        totals = [0.0] * len(obj_list)
+        for weigher in weighers:
+            multiplier = weigher.weight_multiplier()
+            if not multiplier:
+                continue
+            weights = weigher.weigh_objects(obj_list, container, extra_spec)
+
+            # Normalize the weights
+            weights = normalize(weights,
+                                minval=weigher.minval,
+                                maxval=weigher.maxval)
+
+            totals = [total + multiplier * weight
+                      for total, weight in zip(totals, weights)]
+
+        weighed_objs = [self.object_class(obj, weight)
+                        for obj, weight in zip(obj_list, totals)]
+        return sorted(weighed_objs, key=lambda x: x.weight, reverse=True)
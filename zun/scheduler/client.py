@@ -13,25 +13,49 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_log import log as logging
 from stevedore import driver
+
+from zun.common import context
 import zun.conf
+from zun.scheduler import rpcapi as scheduler_rpcapi
 
 CONF = zun.conf.CONF
+LOG = logging.getLogger(__name__)
 
 
 class SchedulerClient(object):
     """Client library for placing calls to the scheduler."""
 
     def __init__(self):
-        scheduler_driver = CONF.scheduler.driver
-        self.driver = driver.DriverManager(
-            "zun.scheduler.driver",
-            scheduler_driver,
-            invoke_on_load=True).driver
+        self.driver = None
+        self.scheduler_rpcapi = None
+        if CONF.scheduler.use_scheduler_service:
+            self.scheduler_rpcapi = scheduler_rpcapi.API()
+        else:
+            scheduler_driver = CONF.scheduler.driver
+            self.driver = driver.DriverManager(
+                "zun.scheduler.driver",
+                scheduler_driver,
+                invoke_on_load=True).driver
 
     def select_destinations(self, context, containers, extra_spec):
+        if self.scheduler_rpcapi is not None:
+            return self.scheduler_rpcapi.select_destinations(
+                context, containers, extra_spec)
         return self.driver.select_destinations(context, containers, extra_spec)
 
     def update_resource(self, node):
+        changes = node.obj_get_changes()
         node.save()
+        if self.scheduler_rpcapi is not None and changes:
+            try:
+                self.scheduler_rpcapi.update_compute_node(
+                    context.get_admin_context(), node.hostname, changes)
+            except Exception as e:
+                # NOTE: The scheduler loads the node from the database on its
+                # next refresh.
+                LOG.warning('Failed to send the resources of %(host)s to '
+                            'the scheduler: %(error)s',
+                            {'host': node.hostname, 'error': e})
         # TODO(Shunli): Update the inventory here
@@ -50,3 +50,11 @@ class Scheduler(object):
             that satisfies the extra_spec and filter_properties.
         """
         return []
+
+    def update_compute_node(self, hostname, changes):
+        """Apply the changes of the resources pushed by a compute node.
+
+        :param hostname: the host of the compute node.
+        :param changes: a dict of the changed fields of the compute node.
+        """
+        pass
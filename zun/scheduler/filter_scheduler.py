@@ -13,17 +13,20 @@
 """
 The FilterScheduler is for scheduling container to a host according to
 your filters configured.
-You can customize this scheduler by specifying your own Host Filters.
+You can customize this scheduler by specifying your own Host Filters and
+Weighing Functions.
 """
 import random
 
+from oslo_utils import excutils
+
 from zun.common import exception
 from zun.common.i18n import _
 import zun.conf
-from zun import objects
 from zun.scheduler import driver
 from zun.scheduler import filters
-from zun.scheduler.host_state import HostState
+from zun.scheduler import host_manager
+from zun.scheduler import weights
 
 
 CONF = zun.conf.CONF
@@ -40,14 +43,14 @@ class FilterScheduler(driver.Scheduler):
         self.filter_cls_map = {cls.__name__: cls for cls in filter_classes}
         self.filter_obj_map = {}
         self.enabled_filters = self._choose_host_filters(self._load_filters())
-
-    def _schedule(self, context, container, extra_spec):
-        """Picks a host according to filters."""
-        services = self._get_services_by_host(context)
-        nodes = objects.ComputeNode.list(context)
-        hosts = services.keys()
-        nodes = [node for node in nodes if node.hostname in hosts]
-        host_states = self.get_all_host_state(nodes, services)
+        self.weight_handler = weights.HostWeightHandler()
+        weigher_classes = self.weight_handler.get_matching_classes(
+            CONF.scheduler.weight_classes)
+        self.weighers = [cls() for cls in weigher_classes]
+        self.host_manager = host_manager.HostManager()
+
+    def _schedule(self, context, container, extra_spec, host_states):
+        """Picks a host according to filters and weighers."""
         hosts = self.filter_handler.get_filtered_objects(self.enabled_filters,
                                                          host_states,
                                                          container,
@@ -56,16 +59,41 @@ class FilterScheduler(driver.Scheduler):
             msg = _("Is the appropriate service running?")
             raise exception.NoValidHost(reason=msg)
 
-        return random.choice(hosts)
+        weighed_hosts = self.weight_handler.get_weighed_objects(
+            self.weighers, hosts, container, extra_spec)
+        # Pick at random among the best hosts, including the ones weighed as
+        # high as the last of them, so that equally good hosts share the load.
+        host_subset_size = min(CONF.scheduler.host_subset_size,
+                               len(weighed_hosts))
+        min_weight = weighed_hosts[host_subset_size - 1].weight
+        host = random.choice([weighed_host.obj
+                              for weighed_host in weighed_hosts
+                              if weighed_host.weight >= min_weight])
+        host.consume_from_request(container, extra_spec)
+        return host
 
     def select_destinations(self, context, containers, extra_spec):
-        """Selects destinations by filters."""
+        """Selects destinations by filters.
+
+        The host states are loaded once for all the containers. The
+        resources requested by each container are consumed from the host
+        it is placed on before the next container is placed.
+        """
+        host_states = self.host_manager.get_all_host_states(context)
         dests = []
-        for container in containers:
-            host = self._schedule(context, container, extra_spec)
-            host_state = dict(host=host.hostname, nodename=None,
-                              limits=host.limits)
-            dests.append(host_state)
+        try:
+            for container in containers:
+                host = self._schedule(context, container, extra_spec,
+                                      host_states)
+                host_state = dict(host=host.hostname, nodename=None,
+                                  limits=dict(host.limits))
+                dests.append(host_state)
+        except exception.NoValidHost:
+            with excutils.save_and_reraise_exception():
+                if dests:
+                    # The containers placed so far will not be created,
+                    # forget what they consumed.
+                    self.host_manager.reset()
 
         if len(dests) < 1:
             reason = _('There are not enough hosts available.')
@@ -73,6 +101,9 @@ class FilterScheduler(driver.Scheduler):
 
         return dests
 
+    def update_compute_node(self, hostname, changes):
+        self.host_manager.update_compute_node(hostname, changes)
+
     def _choose_host_filters(self, filter_cls_names):
         """Choose good filters
 
@@ -101,19 +132,3 @@ class FilterScheduler(driver.Scheduler):
 
     def _load_filters(self):
         return CONF.scheduler.enabled_filters
-
-    def _get_services_by_host(self, context):
-        """Get a dict of services indexed by hostname"""
-        return {service.host: service
-                for service in objects.ZunService.list_by_binary(
-                    context,
-                    'zun-compute')}
-
-    def get_all_host_state(self, nodes, services):
-        host_states = []
-        for node in nodes:
-            host_state = HostState(node.hostname)
-            host_state.update(compute_node=node,
-                              service=services.get(node.hostname))
-            host_states.append(host_state)
-        return host_states
@@ -0,0 +1,136 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Manage the states of the compute hosts for the scheduler.
+"""
+
+import datetime
+import time
+
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+from zun.common import utils
+import zun.conf
+from zun import objects
+from zun.scheduler.host_state import HostState
+
+CONF = zun.conf.CONF
+LOG = logging.getLogger(__name__)
+
+
+def _updated_at(node):
+    for field in ('updated_at', 'created_at'):
+        if node.obj_attr_is_set(field) and getattr(node, field):
+            return timeutils.normalize_time(getattr(node, field))
+
+
+def _node_fields(node):
+    fields = node.obj_to_primitive()['zun_object.data']
+    for field in ('created_at', 'updated_at'):
+        fields.pop(field, None)
+    return fields
+
+
+class HostManager(object):
+    """Keeps the states of the compute hosts between scheduling requests.
+
+    The states are reused for ``[scheduler]host_state_refresh_interval``
+    seconds. After that, only the compute nodes updated since the previous
+    refresh, minus ``[scheduler]host_state_refresh_margin`` seconds, are
+    loaded. Every ``[scheduler]host_state_max_age`` seconds all of them are
+    loaded again.
+    """
+
+    def __init__(self):
+        self._host_states = {}
+        self._services = {}
+        self._last_refresh = None
+        self._last_full_refresh = None
+        # The fields of the compute nodes as last loaded, by hostname.
+        self._node_fields = {}
+        # The nodes updated since this time are loaded on next refresh.
+        self._updated_since = None
+
+    @utils.synchronized('scheduler-host-manager')
+    def reset(self):
+        """Load the states of all hosts again on next use."""
+        self._last_full_refresh = None
+
+    @utils.synchronized('scheduler-host-manager')
+    def update_compute_node(self, hostname, changes):
+        """Apply the changes of the resources pushed by a compute node."""
+        host_state = self._host_states.get(hostname)
+        if host_state is None:
+            # NOTE: New hosts are added by the next full refresh, which also
+            # loads their service.
+            return
+        host_state.update_from_changes(changes)
+
+    @utils.synchronized('scheduler-host-manager')
+    def get_all_host_states(self, context):
+        """Return the states of the hosts running a compute service."""
+        now = time.time()
+        if (self._last_full_refresh is None or
+                now - self._last_full_refresh >=
+                CONF.scheduler.host_state_max_age):
+            self._refresh(context, full=True)
+            self._last_full_refresh = self._last_refresh = now
+        elif (now - self._last_refresh >=
+                CONF.scheduler.host_state_refresh_interval):
+            self._refresh(context, full=self._updated_since is None)
+            self._last_refresh = now
+        return [state for hostname, state in self._host_states.items()
+                if hostname in self._services]
+
+    def _refresh(self, context, full):
+        services = {service.host: service
+                    for service in objects.ZunService.list_by_binary(
+                        context, 'zun-compute')}
+        # NOTE: The watermark is taken from the clock of the scheduler, before
+        # listing the nodes, so that the updates committed meanwhile are not
+        # missed. The margin covers the clock skew of the compute hosts.
+        started = timeutils.utcnow() - datetime.timedelta(
+            seconds=CONF.scheduler.host_state_refresh_margin)
+        if full:
+            host_states = {}
+            node_fields = {}
+            nodes = objects.ComputeNode.list(context)
+        else:
+            host_states = self._host_states
+            node_fields = self._node_fields
+            nodes = objects.ComputeNode.list(
+                context, filters={'updated_since': self._updated_since})
+
+        for node in nodes:
+            fields = _node_fields(node)
+            host_state = host_states.get(node.hostname)
+            if host_state is None:
+                host_state = HostState(node.hostname)
+                host_states[node.hostname] = host_state
+            elif fields == node_fields.get(node.hostname):
+                # NOTE: The node has not changed since it was last loaded.
+                # Keep the resources consumed locally since then.
+                continue
+            host_state.update(compute_node=node)
+            host_state.updated = _updated_at(node)
+            node_fields[node.hostname] = fields
+
+        for hostname, host_state in host_states.items():
+            host_state.service = services.get(hostname)
+        LOG.debug('Refreshed %(count)d of %(total)d host states',
+                  {'count': len(nodes), 'total': len(host_states)})
+        self._host_states = host_states
+        self._node_fields = node_fields
+        self._services = services
+        self._updated_since = started
@@ -12,10 +12,15 @@
 
 from oslo_log.log import logging
 
+from zun.common import exception
 from zun.common import utils
 from zun.pci import stats as pci_stats
 
 LOG = logging.getLogger(__name__)
+# Fields of the compute node copied as they are into the host state.
+COMPUTE_NODE_FIELDS = ('mem_total', 'mem_free', 'mem_used', 'cpus',
+                       'cpu_used', 'total_containers', 'numa_topology',
+                       'labels')
 
 
 class HostState(object):
@@ -34,9 +39,15 @@ class HostState(object):
         self.mem_used = 0
         self.cpus = 0
         self.cpu_used = 0
+        self.total_containers = 0
         self.numa_topology = None
         self.labels = None
         self.pci_stats = None
+        # The references ('repo:tag') of the images reported by the host.
+        self.images = set()
+
+        # The time the compute node was last updated at.
+        self.updated = None
 
         # Resource oversubscription values for the compute host:
         self.limits = {}
@@ -55,6 +66,47 @@ class HostState(object):
 
         return _locked_update(self, compute_node, service)
 
+    def has_image(self, image):
+        """Return True if the host reported having the image."""
+        return self._image_ref(image) in self.images
+
+    @staticmethod
+    def _image_ref(image):
+        return '%s:%s' % utils.parse_image_name(image)
+
+    def consume_from_request(self, container, extra_spec):
+        """Subtract the resources requested by a container placed here."""
+        if container.memory:
+            memory = int(container.memory[:-1])
+            self.mem_used += memory
+            self.mem_free -= memory
+        if container.cpu:
+            self.cpu_used += container.cpu
+        self.total_containers += 1
+        if container.image:
+            # The host pulls the image to create the container.
+            self.images.add(self._image_ref(container.image))
+        pci_requests = extra_spec.get('pci_requests')
+        if pci_requests and pci_requests.requests and self.pci_stats:
+            try:
+                self.pci_stats.apply_requests(pci_requests.requests)
+            except exception.PciDeviceRequestFailed:
+                # NOTE: The host was picked without checking its PCI devices,
+                # the compute node will sort it out.
+                LOG.debug('%(host)s does not have the PCI devices of '
+                          '%(requests)s', {'host': self.hostname,
+                                           'requests': pci_requests})
+
+    def update_from_changes(self, changes):
+        """Update the host from the changed fields of its compute node."""
+        for field, value in changes.items():
+            if field in COMPUTE_NODE_FIELDS:
+                setattr(self, field, value)
+            elif field == 'images':
+                self.images = set(value or [])
+            elif field == 'pci_device_pools':
+                self.pci_stats = pci_stats.PciDeviceStats(stats=value)
+
     def _update_from_compute_node(self, compute_node):
         """Update information about a host from a Compute object"""
         self.mem_total = compute_node.mem_total
@@ -62,7 +114,9 @@ class HostState(object):
         self.mem_used = compute_node.mem_used
         self.cpus = compute_node.cpus
         self.cpu_used = compute_node.cpu_used
+        self.total_containers = compute_node.total_containers
         self.numa_topology = compute_node.numa_topology
         self.labels = compute_node.labels
+        self.images = set(compute_node.images or [])
         self.pci_stats = pci_stats.PciDeviceStats(
             stats=compute_node.pci_device_pools)
@@ -0,0 +1,42 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Server side of the scheduler RPC API."""
+
+from oslo_service import periodic_task
+from stevedore import driver
+
+import zun.conf
+
+CONF = zun.conf.CONF
+
+
+class Manager(periodic_task.PeriodicTasks):
+    """Places the containers with the scheduler driver of the service.
+
+    A single driver serves all the requests, so that they share the states
+    of the hosts kept by the driver.
+    """
+
+    def __init__(self):
+        super(Manager, self).__init__(CONF)
+        self.driver = driver.DriverManager(
+            "zun.scheduler.driver",
+            CONF.scheduler.driver,
+            invoke_on_load=True).driver
+
+    def select_destinations(self, context, containers, extra_spec):
+        return self.driver.select_destinations(context, containers,
+                                               extra_spec)
+
+    def update_compute_node(self, context, hostname, changes):
+        self.driver.update_compute_node(hostname, changes)
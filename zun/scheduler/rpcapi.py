@@ -0,0 +1,45 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Client side of the scheduler RPC API."""
+
+from zun.common import profiler
+from zun.common import rpc_service
+import zun.conf
+
+CONF = zun.conf.CONF
+
+
+@profiler.trace_cls("rpc")
+class API(rpc_service.API):
+    """Client side of the scheduler rpc API.
+
+    API version history:
+
+        * 1.0 - Initial version.
+    """
+
+    def __init__(self, transport=None, context=None, topic=None):
+        if topic is None:
+            topic = CONF.scheduler.topic
+
+        super(API, self).__init__(transport, context, topic=topic)
+
+    def select_destinations(self, context, containers, extra_spec):
+        return self._call(context, None, 'select_destinations',
+                          containers=containers, extra_spec=extra_spec)
+
+    def update_compute_node(self, context, hostname, changes):
+        # NOTE: Every scheduler keeps the states of the hosts.
+        cctxt = self._client.prepare(fanout=True)
+        cctxt.cast(context, 'update_compute_node', hostname=hostname,
+                   changes=changes)
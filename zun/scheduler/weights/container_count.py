@@ -0,0 +1,36 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Container Count Weigher.  Weigh hosts by the number of their containers.
+
+The default is to prefer the hosts running fewer containers.  If you prefer
+stacking, you can set the 'container_weight_multiplier' option to a positive
+number and the weighing has the opposite effect of the default.
+"""
+
+import zun.conf
+from zun.scheduler import weights
+
+CONF = zun.conf.CONF
+
+
+class ContainerCountWeigher(weights.BaseHostWeigher):
+    minval = 0
+
+    def weight_multiplier(self):
+        """Override the weight multiplier."""
+        return CONF.scheduler.container_weight_multiplier
+
+    def _weigh_object(self, host_state, container, extra_spec):
+        """Higher weights win.  The multiplier is negative by default."""
+        return host_state.total_containers
@@ -0,0 +1,39 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Image Weigher.  Weigh hosts by the presence of the image of the container.
+
+The hosts which already have the image win, as the container does not have
+to wait for the image to be pulled there.  The images of a host are the ones
+reported by its compute node, see the 'max_reported_images' option of the
+compute group.
+"""
+
+import zun.conf
+from zun.scheduler import weights
+
+CONF = zun.conf.CONF
+
+
+class ImageWeigher(weights.BaseHostWeigher):
+    minval = 0
+    maxval = 1
+
+    def weight_multiplier(self):
+        """Override the weight multiplier."""
+        return CONF.scheduler.image_weight_multiplier
+
+    def _weigh_object(self, host_state, container, extra_spec):
+        if container.image and host_state.has_image(container.image):
+            return 1
+        return 0
@@ -0,0 +1,51 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Label Weigher.  Weigh hosts by the labels the container asks for.
+
+The 'label:<key>=<value>' scheduler hints of a container are matched against
+the labels of the hosts, and the hosts having more of them win.  Unlike the
+LabelFilter, hosts missing some of the labels are not rejected.
+"""
+
+import zun.conf
+from zun.scheduler import weights
+
+CONF = zun.conf.CONF
+
+
+class LabelWeigher(weights.BaseHostWeigher):
+    minval = 0
+
+    def weight_multiplier(self):
+        """Override the weight multiplier."""
+        return CONF.scheduler.label_weight_multiplier
+
+    def weigh_objects(self, weighed_obj_list, container, extra_spec):
+        labels = {}
+        for key, value in (extra_spec.get('hints') or {}).items():
+            if key.startswith('label:'):
+                labels[key[6:]] = value
+        if not labels:
+            return [0] * len(weighed_obj_list)
+
+        return [self._weigh_labels(host_state, labels)
+                for host_state in weighed_obj_list]
+
+    def _weigh_labels(self, host_state, labels):
+        host_labels = host_state.labels or {}
+        return sum(1 for key, value in labels.items()
+                   if host_labels.get(key) == value)
+
+    def _weigh_object(self, host_state, container, extra_spec):
+        return self.weigh_objects([host_state], container, extra_spec)[0]
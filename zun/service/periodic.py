@@ -15,8 +15,10 @@ import functools
 
 from oslo_log import log
 from oslo_service import periodic_task
+from oslo_utils import timeutils
 
 from zun.common import context
+from zun.common import exception
 from zun.container import driver
 from zun import objects
 
@@ -37,28 +39,65 @@ class ContainerStateSyncPeriodicJob(periodic_task.PeriodicTasks):
         self.host = conf.host
         self.driver = driver.load_container_driver(
             conf.container_driver)
+        self.sync_interval = conf.compute.container_state_sync_interval
+        self.event_watcher = self.driver.get_event_watcher()
+        self._last_full_sync = None
         super(ContainerStateSyncPeriodicJob, self).__init__(conf)
 
+    def _full_sync_needed(self):
+        watcher = self.event_watcher
+        if watcher is None or not watcher.connected:
+            return True
+        if self._last_full_sync is None:
+            return True
+        # NOTE: Events might have been missed before the watcher
+        # (re)connected, so sync again once after every reconnection.
+        if watcher.connected_since > self._last_full_sync:
+            return True
+        return timeutils.is_older_than(self._last_full_sync,
+                                       self.sync_interval)
+
     @periodic_task.periodic_task(run_immediately=True)
     @set_context
     def sync_container_state(self, ctx):
+        if not self._full_sync_needed():
+            return
+
         LOG.debug('Start syncing container states.')
+        self._last_full_sync = timeutils.utcnow()
 
-        containers = objects.Container.list(ctx)
+        containers = objects.Container.list_by_host(ctx, self.host)
         self.driver.update_containers_states(ctx, containers)
+        self._sync_capsule_host(ctx, containers)
+        LOG.debug('Complete syncing container states.')
 
-        capsules = objects.Capsule.list(ctx)
+    def _sync_capsule_host(self, ctx, containers):
+        # NOTE: The host of a capsule is the host of its containers. The
+        # compute host sets it when it creates the capsule, so only the
+        # capsules of this host whose containers are not here can be out of
+        # sync.
+        host_containers = set(c.uuid for c in containers)
+        capsules = objects.Capsule.list(ctx, filters={'host': self.host})
         for capsule in capsules:
-            container = objects.Container.get_by_uuid(
-                ctx, capsule.containers_uuids[1])
-            if capsule.host != container.host:
+            if len(capsule.containers_uuids or []) < 2:
+                continue
+            uuid = capsule.containers_uuids[1]
+            if uuid in host_containers:
+                continue
+            try:
+                container = objects.Container.get_by_uuid(ctx, uuid)
+            except exception.ContainerNotFound:
+                continue
+            # The containers of a capsule being created have no host yet.
+            if container.host and capsule.host != container.host:
                 capsule.host = container.host
                 capsule.save(ctx)
-        LOG.debug('Complete syncing container states.')
 
 
 def setup(conf, tg):
     pt = ContainerStateSyncPeriodicJob(conf)
+    if pt.event_watcher is not None:
+        tg.add_thread(pt.event_watcher.run)
     tg.add_dynamic_timer(
         pt.run_periodic_tasks,
         periodic_interval_max=conf.periodic_interval_max,
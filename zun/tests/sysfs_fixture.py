@@ -0,0 +1,54 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import shutil
+
+import fixtures
+
+
+class SysfsPciFixture(fixtures.Fixture):
+    """A fake /sys/bus/pci/devices tree used by the host capabilities."""
+
+    def _setUp(self):
+        root = self.useFixture(fixtures.TempDir()).path
+        self.path = os.path.join(root, 'devices')
+        os.mkdir(self.path)
+        self.useFixture(fixtures.MonkeyPatch(
+            'zun.container.os_capability.host_capability.SYSFS_PCI_DEVICES',
+            self.path))
+        self.useFixture(fixtures.MonkeyPatch(
+            'zun.container.os_capability.host_capability._PCI_DEVICES_CACHE',
+            {}))
+
+    def add_device(self, address, vendor_id, product_id, numa_node=-1,
+                   physfn=None):
+        """Add a device, which is a VF of ``physfn`` if it is given."""
+        dev_path = os.path.join(self.path, address)
+        os.mkdir(dev_path)
+        for name, value in (('vendor', '0x' + vendor_id),
+                            ('device', '0x' + product_id),
+                            ('class', '0x020000'),
+                            ('numa_node', str(numa_node))):
+            with open(os.path.join(dev_path, name), 'w') as fd:
+                fd.write(value + '\n')
+        if physfn is not None:
+            pf_path = os.path.join(self.path, physfn)
+            vf_num = len([e for e in os.listdir(pf_path)
+                          if e.startswith('virtfn')])
+            os.symlink(os.path.join('..', physfn),
+                       os.path.join(dev_path, 'physfn'))
+            os.symlink(os.path.join('..', address),
+                       os.path.join(pf_path, 'virtfn%d' % vf_num))
+
+    def remove_device(self, address):
+        shutil.rmtree(os.path.join(self.path, address))
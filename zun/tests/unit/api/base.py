@@ -27,7 +27,7 @@ from zun.tests.unit.db import base
 
 
 PATH_PREFIX = '/v1'
-CURRENT_VERSION = "container 1.12"
+CURRENT_VERSION = "container 1.13"
 
 
 class FunctionalTest(base.DbTestCase):
@@ -0,0 +1,107 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import mock
+from mock import patch
+from webtest.app import AppError
+
+from zun import objects
+from zun.tests.unit.api import base as api_base
+from zun.tests.unit.db import utils
+
+
+class TestContainerActionController(api_base.FunctionalTest):
+
+    def setUp(self):
+        super(TestContainerActionController, self).setUp()
+        test_container = utils.get_test_container()
+        self.container = objects.Container(self.context, **test_container)
+        start_time = datetime.datetime(2018, 1, 1, 0, 0, 0)
+        self.action = objects.ContainerAction(
+            self.context, **utils.get_test_action(
+                container_uuid=self.container.uuid, action='create',
+                start_time=start_time))
+        self.event = objects.ContainerActionEvent(
+            self.context, **utils.get_test_action_event(
+                event='compute_image_pull', action_id=self.action.id,
+                start_time=start_time,
+                finish_time=datetime.datetime(2018, 1, 1, 0, 0, 2)))
+
+    @patch('zun.common.policy.enforce')
+    @patch('zun.objects.ContainerAction.get_by_container_uuid')
+    @patch('zun.objects.Container.get_by_uuid')
+    def test_get_all(self, mock_get_container, mock_get_actions,
+                     mock_policy):
+        mock_policy.return_value = True
+        mock_get_container.return_value = self.container
+        mock_get_actions.return_value = [self.action]
+
+        response = self.get('/v1/containers/%s/container_actions' %
+                            self.container.uuid)
+
+        self.assertEqual(200, response.status_int)
+        mock_get_actions.assert_called_once_with(mock.ANY,
+                                                 self.container.uuid)
+        actions = response.json['container_actions']
+        self.assertEqual(1, len(actions))
+        self.assertEqual('create', actions[0]['action'])
+        self.assertEqual(self.action.request_id, actions[0]['request_id'])
+
+    @patch('zun.common.policy.enforce')
+    @patch('zun.objects.ContainerActionEvent.get_by_action')
+    @patch('zun.objects.ContainerAction.get_by_request_id')
+    @patch('zun.objects.Container.get_by_uuid')
+    def test_get_one(self, mock_get_container, mock_get_action,
+                     mock_get_events, mock_policy):
+        mock_policy.return_value = False
+        mock_get_container.return_value = self.container
+        mock_get_action.return_value = self.action
+        mock_get_events.return_value = [self.event]
+
+        response = self.get('/v1/containers/%s/container_actions/%s' %
+                            (self.container.uuid, self.action.request_id))
+
+        self.assertEqual(200, response.status_int)
+        mock_get_action.assert_called_once_with(
+            mock.ANY, self.container.uuid, self.action.request_id)
+        mock_get_events.assert_called_once_with(mock.ANY, self.action.id)
+        self.assertEqual('create', response.json['action'])
+        events = response.json['events']
+        self.assertEqual(1, len(events))
+        self.assertEqual('compute_image_pull', events[0]['event'])
+        self.assertEqual(2, events[0]['duration'])
+        self.assertEqual('Error', events[0]['result'])
+        # NOTE: Only admins are allowed to see the traceback of events.
+        self.assertNotIn('traceback', events[0])
+
+    @patch('zun.common.policy.enforce')
+    @patch('zun.objects.ContainerAction.get_by_request_id')
+    @patch('zun.objects.Container.get_by_uuid')
+    def test_get_one_not_found(self, mock_get_container, mock_get_action,
+                               mock_policy):
+        mock_policy.return_value = True
+        mock_get_container.return_value = self.container
+        mock_get_action.return_value = None
+
+        self.assertRaises(AppError, self.get,
+                          '/v1/containers/%s/container_actions/%s' %
+                          (self.container.uuid, 'fake-request'))
+
+    @patch('zun.objects.Container.get_by_uuid')
+    def test_get_all_old_version(self, mock_get_container):
+        mock_get_container.return_value = self.container
+        self.assertRaises(AppError, self.get,
+                          '/v1/containers/%s/container_actions' %
+                          self.container.uuid,
+                          headers={'OpenStack-API-Version': 'container 1.12'})
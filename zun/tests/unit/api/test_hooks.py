@@ -0,0 +1,31 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from zun.api import hooks
+from zun.tests import base
+
+
+class TestRPCHook(base.TestCase):
+
+    @mock.patch('zun.compute.api.API')
+    def test_compute_api_is_shared(self, mock_api):
+        hook = hooks.RPCHook()
+        states = [mock.Mock(), mock.Mock()]
+        for state in states:
+            hook.before(state)
+        mock_api.assert_called_once_with()
+        self.assertIs(mock_api.return_value,
+                      states[0].request.compute_api)
+        self.assertIs(mock_api.return_value,
+                      states[1].request.compute_api)
@@ -0,0 +1,70 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+from eventlet import event
+import mock
+
+from zun.common import exception
+from zun.common import singleflight
+from zun.tests import base
+
+
+class TestSingleFlight(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestSingleFlight, self).setUp()
+        self.flight = singleflight.SingleFlight()
+        self.release = event.Event()
+
+    def _run_concurrently(self, func, count=3):
+        def wrapped():
+            self.release.wait()
+            return func()
+
+        threads = [eventlet.spawn(self.flight.do, 'key', wrapped)]
+        # Let the first call take the lead before the others join.
+        eventlet.sleep(0)
+        threads += [eventlet.spawn(self.flight.do, 'key', wrapped)
+                    for i in range(count - 1)]
+        eventlet.sleep(0)
+        self.assertTrue(self.flight.in_flight('key'))
+        self.release.send()
+        return threads
+
+    def test_do_shares_result(self):
+        func = mock.Mock(return_value='result')
+        threads = self._run_concurrently(func)
+        self.assertEqual(['result'] * 3, [t.wait() for t in threads])
+        func.assert_called_once_with()
+        self.assertFalse(self.flight.in_flight('key'))
+
+    def test_do_shares_exception(self):
+        func = mock.Mock(side_effect=exception.ImageNotFound('not found'))
+        threads = self._run_concurrently(func)
+        for t in threads:
+            self.assertRaises(exception.ImageNotFound, t.wait)
+        func.assert_called_once_with()
+        self.assertFalse(self.flight.in_flight('key'))
+
+    def test_do_sequential_calls_are_not_shared(self):
+        func = mock.Mock(return_value='result')
+        self.flight.do('key', func)
+        self.flight.do('key', func)
+        self.assertEqual(2, func.call_count)
+
+    def test_do_leader_killed(self):
+        func = mock.Mock(return_value='result')
+        threads = self._run_concurrently(func, count=2)
+        threads[0].kill()
+        self.assertRaises(eventlet.greenlet.GreenletExit, threads[1].wait)
+        self.assertFalse(self.flight.in_flight('key'))
@@ -174,3 +174,55 @@ class TestUtils(base.TestCase):
                 mock.ANY,
                 test_image['uuid'])
             self.assertEqual(test_image['uuid'], image.uuid)
+
+    @patch('zun.objects.ContainerActionEvent.event_finish')
+    @patch('zun.objects.ContainerActionEvent.event_start')
+    def test_event_reporter(self, mock_start, mock_finish):
+        with utils.EventReporter(self.context, 'fake_event', 'fake-uuid'):
+            pass
+        mock_start.assert_called_once_with(
+            self.context, 'fake-uuid', 'fake_event', want_result=False)
+        mock_finish.assert_called_once_with(
+            self.context, 'fake-uuid', 'fake_event', exc_val=None,
+            exc_tb=None, want_result=False)
+
+    @patch('zun.objects.ContainerActionEvent.event_finish')
+    @patch('zun.objects.ContainerActionEvent.event_start')
+    def test_event_reporter_records_error(self, mock_start, mock_finish):
+        error = ValueError('boom')
+
+        def fail():
+            with utils.EventReporter(self.context, 'fake_event', 'fake-uuid'):
+                raise error
+
+        self.assertRaises(ValueError, fail)
+        mock_finish.assert_called_once_with(
+            self.context, 'fake-uuid', 'fake_event', exc_val=error,
+            exc_tb=mock.ANY, want_result=False)
+
+    @patch.object(utils, '_container_actions_unsupported_logged', False)
+    @patch.object(utils.LOG, 'debug')
+    @patch('zun.objects.ContainerActionEvent.event_start')
+    def test_event_reporter_etcd(self, mock_start, mock_debug):
+        self.config(db_type='etcd')
+        for i in range(2):
+            with utils.EventReporter(self.context, 'fake_event',
+                                     'fake-uuid'):
+                pass
+        self.assertFalse(mock_start.called)
+        self.assertEqual(1, mock_debug.call_count)
+
+    @patch('zun.objects.ContainerActionEvent.event_finish')
+    @patch('zun.objects.ContainerActionEvent.event_start')
+    def test_event_reporter_ignores_record_failure(self, mock_start,
+                                                   mock_finish):
+        mock_start.side_effect = exception.ContainerActionNotFound(
+            request_id='fake-request', container_uuid='fake-uuid')
+        ran = []
+        with utils.EventReporter(self.context, 'fake_event', 'fake-uuid',
+                                 None):
+            ran.append(True)
+        self.assertEqual([True], ran)
+        mock_start.assert_called_once_with(
+            self.context, 'fake-uuid', 'fake_event', want_result=False)
+        self.assertFalse(mock_finish.called)
@@ -12,8 +12,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
 import mock
 
+from oslo_utils import uuidutils
 from six import StringIO
 
 from zun.common import consts
@@ -181,10 +183,88 @@ class TestManager(base.TestCase):
         self.compute_manager._do_container_create(self.context, container,
                                                   networks, volumes)
         mock_save.assert_called_with(self.context)
-        mock_pull.assert_any_call(self.context, container.image, 'latest',
-                                  'always', 'glance')
-        mock_create.assert_called_once_with(self.context, container, image,
-                                            networks, volumes)
+        mock_pull.assert_any_call(
+            self.context, container.image, 'latest', 'always', 'glance',
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
+        expected_image = dict(image, repo=container.image, tag='latest')
+        mock_create.assert_called_once_with(self.context, container,
+                                            expected_image, networks,
+                                            volumes)
+
+    @mock.patch.object(Container, 'save')
+    @mock.patch('zun.image.driver.pull_image')
+    @mock.patch.object(fake_driver, 'read_tar_image')
+    @mock.patch.object(fake_driver, 'create')
+    def test_container_create_streamed_image(self, mock_create, mock_read,
+                                             mock_pull, mock_save):
+        container = Container(self.context, **utils.get_test_container())
+        image = {'image': 'repo', 'path': None, 'driver': 'glance',
+                 'loaded_image': 'cirros:0.4'}
+        mock_pull.return_value = image, True
+        self.compute_manager._resource_tracker = FakeResourceTracker()
+        self.compute_manager._do_container_create(self.context, container,
+                                                  [], [])
+        mock_read.assert_not_called()
+        expected_image = dict(image, repo='cirros', tag='0.4')
+        mock_create.assert_called_once_with(self.context, container,
+                                            expected_image, [], [])
+
+    @mock.patch.object(manager.Manager, 'init_containers')
+    @mock.patch.object(manager.Manager, 'start_sandbox_pool')
+    @mock.patch('zun.service.periodic.setup')
+    def test_init_host(self, mock_setup, mock_start_pool, mock_init):
+        tg = mock.Mock()
+        self.compute_manager.init_host(tg)
+        mock_setup.assert_called_once_with(zun.conf.CONF, tg)
+        mock_start_pool.assert_called_once_with(tg)
+        mock_init.assert_called_once_with(mock.ANY)
+
+    @mock.patch.object(manager.Manager, '_pull_image')
+    @mock.patch.object(fake_driver, 'get_sandbox_pool')
+    def test_start_sandbox_pool(self, mock_get_pool, mock_pull):
+        tg = mock.Mock()
+        self.compute_manager.start_sandbox_pool(tg)
+        pool = mock_get_pool.return_value
+        tg.add_thread.assert_called_once_with(
+            pool.run, self.compute_manager._pull_sandbox_image)
+        # The pool pulls its image like any sandbox does.
+        tg.add_thread.call_args[0][1]()
+        mock_pull.assert_called_once_with(
+            mock.ANY, 'kubernetes/pause', 'latest',
+            zun.conf.CONF.sandbox_image_pull_policy,
+            zun.conf.CONF.sandbox_image_driver)
+
+    @mock.patch.object(fake_driver, 'get_sandbox_pool')
+    def test_start_sandbox_pool_disabled(self, mock_get_pool):
+        mock_get_pool.return_value = None
+        tg = mock.Mock()
+        self.compute_manager.start_sandbox_pool(tg)
+        self.assertFalse(tg.add_thread.called)
+
+    @mock.patch.object(fake_driver, 'load_image')
+    @mock.patch('zun.image.driver.pull_image')
+    def test_pull_image_single_flight(self, mock_pull, mock_load):
+        image = {'image': 'repo', 'path': 'out_path', 'driver': 'glance'}
+        mock_pull.return_value = image, False
+
+        def fake_do(key, func):
+            self.assertEqual(('glance', 'repo', 'tag', 'always',
+                              'fake_project'), key)
+            return func()
+
+        with mock.patch.object(self.compute_manager._image_pulls, 'do',
+                               side_effect=fake_do) as mock_do:
+            pulled = self.compute_manager._pull_image(
+                self.context, 'repo', 'tag', 'always', 'glance')
+        self.assertEqual(1, mock_do.call_count)
+        self.assertEqual(image, pulled)
+        self.assertIsNot(image, pulled)
+        mock_pull.assert_called_once_with(
+            self.context, 'repo', 'tag', 'always', 'glance',
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
+        mock_load.assert_called_once_with('out_path')
 
     @mock.patch.object(Container, 'save')
     @mock.patch('zun.image.driver.pull_image')
@@ -278,10 +358,14 @@ class TestManager(base.TestCase):
             container=container,
             limits=None, run=True)
         mock_save.assert_called_with(self.context)
-        mock_pull.assert_any_call(self.context, container.image, 'latest',
-                                  'always', 'glance')
-        mock_create.assert_called_once_with(self.context, container, image,
-                                            networks, volumes)
+        mock_pull.assert_any_call(
+            self.context, container.image, 'latest', 'always', 'glance',
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
+        expected_image = dict(image, repo=container.image, tag='latest')
+        mock_create.assert_called_once_with(self.context, container,
+                                            expected_image, networks,
+                                            volumes)
         mock_start.assert_called_once_with(self.context, container)
         mock_attach_volume.assert_called_once()
         mock_detach_volume.assert_not_called()
@@ -356,8 +440,10 @@ class TestManager(base.TestCase):
         mock_save.assert_called_with(self.context)
         self.assertEqual('Error', container.status)
         self.assertEqual('Image Not Found', container.status_reason)
-        mock_pull.assert_called_once_with(self.context, 'test', 'latest',
-                                          'ifnotpresent', 'docker')
+        mock_pull.assert_called_once_with(
+            self.context, 'test', 'latest', 'ifnotpresent', 'docker',
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
         mock_attach_volume.assert_called_once()
         mock_detach_volume.assert_called_once()
         self.assertEqual(0, len(FakeVolumeMapping.volumes))
@@ -390,8 +476,10 @@ class TestManager(base.TestCase):
         mock_save.assert_called_with(self.context)
         self.assertEqual('Error', container.status)
         self.assertEqual('Image Not Found', container.status_reason)
-        mock_pull.assert_called_once_with(self.context, 'test', 'latest',
-                                          'ifnotpresent', 'docker')
+        mock_pull.assert_called_once_with(
+            self.context, 'test', 'latest', 'ifnotpresent', 'docker',
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
         mock_attach_volume.assert_called_once()
         mock_detach_volume.assert_called_once()
         self.assertEqual(0, len(FakeVolumeMapping.volumes))
@@ -424,8 +512,10 @@ class TestManager(base.TestCase):
         mock_save.assert_called_with(self.context)
         self.assertEqual('Error', container.status)
         self.assertEqual('Docker Error occurred', container.status_reason)
-        mock_pull.assert_called_once_with(self.context, 'test', 'latest',
-                                          'ifnotpresent', 'docker')
+        mock_pull.assert_called_once_with(
+            self.context, 'test', 'latest', 'ifnotpresent', 'docker',
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
         mock_attach_volume.assert_called_once()
         mock_detach_volume.assert_called_once()
         self.assertEqual(0, len(FakeVolumeMapping.volumes))
@@ -461,10 +551,13 @@ class TestManager(base.TestCase):
         mock_save.assert_called_with(self.context)
         self.assertEqual('Error', container.status)
         self.assertEqual('Docker Error occurred', container.status_reason)
-        mock_pull.assert_any_call(self.context, container.image, 'latest',
-                                  'always', 'glance')
+        mock_pull.assert_any_call(
+            self.context, container.image, 'latest', 'always', 'glance',
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
+        expected_image = dict(image, repo=container.image, tag='latest')
         mock_create.assert_called_once_with(
-            self.context, container, image, networks, volumes)
+            self.context, container, expected_image, networks, volumes)
         mock_attach_volume.assert_called_once()
         mock_detach_volume.assert_called_once()
         self.assertEqual(0, len(FakeVolumeMapping.volumes))
@@ -831,7 +924,10 @@ class TestManager(base.TestCase):
         mock_pull.return_value = ret, True
         mock_inspect.return_value = {'Id': 'fake-id', 'Size': 512}
         self.compute_manager._do_image_pull(self.context, image)
-        mock_pull.assert_any_call(self.context, image.repo, image.tag)
+        mock_pull.assert_any_call(
+            self.context, image.repo, image.tag, 'always', None,
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
         mock_save.assert_called_once()
         mock_inspect.assert_called_once_with(image.repo + ":" + image.tag)
 
@@ -847,11 +943,33 @@ class TestManager(base.TestCase):
         mock_pull.return_value = ret, False
         mock_inspect.return_value = {'Id': 'fake-id', 'Size': 512}
         self.compute_manager._do_image_pull(self.context, image)
-        mock_pull.assert_any_call(self.context, image.repo, image.tag)
+        mock_pull.assert_any_call(
+            self.context, image.repo, image.tag, 'always', None,
+            load_image=self.compute_manager.driver.load_image,
+            image_exists=self.compute_manager.driver.image_exists)
         mock_save.assert_called_once()
         mock_inspect.assert_called_once_with(repo_tag)
         mock_load.assert_called_once_with(ret['path'])
 
+    @mock.patch.object(Image, 'save')
+    @mock.patch('zun.image.driver.pull_image')
+    def test_image_pull_not_found(self, mock_pull, mock_save):
+        image = Image(self.context, **utils.get_test_image())
+        mock_pull.side_effect = exception.ImageNotFound('not found')
+        self.compute_manager._do_image_pull(self.context, image)
+        self.assertEqual(consts.ERROR, image.status)
+        mock_save.assert_called_once_with()
+
+    @mock.patch.object(Image, 'save')
+    def test_image_pull_queue_full(self, mock_save):
+        image = Image(self.context, **utils.get_test_image())
+        self.compute_manager._executor = mock.Mock()
+        self.compute_manager._executor.submit.side_effect = \
+            exception.ComputeQueueFull(op_class='create', host='host')
+        self.compute_manager.image_pull(self.context, image)
+        self.assertEqual(consts.ERROR, image.status)
+        mock_save.assert_called_once_with()
+
     @mock.patch.object(fake_driver, 'execute_resize')
     def test_container_exec_resize(self, mock_resize):
         self.compute_manager.container_exec_resize(
@@ -889,9 +1007,56 @@ class TestManager(base.TestCase):
         mock_commit.side_effect = exception.DockerError
         self.assertRaises(exception.DockerError,
                           self.compute_manager._do_container_commit,
-                          self.context, container, 'repo', 'tag')
+                          self.context, mock.Mock(), container, 'repo', 'tag')
         self.assertTrue(mock_delete.called)
 
+    @mock.patch('zun.image.driver.delete_image')
+    @mock.patch('zun.image.driver.create_image')
+    def test_container_commit_queue_full(self, mock_create_image,
+                                         mock_delete_image):
+        container = Container(self.context, **utils.get_test_container())
+        mock_create_image.return_value = mock.Mock(id='image-id')
+        self.compute_manager._executor = mock.Mock()
+        self.compute_manager._executor.submit.side_effect = \
+            exception.ComputeQueueFull(op_class='create', host='host')
+        self.assertRaises(exception.ComputeQueueFull,
+                          self.compute_manager.container_commit,
+                          self.context, container, 'repo', 'tag')
+        self.assertEqual('image-id', mock_delete_image.call_args[0][1])
+
+    @mock.patch.object(Container, 'save')
+    def test_container_create_queue_full(self, mock_save):
+        container = Container(self.context, **utils.get_test_container())
+        self.compute_manager._executor = mock.Mock()
+        self.compute_manager._executor.submit.side_effect = \
+            exception.ComputeQueueFull(op_class='create', host='host')
+        self.compute_manager.container_create(
+            self.context, None, [], [], container, run=True)
+        self.assertEqual(consts.ERROR, container.status)
+        self.assertIn('Too many create operations', container.status_reason)
+        mock_save.assert_called_once_with(self.context)
+
+    def test_capsule_delete_queue_full(self):
+        capsule = mock.MagicMock()
+        self.compute_manager._executor = mock.Mock()
+        self.compute_manager._executor.submit.side_effect = \
+            exception.ComputeQueueFull(op_class='delete', host='host')
+        self.assertRaises(exception.ComputeQueueFull,
+                          self.compute_manager.capsule_delete,
+                          self.context, capsule)
+        self.assertIsNone(capsule.task_state)
+        capsule.save.assert_called_once_with(self.context)
+
+    @mock.patch.object(Container, 'save')
+    def test_container_stop_queue_full(self, mock_save):
+        container = Container(self.context, **utils.get_test_container())
+        self.compute_manager._executor = mock.Mock()
+        self.compute_manager._executor.submit.side_effect = \
+            exception.ComputeQueueFull(op_class='action', host='host')
+        self.compute_manager.container_stop(self.context, container, 10)
+        self.assertEqual(consts.RUNNING, container.status)
+        self.assertIn('Too many action operations', container.status_reason)
+
     @mock.patch.object(fake_driver, 'network_detach')
     def test_container_network_detach(self, mock_detach):
         container = Container(self.context, **utils.get_test_container())
@@ -902,3 +1067,130 @@ class TestManager(base.TestCase):
     def test_container_network_attach(self, mock_attach):
         container = Container(self.context, **utils.get_test_container())
         self.compute_manager.network_attach(self.context, container, 'network')
+
+    @mock.patch.object(manager.Manager, '_do_container_start')
+    @mock.patch.object(manager.Manager, '_do_container_create_base')
+    @mock.patch.object(manager.Manager, '_pull_image')
+    @mock.patch.object(manager.Manager, '_create_sandbox')
+    @mock.patch.object(Container, 'save')
+    def test_capsule_create_in_parallel(self, mock_save, mock_sandbox,
+                                        mock_pull, mock_create_base,
+                                        mock_start):
+        zun.conf.CONF.set_override('capsule_container_concurrency', 2,
+                                   group='compute')
+        sandbox = Container(self.context, **utils.get_test_container())
+        sandbox.set_sandbox_id('sandbox-id')
+        members = [
+            Container(self.context, **utils.get_test_container(
+                uuid=uuidutils.generate_uuid(), image='image%d' % i))
+            for i in range(3)]
+        capsule = mock.MagicMock(containers=[sandbox] + members)
+        pulling = []
+        max_pulling = []
+
+        def fake_pull(ctx, repo, *args, **kwargs):
+            # Pending pulls must never delay the sandbox creation.
+            self.assertTrue(mock_sandbox.called)
+            pulling.append(repo)
+            max_pulling.append(len(pulling))
+            eventlet.sleep(0)
+            pulling.remove(repo)
+            return {'image': repo}
+
+        mock_pull.side_effect = fake_pull
+        running = []
+        max_running = []
+
+        def fake_create_base(context, container, networks, **kwargs):
+            running.append(container)
+            max_running.append(len(running))
+            eventlet.sleep(0)
+            running.remove(container)
+            self.assertEqual({'image': container.image},
+                             kwargs['image_pull'].wait())
+            return container
+
+        mock_create_base.side_effect = fake_create_base
+        self.compute_manager._do_capsule_create(self.context, capsule)
+
+        self.assertEqual(3, mock_pull.call_count)
+        self.assertEqual(2, max(max_pulling))
+        self.assertEqual(3, mock_create_base.call_count)
+        self.assertEqual(2, max(max_running))
+        self.assertEqual(set(c.uuid for c in members),
+                         set(call[0][1].uuid
+                             for call in mock_start.call_args_list))
+
+    @mock.patch('zun.common.utils.spawn_n')
+    @mock.patch.object(manager.Manager, '_do_container_delete')
+    @mock.patch.object(Container, 'get_by_uuid')
+    def test_capsule_delete(self, mock_get, mock_delete, mock_spawn_n):
+        mock_spawn_n.side_effect = lambda f, *x, **y: f(*x, **y)
+        uuids = [uuidutils.generate_uuid() for i in range(3)]
+        mock_get.side_effect = lambda ctx, uuid: Container(
+            self.context, **utils.get_test_container(uuid=uuid))
+        capsule = mock.MagicMock(containers_uuids=uuids)
+
+        self.compute_manager.capsule_delete(self.context, capsule)
+
+        deleted = [call[0][1].uuid for call in mock_delete.call_args_list]
+        self.assertEqual(set(uuids[1:]), set(deleted[:2]))
+        self.assertEqual(uuids[0], deleted[2])
+        capsule.destroy.assert_called_once_with(self.context)
+
+    @mock.patch('zun.common.utils.spawn_n')
+    @mock.patch.object(manager.Manager, '_do_container_delete')
+    @mock.patch.object(Container, 'get_by_uuid')
+    def test_capsule_delete_failed(self, mock_get, mock_delete,
+                                   mock_spawn_n):
+        mock_spawn_n.side_effect = lambda f, *x, **y: f(*x, **y)
+        uuids = [uuidutils.generate_uuid() for i in range(3)]
+        mock_get.side_effect = lambda ctx, uuid: Container(
+            self.context, **utils.get_test_container(uuid=uuid))
+
+        def fake_delete(context, container, force, reraise):
+            self.assertTrue(reraise)
+            if container.uuid == uuids[1]:
+                raise exception.DockerError('delete failed')
+
+        mock_delete.side_effect = fake_delete
+        capsule = mock.MagicMock(containers_uuids=uuids)
+
+        self.compute_manager.capsule_delete(self.context, capsule)
+
+        # The sandbox is kept for the container which is left behind.
+        deleted = [call[0][1].uuid for call in mock_delete.call_args_list]
+        self.assertEqual(set(uuids[1:]), set(deleted))
+        self.assertEqual(consts.ERROR, capsule.status)
+        self.assertIn(uuids[1], capsule.status_reason)
+        capsule.save.assert_called_with(self.context)
+        self.assertFalse(capsule.destroy.called)
+
+    @mock.patch.object(manager.Manager, '_do_container_start')
+    @mock.patch.object(manager.Manager, '_do_container_create_base')
+    @mock.patch.object(manager.Manager, '_pull_image')
+    @mock.patch.object(manager.Manager, '_create_sandbox')
+    @mock.patch.object(Container, 'save')
+    def test_capsule_create_failed(self, mock_save, mock_sandbox, mock_pull,
+                                   mock_create_base, mock_start):
+        sandbox = Container(self.context, **utils.get_test_container())
+        sandbox.set_sandbox_id('sandbox-id')
+        members = [
+            Container(self.context, **utils.get_test_container(
+                uuid=uuidutils.generate_uuid(), image='image%d' % i))
+            for i in range(2)]
+        capsule = mock.MagicMock(containers=[sandbox] + members)
+
+        def fake_create_base(context, container, networks, **kwargs):
+            self.assertTrue(kwargs['reraise'])
+            if container is members[0]:
+                raise exception.DockerError('create failed')
+            return container
+
+        mock_create_base.side_effect = fake_create_base
+        self.compute_manager._do_capsule_create(self.context, capsule)
+
+        mock_start.assert_called_once_with(self.context, members[1],
+                                           reraise=True)
+        self.assertEqual(consts.ERROR, capsule.status)
+        self.assertIn(members[0].uuid, capsule.status_reason)
@@ -0,0 +1,234 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from oslo_utils import uuidutils
+
+from zun.compute import compute_node_tracker
+import zun.conf
+from zun import objects
+from zun.objects.container import Container
+from zun.tests import base
+from zun.tests.unit.db import utils
+
+CONF = zun.conf.CONF
+
+
+def _fake_available_resources(node):
+    node.mem_total = 1024
+    node.mem_free = 1024
+    node.mem_available = 1024
+    node.mem_used = 0
+    node.total_containers = 0
+    node.running_containers = 0
+    node.paused_containers = 0
+    node.stopped_containers = 0
+    node.cpus = 4
+    node.cpu_used = 0.0
+
+
+class TestComputeNodeTracker(base.TestCase):
+
+    def setUp(self):
+        super(TestComputeNodeTracker, self).setUp()
+        p = mock.patch('zun.scheduler.client.SchedulerClient')
+        self.scheduler_client = p.start().return_value
+        self.addCleanup(p.stop)
+        p = mock.patch('zun.pci.manager.PciDevTracker')
+        pci_tracker = p.start().return_value
+        pci_tracker.stats.to_device_pools_obj.return_value = None
+        self.addCleanup(p.stop)
+        self.driver = mock.Mock()
+        self.driver.get_pci_resources.return_value = '[]'
+        self.driver.get_available_resources.side_effect = \
+            _fake_available_resources
+        self.tracker = compute_node_tracker.ComputeNodeTracker(
+            'fake-host', self.driver)
+        self.node = objects.ComputeNode(self.context,
+                                        uuid=uuidutils.generate_uuid())
+        self.node.hostname = 'fake-host'
+        self.node.pci_device_pools = None
+        p = mock.patch.object(self.tracker, '_get_compute_node',
+                              return_value=self.node)
+        self.mock_get_node = p.start()
+        self.addCleanup(p.stop)
+
+    def _container(self, memory='256M', cpu=1.0):
+        return Container(self.context, **utils.get_test_container(
+            uuid=uuidutils.generate_uuid(), memory=memory, cpu=cpu,
+            host='fake-host'))
+
+    @mock.patch.object(Container, 'list_by_host')
+    def test_audit_runs_at_interval(self, mock_list):
+        CONF.set_override('resource_audit_interval', 600, group='compute')
+        mock_list.return_value = [self._container()]
+        self.tracker.update_available_resources(self.context)
+        self.tracker.update_available_resources(self.context)
+        self.assertEqual(1, mock_list.call_count)
+        self.assertEqual(2, self.driver.get_available_resources.call_count)
+        self.assertEqual(256, self.tracker.compute_node.mem_used)
+        self.assertEqual(1, self.scheduler_client.update_resource.call_count)
+
+        CONF.set_override('resource_audit_interval', 0, group='compute')
+        self.tracker.update_available_resources(self.context)
+        self.assertEqual(2, mock_list.call_count)
+        self.assertEqual(256, self.tracker.compute_node.mem_used)
+
+    @mock.patch.object(Container, 'list_by_host')
+    def test_driver_resources_refreshed_between_audits(self, mock_list):
+        CONF.set_override('resource_audit_interval', 600, group='compute')
+        mock_list.return_value = [self._container()]
+        self.tracker.update_available_resources(self.context)
+
+        def available_resources(node):
+            _fake_available_resources(node)
+            node.mem_total = 2048
+            node.stopped_containers = 3
+            node.images = ['cirros:latest']
+
+        self.driver.get_available_resources.side_effect = available_resources
+        self.tracker.update_available_resources(self.context)
+
+        self.assertEqual(1, mock_list.call_count)
+        node = self.tracker.compute_node
+        self.assertEqual((2048, 3, ['cirros:latest']),
+                         (node.mem_total, node.stopped_containers,
+                          node.images))
+        # The usage tracked by the claims is kept.
+        self.assertEqual((256, 1792, 1.0),
+                         (node.mem_used, node.mem_free, node.cpu_used))
+        saved = self.scheduler_client.update_resource.call_args[0][0]
+        self.assertEqual(set(['mem_total', 'mem_free', 'stopped_containers',
+                              'images']),
+                         saved.obj_what_changed())
+
+    @mock.patch.object(Container, 'list_by_host')
+    def test_reset_forces_audit(self, mock_list):
+        CONF.set_override('resource_audit_interval', 600, group='compute')
+        mock_list.return_value = []
+        self.tracker.update_available_resources(self.context)
+        self.tracker.reset()
+        self.tracker.update_available_resources(self.context)
+        self.assertEqual(2, mock_list.call_count)
+        self.assertEqual(2, self.driver.get_available_resources.call_count)
+
+    @mock.patch.object(Container, 'save')
+    @mock.patch.object(Container, 'list_by_host')
+    def test_claim_and_release_apply_deltas(self, mock_list, mock_save):
+        mock_list.return_value = []
+        self.tracker.update_available_resources(self.context)
+        self.mock_get_node.reset_mock()
+        container = self._container(memory='512M', cpu=2.0)
+
+        self.tracker.container_claim(self.context, container, None)
+        node = self.tracker.compute_node
+        self.assertEqual((512, 2.0, 1),
+                         (node.mem_used, node.cpu_used,
+                          node.running_containers))
+        saved = self.scheduler_client.update_resource.call_args[0][0]
+        self.assertEqual(512, saved.mem_used)
+
+        self.tracker.remove_usage_from_container(self.context, container)
+        self.assertEqual((0, 0.0, 0),
+                         (node.mem_used, node.cpu_used,
+                          node.running_containers))
+        self.assertEqual(3, self.scheduler_client.update_resource.call_count)
+        self.assertFalse(self.mock_get_node.called)
+        self.assertEqual(1, mock_list.call_count)
+
+    @mock.patch.object(Container, 'list_by_host')
+    def test_unchanged_audit_is_not_persisted(self, mock_list):
+        CONF.set_override('resource_audit_interval', 0, group='compute')
+        mock_list.return_value = [self._container()]
+        self.tracker.update_available_resources(self.context)
+        self.tracker.update_available_resources(self.context)
+        self.assertEqual(2, mock_list.call_count)
+        self.assertEqual(1, self.scheduler_client.update_resource.call_count)
+
+    @mock.patch.object(Container, 'save')
+    @mock.patch.object(Container, 'list_by_host')
+    def test_only_changed_fields_are_persisted(self, mock_list, mock_save):
+        mock_list.return_value = []
+        self.tracker.update_available_resources(self.context)
+        self.tracker.container_claim(self.context, self._container(), None)
+        saved = self.scheduler_client.update_resource.call_args[0][0]
+        self.assertEqual(set(['mem_used', 'mem_free', 'cpu_used',
+                              'running_containers']),
+                         saved.obj_what_changed())
+
+    @mock.patch.object(Container, 'save')
+    @mock.patch.object(Container, 'list_by_host')
+    def test_claim_during_audit_is_kept(self, mock_list, mock_save):
+        existing = self._container(memory='128M')
+        claimed = self._container(memory='256M')
+
+        def list_by_host(context, host):
+            # A claim made while the containers are being loaded.
+            self.tracker.container_claim(self.context, claimed, None)
+            return [existing]
+
+        mock_list.side_effect = list_by_host
+        self.tracker.update_available_resources(self.context)
+        self.assertEqual(384, self.tracker.compute_node.mem_used)
+        self.assertEqual(set([existing.uuid, claimed.uuid]),
+                         set(self.tracker.tracked_containers))
+
+    @mock.patch.object(Container, 'list_by_host')
+    def test_persist_coalesces_writes(self, mock_list):
+        mock_list.return_value = []
+        self.tracker.update_available_resources(self.context)
+        self.scheduler_client.update_resource.reset_mock()
+        node = self.tracker.compute_node
+
+        def update_resource(snapshot):
+            if self.scheduler_client.update_resource.call_count == 1:
+                # A change made while the node is being written is picked
+                # up by the running writer.
+                node.mem_used = 100
+                self.tracker._dirty = True
+                self.tracker._persist()
+
+        self.scheduler_client.update_resource.side_effect = update_resource
+        node.mem_used = 50
+        self.tracker._dirty = True
+        self.tracker._persist()
+        calls = self.scheduler_client.update_resource.call_args_list
+        self.assertEqual([50, 100], [c[0][0].mem_used for c in calls])
+        self.assertEqual(set(), node.obj_what_changed())
+
+    @mock.patch.object(Container, 'save')
+    @mock.patch.object(Container, 'list_by_host')
+    def test_claim_persist_failure_keeps_claim(self, mock_list, mock_save):
+        mock_list.return_value = []
+        self.tracker.update_available_resources(self.context)
+        self.scheduler_client.update_resource.side_effect = Exception
+        container = self._container(memory='512M')
+
+        claim = self.tracker.container_claim(self.context, container, None)
+
+        self.assertEqual(512, claim.memory)
+        self.assertEqual(512, self.tracker.compute_node.mem_used)
+        self.assertIn(container.uuid, self.tracker.tracked_containers)
+        self.assertTrue(self.tracker._dirty)
+
+    @mock.patch.object(Container, 'list_by_host')
+    def test_persist_failure_keeps_changes(self, mock_list):
+        mock_list.return_value = []
+        self.tracker.update_available_resources(self.context)
+        node = self.tracker.compute_node
+        self.scheduler_client.update_resource.side_effect = Exception
+        node.mem_used = 50
+        self.tracker._dirty = True
+        self.assertRaises(Exception, self.tracker._persist)
+        self.assertIn('mem_used', node.obj_what_changed())
+        self.assertTrue(self.tracker._dirty)
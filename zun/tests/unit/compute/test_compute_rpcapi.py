@@ -41,3 +41,12 @@ class TestAPI(base.TestCase):
         self.assertRaises(exception.ContainerHostNotUp,
                           self.compute_rpcapi.container_delete,
                           self.context, test_container_obj, False)
+
+    @mock.patch('zun.common.rpc_service.API._cast')
+    def test_container_start_uses_call_context(self, mock_rpc_cast):
+        test_container = utils.get_test_container(host='fake_host')
+        test_container_obj = objects.Container(self.context, **test_container)
+        self.compute_rpcapi.container_start(self.context, test_container_obj)
+        mock_rpc_cast.assert_called_once_with(
+            self.context, 'fake_host', 'container_start',
+            container=test_container_obj)
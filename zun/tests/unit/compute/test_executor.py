@@ -0,0 +1,98 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+from eventlet import event
+
+from zun.common import exception
+from zun.compute import executor
+import zun.conf
+from zun.tests import base
+
+CONF = zun.conf.CONF
+
+
+class TestLane(base.BaseTestCase):
+
+    def test_concurrency_is_bounded(self):
+        lane = executor.Lane('test', workers=2, queue_size=10)
+        done = event.Event()
+        running = []
+
+        def op():
+            running.append(1)
+            done.wait()
+
+        for i in range(5):
+            lane.submit(op)
+        eventlet.sleep(0)
+        self.assertEqual(2, len(running))
+        self.assertEqual(2, lane.running)
+        self.assertEqual(3, lane.queued)
+
+        done.send()
+        while lane.completed < 5:
+            eventlet.sleep(0)
+        self.assertEqual(5, len(running))
+        self.assertEqual(0, lane.queued)
+        self.assertEqual(0, lane.running)
+
+    def test_submit_rejects_when_full(self):
+        lane = executor.Lane('test', workers=1, queue_size=1)
+        done = event.Event()
+        lane.submit(done.wait)
+        lane.submit(done.wait)
+        self.assertRaises(exception.ComputeQueueFull, lane.submit, done.wait)
+        self.assertEqual(1, lane.stats()['rejected'])
+
+        done.send()
+        while lane.completed < 2:
+            eventlet.sleep(0)
+        lane.submit(lambda: None)
+        eventlet.sleep(0)
+        self.assertEqual(3, lane.completed)
+
+    def test_stats(self):
+        lane = executor.Lane('test', workers=1, queue_size=1)
+
+        def fail():
+            raise ValueError()
+
+        lane._run(0, lambda: None)
+        self.assertRaises(ValueError, lane._run, 0, fail)
+        stats = lane.stats()
+        self.assertEqual(2, stats['completed'])
+        self.assertEqual(1, stats['failed'])
+        self.assertGreater(stats['max_wait_time'], 0)
+
+
+class TestExecutor(base.BaseTestCase):
+
+    def test_lanes(self):
+        CONF.set_override('create_concurrency', 1, group='compute')
+        pool = executor.Executor()
+        done = event.Event()
+        ran = []
+        pool.submit(executor.CREATE, done.wait)
+        pool.submit(executor.CREATE, ran.append, executor.CREATE)
+        pool.submit(executor.DELETE, ran.append, executor.DELETE)
+        pool.submit(executor.ACTION, ran.append, executor.ACTION)
+        eventlet.sleep(0)
+        # NOTE: Deletes and actions do not wait for the blocked create.
+        self.assertEqual([executor.DELETE, executor.ACTION], ran)
+        done.send()
+        while len(ran) < 3:
+            eventlet.sleep(0)
+        self.assertEqual(executor.CREATE, ran[2])
+        self.assertEqual(set([executor.CREATE, executor.ACTION,
+                              executor.DELETE]),
+                         set(pool.stats()))
@@ -60,6 +60,12 @@ class TestDockerDriver(base.DriverTestCase):
         self.driver.inspect_image(mock_image)
         self.mock_docker.inspect_image.assert_called_once_with(mock_image)
 
+    def test_image_exists(self):
+        self.mock_docker.inspect_image = mock.Mock()
+        self.assertTrue(self.driver.image_exists('cirros:latest'))
+        self.mock_docker.inspect_image.side_effect = errors.NotFound('nf')
+        self.assertFalse(self.driver.image_exists('cirros:latest'))
+
     def test_get_image(self):
         self.mock_docker.get_image = mock.Mock()
         self.driver.get_image(name='image_name')
@@ -79,11 +85,36 @@ class TestDockerDriver(base.DriverTestCase):
             self.mock_docker.load_image.assert_called_once_with(
                 mock_open_file.return_value)
 
+    def test_load_image_stream(self):
+        self.mock_docker.load_image_stream = mock.Mock(
+            return_value='cirros:latest')
+        data = iter([b'chunk'])
+        self.assertEqual('cirros:latest', self.driver.load_image(data=data))
+        self.mock_docker.load_image_stream.assert_called_once_with(data)
+
     def test_images(self):
         self.mock_docker.images = mock.Mock()
         self.driver.images(repo='test')
         self.mock_docker.images.assert_called_once_with('test', False)
 
+    def test_get_local_images(self):
+        conf.CONF.set_override('max_reported_images', 3, group='compute')
+        self.mock_docker.images = mock.Mock(return_value=[
+            {'RepoTags': ['cirros:latest'], 'Size': 10},
+            {'RepoTags': ['<none>:<none>'], 'Size': 500},
+            {'RepoTags': ['ubuntu:16.04', 'ubuntu:xenial'], 'Size': 100},
+            {'RepoTags': None, 'Size': 400},
+            {'RepoTags': ['busybox:latest'], 'Size': 1},
+        ])
+        self.assertEqual(['cirros:latest', 'ubuntu:16.04', 'ubuntu:xenial'],
+                         self.driver.get_local_images())
+
+    def test_get_local_images_disabled(self):
+        conf.CONF.set_override('max_reported_images', 0, group='compute')
+        self.mock_docker.images = mock.Mock()
+        self.assertEqual([], self.driver.get_local_images())
+        self.assertFalse(self.mock_docker.images.called)
+
     @mock.patch('zun.network.kuryr_network.KuryrNetwork'
                 '.connect_container_to_network')
     @mock.patch('zun.network.kuryr_network.KuryrNetwork'
@@ -194,6 +225,14 @@ class TestDockerDriver(base.DriverTestCase):
                 self.context, [mock_container])
             self.assertEqual(mock_container.host, 'host2')
             self.assertEqual(mock_container.status, 'Stopped')
+            # The loaded containers are passed through, not loaded again.
+            self.assertEqual(1, len(mock_list.call_args[0][1]))
+
+    @mock.patch('zun.objects.Container.list_by_host')
+    def test_list_with_db_containers(self, mock_list_by_host):
+        self.mock_docker.list_containers.return_value = []
+        self.driver.list(self.context, [])
+        self.assertFalse(mock_list_by_host.called)
 
     def test_show_success(self):
         self.mock_docker.inspect_container = mock.Mock(
@@ -457,6 +496,47 @@ class TestDockerDriver(base.DriverTestCase):
             networking_config={'Id': 'val1', 'key1': 'val2'})
         self.assertEqual(result_sandbox_id, 'val1')
 
+    @mock.patch('zun.network.network.api')
+    @mock.patch('zun.container.docker.sandbox_pool.get_sandbox_pool')
+    @mock.patch('zun.common.utils.get_security_group_ids')
+    def test_create_sandbox_from_pool(self, mock_get_security_group_ids,
+                                      mock_get_pool, mock_network_api):
+        mock_pool = mock_get_pool.return_value
+        mock_pool.claim.return_value = 'pooled_id'
+        self.mock_docker.create_container = mock.Mock()
+        mock_container = mock.MagicMock()
+        mock_container.addresses = None
+        mock_container.uuid = 'fake-uuid'
+        mock_container.hostname = None
+        network_api = mock_network_api.return_value
+        network_api.connect_container_to_network.return_value = ['fake-addr']
+        requested_networks = [{'network': 'fake-network'}]
+        result_sandbox_id = self.driver.create_sandbox(
+            self.context, mock_container, requested_networks, [],
+            'kubernetes/pause')
+        self.assertEqual('pooled_id', result_sandbox_id)
+        mock_pool.claim.assert_called_once_with(self.mock_docker,
+                                                'zun-sandbox-fake-uuid')
+        self.mock_docker.create_container.assert_not_called()
+        mock_container.set_sandbox_id.assert_called_once_with('pooled_id')
+        self.assertEqual({'fake-network': ['fake-addr']},
+                         mock_container.addresses)
+        self.mock_docker.start.assert_called_once_with('pooled_id')
+
+    @mock.patch('zun.container.docker.sandbox_pool.get_sandbox_pool')
+    def test_claim_pooled_sandbox_with_volumes(self, mock_get_pool):
+        self.assertIsNone(self.driver._claim_pooled_sandbox(
+            self.mock_docker, mock.Mock(hostname=None), 'name',
+            [mock.Mock()], 'kubernetes/pause'))
+        mock_get_pool.return_value.claim.assert_not_called()
+
+    @mock.patch('zun.container.docker.sandbox_pool.get_sandbox_pool')
+    def test_claim_pooled_sandbox_with_hostname(self, mock_get_pool):
+        self.assertIsNone(self.driver._claim_pooled_sandbox(
+            self.mock_docker, mock.Mock(hostname='myhost'), 'name', [],
+            'kubernetes/pause'))
+        mock_get_pool.return_value.claim.assert_not_called()
+
     def test_delete_sandbox(self):
         self.mock_docker.remove_container = mock.Mock()
         mock_container = mock.MagicMock()
@@ -520,14 +600,56 @@ class TestDockerDriver(base.DriverTestCase):
 
     def test_get_cpu_used(self):
         self.mock_docker.containers = mock.Mock()
-        self.mock_docker.containers.return_value = [{'Id': '123456'}]
+        self.mock_docker.containers.return_value = [
+            {'Id': '123456', 'State': 'running'},
+            {'Id': '654321', 'State': 'exited'},
+            {'Id': '987654', 'State': 'paused'}]
         self.mock_docker.inspect_container = mock.Mock()
         self.mock_docker.inspect_container.return_value = {
             'HostConfig': {'NanoCpus': 1.0 * 1e9,
                            'CpuPeriod': 0,
                            'CpuQuota': 0}}
         cpu_used = self.driver.get_cpu_used()
-        self.assertEqual(1.0, cpu_used)
+        self.assertEqual(2.0, cpu_used)
+        self.mock_docker.containers.assert_called_once_with(all=True)
+        self.assertEqual(
+            [mock.call('123456'), mock.call('987654')],
+            self.mock_docker.inspect_container.call_args_list)
+
+    def test_get_cpu_used_cached(self):
+        self.mock_docker.containers = mock.Mock()
+        self.mock_docker.containers.return_value = [
+            {'Id': '123456', 'State': 'running'}]
+        self.mock_docker.inspect_container = mock.Mock()
+        self.mock_docker.inspect_container.return_value = {
+            'HostConfig': {'CpuPeriod': 100000,
+                           'CpuQuota': 50000}}
+        self.assertEqual(0.5, self.driver.get_cpu_used())
+        self.assertEqual(0.5, self.driver.get_cpu_used())
+        self.assertEqual(1, self.mock_docker.inspect_container.call_count)
+
+        self.driver.invalidate_cpu_allocation('123456')
+        self.mock_docker.inspect_container.return_value = {
+            'HostConfig': {'CpuPeriod': 100000,
+                           'CpuQuota': 200000}}
+        self.assertEqual(2.0, self.driver.get_cpu_used())
+        self.assertEqual(2, self.mock_docker.inspect_container.call_count)
+
+    def test_get_cpu_used_after_update(self):
+        self.mock_docker.containers = mock.Mock()
+        self.mock_docker.containers.return_value = [
+            {'Id': '123456', 'State': 'running'}]
+        self.mock_docker.inspect_container = mock.Mock()
+        self.mock_docker.inspect_container.return_value = {
+            'HostConfig': {'CpuPeriod': 100000,
+                           'CpuQuota': 50000}}
+        self.assertEqual(0.5, self.driver.get_cpu_used())
+        self.mock_docker.update_container = mock.Mock()
+        mock_container = mock.MagicMock(container_id='123456')
+        mock_container.obj_get_changes.return_value = {'cpu': 1.5}
+        self.driver.update(self.context, mock_container)
+        self.assertEqual(1.5, self.driver.get_cpu_used())
+        self.assertEqual(1, self.mock_docker.inspect_container.call_count)
 
     def test_stats(self):
         self.mock_docker.stats = mock.Mock()
@@ -649,3 +771,35 @@ class TestDockerDriver(base.DriverTestCase):
         self.assertEqual('CentOS', node_obj.os)
         self.assertEqual('3.10.0-123', node_obj.kernel_version)
         self.assertEqual({'dev.type': 'product'}, node_obj.labels)
+
+    @mock.patch('oslo_concurrency.processutils.execute')
+    @mock.patch('zun.container.driver.ContainerDriver.get_host_mem')
+    @mock.patch(
+        'zun.container.docker.driver.DockerDriver.get_host_info')
+    @mock.patch(
+        'zun.container.docker.driver.DockerDriver.get_cpu_used')
+    def test_get_available_resources_caches_capabilities(
+            self, mock_cpu_used, mock_info, mock_mem, mock_output):
+        self.driver = DockerDriver()
+        mock_output.return_value = LSCPU_ON
+        conf.CONF.set_override('floating_cpu_set', "0")
+        mock_mem.return_value = (100 * units.Ki, 50 * units.Ki, 50 * units.Ki,
+                                 50 * units.Ki)
+        mock_info.return_value = (10, 8, 0, 2, 48, 'x86_64', 'linux',
+                                  'CentOS', '3.10.0-123',
+                                  {'dev.type': 'product'})
+        mock_cpu_used.return_value = 1.0
+        self.driver.get_available_resources(objects.ComputeNode())
+        mock_info.return_value = (11, 9, 0, 2, 48, 'x86_64', 'linux',
+                                  'CentOS', '3.10.0-123',
+                                  {'dev.type': 'product'})
+        node_obj = objects.ComputeNode()
+        self.driver.get_available_resources(node_obj)
+        self.assertEqual(1, mock_output.call_count)
+        self.assertEqual(11, node_obj.total_containers)
+        self.assertEqual(9, node_obj.running_containers)
+        self.assertEqual(_numa_topo_spec, node_obj.numa_topology.to_list())
+
+        self.driver.refresh_host_capabilities()
+        self.driver.get_available_resources(objects.ComputeNode())
+        self.assertEqual(2, mock_output.call_count)
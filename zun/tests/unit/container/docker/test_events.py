@@ -0,0 +1,96 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from zun.common import consts
+from zun.common import exception
+from zun.container.docker import events as docker_events
+from zun import objects
+from zun.tests.unit.container import base
+from zun.tests.unit.db import utils
+
+
+def _make_event(action, name, cid='ddcb39a3fcec'):
+    return {'Type': 'container', 'Action': action, 'id': cid,
+            'Actor': {'ID': cid, 'Attributes': {'name': name}}}
+
+
+class TestEventWatcher(base.DriverTestCase):
+
+    def setUp(self):
+        super(TestEventWatcher, self).setUp()
+        self.driver = mock.MagicMock()
+        self.watcher = docker_events.EventWatcher(self.driver)
+        self.container = objects.Container(
+            self.context, **utils.get_test_container(task_state=None))
+        self.name = 'zun-' + self.container.uuid
+
+    @mock.patch.object(objects.Container, 'save')
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    def test_process_event(self, mock_get, mock_save):
+        mock_get.return_value = self.container
+
+        def fake_show(ctx, container):
+            container.status = consts.STOPPED
+            return container
+
+        self.driver.show.side_effect = fake_show
+        self.watcher.process_event(self.context,
+                                   _make_event('die', self.name))
+        mock_get.assert_called_once_with(self.context, self.container.uuid)
+        self.driver.show.assert_called_once_with(self.context,
+                                                 self.container)
+        mock_save.assert_called_once_with(self.context)
+        self.assertEqual(consts.STOPPED, self.container.status)
+
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    def test_process_event_ignores_irrelevant_events(self, mock_get):
+        self.watcher.process_event(self.context,
+                                   _make_event('exec_create', self.name))
+        self.watcher.process_event(
+            self.context,
+            _make_event('die', 'zun-sandbox-' + self.container.uuid))
+        self.watcher.process_event(self.context,
+                                   _make_event('die', 'not-zun'))
+        mock_get.assert_not_called()
+
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    def test_process_event_invalidates_cpu_allocation(self, mock_get):
+        self.watcher.process_event(self.context,
+                                   _make_event('update', 'not-zun'))
+        self.driver.invalidate_cpu_allocation.assert_called_once_with(
+            'ddcb39a3fcec')
+        mock_get.assert_not_called()
+
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    def test_process_event_container_not_found(self, mock_get):
+        mock_get.side_effect = exception.ContainerNotFound(
+            container=self.container.uuid)
+        self.watcher.process_event(self.context,
+                                   _make_event('die', self.name))
+        self.driver.show.assert_not_called()
+
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    def test_process_event_skips_container_in_task(self, mock_get):
+        self.container.task_state = consts.CONTAINER_STOPPING
+        mock_get.return_value = self.container
+        self.watcher.process_event(self.context,
+                                   _make_event('die', self.name))
+        self.driver.show.assert_not_called()
+
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    def test_process_event_container_id_mismatch(self, mock_get):
+        mock_get.return_value = self.container
+        self.watcher.process_event(
+            self.context, _make_event('die', self.name, cid='other'))
+        self.driver.show.assert_not_called()
@@ -0,0 +1,111 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+import zun.conf
+from zun.container.docker import sandbox_pool
+from zun.tests.unit.container import base
+
+CONF = zun.conf.CONF
+
+
+class TestSandboxPool(base.DriverTestCase):
+
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        self.pool = sandbox_pool.SandboxPool()
+        self.docker = mock.MagicMock()
+        self.docker.create_container.side_effect = [{'Id': 'id1'},
+                                                    {'Id': 'id2'}]
+        p = mock.patch('zun.container.docker.utils.docker_client')
+        mock_client = p.start()
+        self.addCleanup(p.stop)
+        mock_client.return_value.__enter__.return_value = self.docker
+
+    def test_add_sandbox(self):
+        self.pool._add_sandbox()
+        self.assertEqual(1, len(self.pool))
+        self.docker.create_host_config.assert_called_once_with(
+            network_mode='bridge')
+        args, kwargs = self.docker.create_container.call_args
+        self.assertEqual((CONF.sandbox_image,), args)
+        self.assertTrue(kwargs['name'].startswith(sandbox_pool.POOL_PREFIX))
+        stats = self.pool.stats()
+        self.assertEqual({'size': 1, 'hits': 0, 'misses': 0, 'refills': 1,
+                          'failures': 0},
+                         {k: stats[k] for k in stats if k != 'refill_rate'})
+
+    def test_refill_pulls_image_once(self):
+        pull_image = mock.Mock()
+        self.pool._refill(pull_image)
+        self.pool._refill(pull_image)
+        self.assertEqual(2, len(self.pool))
+        pull_image.assert_called_once_with()
+
+    def test_refill_backs_off(self):
+        CONF.set_override('sandbox_pool_refill_rate', 1, group='docker')
+        mock_pull = mock.Mock()
+        self.docker.create_container.side_effect = Exception
+        for i in range(3):
+            self.pool._refill(mock_pull)
+        # NOTE: The image is pulled again before every retry.
+        self.assertEqual(3, mock_pull.call_count)
+        self.assertEqual(3, self.pool.stats()['failures'])
+        self.assertEqual(8, self.pool._refill_interval())
+        for i in range(10):
+            self.pool._refill(mock_pull)
+        self.assertEqual(sandbox_pool.MAX_BACKOFF,
+                         self.pool._refill_interval())
+
+        self.docker.create_container.side_effect = [{'Id': 'id1'}]
+        self.pool._refill(mock.Mock())
+        self.assertEqual(1, len(self.pool))
+        self.assertEqual(1, self.pool._refill_interval())
+
+    def test_claim(self):
+        self.pool._add_sandbox()
+        self.pool._add_sandbox()
+        self.assertEqual('id1', self.pool.claim(self.docker, 'name'))
+        self.docker.rename.assert_called_once_with('id1', 'name')
+        self.docker.disconnect_container_from_network.assert_called_once_with(
+            'id1', 'bridge')
+        stats = self.pool.stats()
+        self.assertEqual((1, 1, 0, 2),
+                         (stats['size'], stats['hits'], stats['misses'],
+                          stats['refills']))
+
+    def test_claim_empty_pool(self):
+        self.assertIsNone(self.pool.claim(self.docker, 'name'))
+        self.assertEqual(1, self.pool.misses)
+
+    def test_claim_failure_removes_sandbox(self):
+        self.pool._add_sandbox()
+        self.docker.rename.side_effect = Exception
+        self.assertIsNone(self.pool.claim(self.docker, 'name'))
+        self.docker.remove_container.assert_called_once_with('id1',
+                                                             force=True)
+        self.assertEqual(0, len(self.pool))
+        self.assertEqual(1, self.pool.misses)
+
+    def test_get_sandbox_pool_disabled(self):
+        CONF.set_override('use_sandbox', True)
+        CONF.set_override('sandbox_pool_size', 0, group='docker')
+        self.assertIsNone(sandbox_pool.get_sandbox_pool())
+
+    @mock.patch.object(sandbox_pool, '_SANDBOX_POOL', None)
+    def test_get_sandbox_pool(self):
+        CONF.set_override('use_sandbox', True)
+        CONF.set_override('sandbox_pool_size', 2, group='docker')
+        pool = sandbox_pool.get_sandbox_pool()
+        self.assertIsInstance(pool, sandbox_pool.SandboxPool)
+        self.assertIs(pool, sandbox_pool.get_sandbox_pool())
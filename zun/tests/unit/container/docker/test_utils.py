@@ -10,10 +10,13 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from docker import errors
 import mock
+import requests
 
 from oslo_serialization import jsonutils
 
+from zun.common import exception
 from zun.container.docker import utils as docker_utils
 from zun.tests.unit.container import base
 
@@ -57,3 +60,81 @@ class TestDockerHTTPClient(base.DriverTestCase):
         self.client.read_tar_image(fake_image)
         self.assertEqual('cirros', fake_image['repo'])
         self.assertEqual('latest', fake_image['tag'])
+
+    @mock.patch('docker.APIClient.load_image')
+    def test_load_image_stream(self, mock_load):
+        mock_load.return_value = iter([
+            {'stream': 'Loading layer  1.024kB/1.024kB'},
+            {'stream': 'Loaded image: cirros:latest\n'}])
+        data = iter([b'chunk'])
+        self.assertEqual('cirros:latest',
+                         self.client.load_image_stream(data))
+        mock_load.assert_called_once_with(data)
+
+    @mock.patch('docker.APIClient.load_image')
+    def test_load_image_stream_error(self, mock_load):
+        mock_load.return_value = iter([{'error': 'unexpected EOF'}])
+        self.assertRaises(exception.DockerError,
+                          self.client.load_image_stream, iter([b'chunk']))
+
+
+class TestDockerClientPool(base.DriverTestCase):
+
+    def setUp(self):
+        super(TestDockerClientPool, self).setUp()
+        self.pool = docker_utils.DockerClientPool(max_size=2, idle_timeout=60)
+        p = mock.patch.object(self.pool, '_create_client',
+                              side_effect=lambda: mock.MagicMock())
+        self.mock_create = p.start()
+        self.addCleanup(p.stop)
+
+    def test_get_reuses_returned_client(self):
+        client = self.pool.get()
+        self.pool.put(client)
+        self.assertIs(client, self.pool.get())
+        self.assertEqual(1, self.mock_create.call_count)
+
+    def test_put_discard_closes_client(self):
+        client = self.pool.get()
+        self.pool.put(client, discard=True)
+        client.close.assert_called_once_with()
+        self.assertIsNot(client, self.pool.get())
+
+    def test_put_over_max_size_closes_client(self):
+        clients = [self.pool.get() for i in range(3)]
+        for client in clients:
+            self.pool.put(client)
+        clients[0].close.assert_not_called()
+        clients[1].close.assert_not_called()
+        clients[2].close.assert_called_once_with()
+
+    @mock.patch('time.time')
+    def test_get_evicts_idle_clients(self, mock_time):
+        mock_time.return_value = 100
+        client = self.pool.get()
+        self.pool.put(client)
+        mock_time.return_value = 161
+        self.assertIsNot(client, self.pool.get())
+        client.close.assert_called_once_with()
+
+    @mock.patch.object(docker_utils, 'get_client_pool')
+    def test_docker_client_discards_on_connection_error(self, mock_get_pool):
+        mock_get_pool.return_value = self.pool
+        with mock.patch.object(self.pool, 'put') as mock_put:
+            try:
+                with docker_utils.docker_client() as client:
+                    raise requests.exceptions.ConnectionError()
+            except requests.exceptions.ConnectionError:
+                pass
+            mock_put.assert_called_once_with(client, discard=True)
+
+    @mock.patch.object(docker_utils, 'get_client_pool')
+    def test_docker_client_translates_api_error(self, mock_get_pool):
+        mock_get_pool.return_value = self.pool
+        with mock.patch.object(self.pool, 'put') as mock_put:
+            def _raise():
+                with docker_utils.docker_client():
+                    raise errors.APIError('fake error')
+            self.assertRaises(exception.DockerError, _raise)
+            self.assertEqual(1, mock_put.call_count)
+            self.assertEqual({'discard': False}, mock_put.call_args[1])
@@ -32,6 +32,9 @@ class FakeDriver(driver.ContainerDriver):
     def inspect_image(self, image):
         pass
 
+    def image_exists(self, image):
+        return True
+
     def get_image(self, name):
         pass
 
@@ -21,8 +21,10 @@ from oslo_concurrency import processutils
 from oslo_serialization import jsonutils
 
 from zun.common import exception
+from zun.container.os_capability import host_capability
 from zun.container.os_capability.linux import os_capability_linux
 from zun.tests import base
+from zun.tests import sysfs_fixture
 
 LSCPU_ON = """# The following is the parsable format, which can be fed to other
 # programs. Each different item in every column has an unique ID
@@ -44,6 +46,20 @@ LSCPU_NO_ONLINE = """# The following is the parsable format, which can be fed to
 1,3"""
 
 
+ETHTOOL_FEATURES = """Features for enp2s0f3:
+rx-checksumming: on
+tx-checksumming: on
+scatter-gather: on
+tcp-segmentation-offload: on
+generic-receive-offload: on
+large-receive-offload: off [fixed]
+rx-vlan-offload: on
+tx-vlan-offload: on
+ntuple-filters: off [fixed]
+receive-hashing: on
+tx-udp_tnl-segmentation: off [fixed]"""
+
+
 class TestOSCapability(base.BaseTestCase):
     @mock.patch('oslo_concurrency.processutils.execute')
     def test_get_cpu_numa_info_with_online(self, mock_output):
@@ -76,81 +92,58 @@ class TestOSCapability(base.BaseTestCase):
             used = (3882464 - 3556372)
             self.assertEqual((3882464, 3514608, 3556372, used), output)
 
+    @mock.patch('oslo_concurrency.processutils.execute')
     @mock.patch('zun.pci.utils.get_ifname_by_pci_address')
     @mock.patch('zun.pci.utils.get_net_name_by_vf_pci_address')
-    @mock.patch('oslo_concurrency.processutils.execute')
-    def test_get_pci_resource(self, mock_output, mock_netname,
-                              mock_ifname):
+    def test_get_pci_resource(self, mock_netname, mock_ifname, mock_output):
+        sysfs = self.useFixture(sysfs_fixture.SysfsPciFixture())
+        sysfs.add_device('0000:00:1f.2', '8086', '1e03')
+        sysfs.add_device('0000:02:00.0', '8086', '1521', numa_node=1)
+        sysfs.add_device('0000:02:10.7', '8086', '1520', numa_node=1,
+                         physfn='0000:02:00.0')
         mock_netname.return_value = 'net_enp2s0f3_ec_38_8f_79_11_2b'
         mock_ifname.return_value = 'enp2s0f3'
-        value1 = '''0000:02:10.7 "Ethernet controller...." ""'''
-        value2 = '02:10.7 0200: 8086:1520 (rev 01)'
-        value3 = '''Slot:   02:10.7
-        Class:  Ethernet controller
-        Vendor: Intel Corporation
-        Device: I350 Ethernet Controller Virtual Function
-        Rev:    01
-        NUMANode:   0'''
-        value4 = 'class physfn'
-        value5 = '''DRIVER=igbvf
-        PCI_CLASS=20000
-        PCI_ID=8086:1520
-        PCI_SUBSYS_ID=FFFF:0000
-        PCI_SLOT_NAME=0000:02:10.7
-        MODALIAS=pci:v00008086d00001520sv0000FFFFsd00000000bc02sc00i00'''
-        value6 = '''Features for enp2s0f3:
-rx-checksumming: on
-tx-checksumming: on
-scatter-gather: on
-tcp-segmentation-offload: on
-generic-receive-offload: on
-large-receive-offload: off [fixed]
-rx-vlan-offload: on
-tx-vlan-offload: on
-ntuple-filters: off [fixed]
-receive-hashing: on
-highdma: on [fixed]
-rx-vlan-filter: on [fixed]
-vlan-challenged: off [fixed]
-tx-lockless: off [fixed]
-netns-local: off [fixed]
-tx-gso-robust: off [fixed]
-tx-fcoe-segmentation: off [fixed]
-tx-gre-segmentation: off [fixed]
-tx-ipip-segmentation: off [fixed]
-tx-sit-segmentation: off [fixed]
-tx-udp_tnl-segmentation: off [fixed]
-tx-mpls-segmentation: off [fixed]
-rx-fcs: off [fixed]
-tx-vlan-stag-hw-insert: off [fixed]
-rx-vlan-stag-hw-parse: off [fixed]
-rx-vlan-stag-filter: off [fixed]'''
-        values = [(value1, 0),
-                  (value2, 0),
-                  (value3, 0),
-                  (value4, 0),
-                  (value5, 0),
-                  (value6, 0)]
-        mock_output.side_effect = values
-        expected = {"dev_id": "pci_0000_02_10_7",
-                    "address": "0000:02:10.7",
-                    "product_id": "8086",
-                    "vendor_id": "1520",
-                    "numa_node": 0,
-                    "label": "label_1520_8086",
-                    "dev_type": "VF",
-                    "parent_addr": "0000:02:10.7"}
+        mock_output.return_value = (ETHTOOL_FEATURES, 0)
+
         output = os_capability_linux.LinuxHost().get_pci_resources()
 
-        pci_infos = jsonutils.loads(output)
-        for pci_info in pci_infos:
-            self.assertEqual(expected['dev_id'], str(pci_info['dev_id']))
-            self.assertEqual(expected['address'], str(pci_info['address']))
-            self.assertEqual(expected['product_id'],
-                             str(pci_info['product_id']))
-            self.assertEqual(expected['vendor_id'], str(pci_info['vendor_id']))
-            self.assertEqual(expected['numa_node'], pci_info['numa_node'])
-            self.assertEqual(expected['label'], str(pci_info['label']))
-            self.assertEqual(expected['dev_type'], str(pci_info['dev_type']))
-            self.assertEqual(expected['parent_addr'],
-                             str(pci_info['parent_addr']))
+        pci_infos = {dev['address']: dev for dev in jsonutils.loads(output)}
+        self.assertEqual({"dev_id": "pci_0000_00_1f_2",
+                          "address": "0000:00:1f.2",
+                          "product_id": "1e03",
+                          "vendor_id": "8086",
+                          "numa_node": None,
+                          "label": "label_8086_1e03",
+                          "dev_type": "PCI"},
+                         pci_infos['0000:00:1f.2'])
+        self.assertEqual("PF", pci_infos['0000:02:00.0']['dev_type'])
+        vf = pci_infos['0000:02:10.7']
+        self.assertEqual(("VF", "0000:02:00.0", 1, "label_8086_1520"),
+                         (vf['dev_type'], vf['parent_addr'],
+                          vf['numa_node'], vf['label']))
+        self.assertIn('tso', vf['capabilities']['network'])
+        # Only the capabilities of the VF need a command.
+        mock_output.assert_called_once_with('ethtool', '-k', 'enp2s0f3')
+
+    @mock.patch.object(host_capability.Host, '_get_pci_dev_info')
+    def test_get_pci_resource_cached(self, mock_dev_info):
+        sysfs = self.useFixture(sysfs_fixture.SysfsPciFixture())
+        sysfs.add_device('0000:02:00.0', '8086', '1521')
+        mock_dev_info.side_effect = lambda address: {'address': address}
+        host = os_capability_linux.LinuxHost()
+
+        host.get_pci_resources()
+        output = os_capability_linux.LinuxHost().get_pci_resources()
+        self.assertEqual([{'address': '0000:02:00.0'}],
+                         jsonutils.loads(output))
+        self.assertEqual(1, mock_dev_info.call_count)
+
+        sysfs.add_device('0000:02:10.0', '8086', '1520',
+                         physfn='0000:02:00.0')
+        output = host.get_pci_resources()
+        self.assertEqual(2, len(jsonutils.loads(output)))
+        self.assertEqual(3, mock_dev_info.call_count)
+
+        sysfs.remove_device('0000:02:10.0')
+        output = host.get_pci_resources()
+        self.assertEqual(1, len(jsonutils.loads(output)))
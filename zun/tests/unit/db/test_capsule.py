@@ -121,6 +121,22 @@ class SqlDbCapsuleTestCase(base.DbTestCase):
             self.context, filters={'uuid': 'unknow-uuid'})
         self.assertEqual([], [r.id for r in res])
 
+    def test_list_capsules_with_host_filter(self):
+        capsule1 = utils.create_test_capsule(
+            uuid=uuidutils.generate_uuid(),
+            host=None,
+            context=self.context)
+        capsule2 = utils.create_test_capsule(
+            uuid=uuidutils.generate_uuid(),
+            host='host2',
+            context=self.context)
+
+        res = dbapi.list_capsules(self.context, filters={'host': None})
+        self.assertEqual([capsule1.id], [r.id for r in res])
+
+        res = dbapi.list_capsules(self.context, filters={'host': 'host2'})
+        self.assertEqual([capsule2.id], [r.id for r in res])
+
     def test_destroy_capsule(self):
         capsule = utils.create_test_capsule(context=self.context)
         dbapi.destroy_capsule(self.context, capsule.id)
@@ -11,6 +11,7 @@
 #    under the License.
 
 """Tests for manipulating compute nodes via the DB API"""
+import datetime
 import json
 import mock
 from oslo_config import cfg
@@ -123,6 +124,31 @@ class DbComputeNodeTestCase(base.DbTestCase):
             filters={'hostname': node1.hostname})
         self.assertEqual([node1.uuid], [r.uuid for r in res])
 
+    def test_list_compute_nodes_updated_since(self):
+        since = datetime.datetime(2018, 1, 2)
+        utils.create_test_compute_node(
+            hostname='node-old',
+            uuid=uuidutils.generate_uuid(),
+            created_at=datetime.datetime(2018, 1, 1),
+            updated_at=datetime.datetime(2018, 1, 1),
+            context=self.context)
+        node2 = utils.create_test_compute_node(
+            hostname='node-updated',
+            uuid=uuidutils.generate_uuid(),
+            created_at=datetime.datetime(2018, 1, 1),
+            updated_at=datetime.datetime(2018, 1, 3),
+            context=self.context)
+        node3 = utils.create_test_compute_node(
+            hostname='node-new',
+            uuid=uuidutils.generate_uuid(),
+            created_at=datetime.datetime(2018, 1, 2),
+            context=self.context)
+
+        res = dbapi.list_compute_nodes(
+            self.context, filters={'updated_since': since})
+        self.assertEqual(sorted([node2.uuid, node3.uuid]),
+                         sorted([r.uuid for r in res]))
+
     def test_destroy_compute_node(self):
         node = utils.create_test_compute_node(context=self.context)
         dbapi.destroy_compute_node(self.context, node.uuid)
@@ -219,3 +219,16 @@ class DbContainerActionTestCase(base.DbTestCase,
 
         self._assertEqualOrderedListOfObjects([event3, event2, event1], events,
                                               ['container_uuid', 'request_id'])
+
+    def test_actions_destroyed_with_container(self):
+        uuid = uuidutils.generate_uuid()
+        action_values = self._create_action_values(uuid)
+        action = dbapi.action_start(self.context, action_values)
+        event_values = self._create_event_values(uuid)
+        dbapi.action_event_start(self.context, event_values)
+
+        dbapi.destroy_container(self.context, uuid)
+
+        self.assertEqual([], dbapi.actions_get(self.context, uuid))
+        self.assertEqual([], dbapi.action_events_get(self.context,
+                                                     action['id']))
@@ -195,6 +195,27 @@ class DbPciDeviceTestCase(base.DbTestCase, base.ModelsObjectComparatorMixin):
         results = dbapi.get_all_pci_device_by_node(self.compute_node['uuid'])
         self._assertEqualListsOfObjects(results, [v2], self.ignored_keys)
 
+    def test_bulk_update_pci_devices(self):
+        v1, v2 = self._get_fake_pci_devs()
+        node_id = self.compute_node['uuid']
+        v1['compute_node_uuid'] = node_id
+        dbapi.bulk_update_pci_devices(node_id, {v1['address']: v1}, [])
+
+        v1['status'] = z_fields.PciDeviceStatus.ALLOCATED
+        v2['compute_node_uuid'] = node_id
+        dbapi.bulk_update_pci_devices(
+            node_id, {v1['address']: {'status': v1['status']},
+                      v2['address']: v2}, [])
+        results = dbapi.get_all_pci_device_by_node(node_id)
+        self._assertEqualListsOfObjects(results, [v1, v2], self.ignored_keys)
+
+        v2['status'] = z_fields.PciDeviceStatus.CLAIMED
+        dbapi.bulk_update_pci_devices(
+            node_id, {v2['address']: {'status': v2['status']}},
+            [v1['address']])
+        results = dbapi.get_all_pci_device_by_node(node_id)
+        self._assertEqualListsOfObjects(results, [v2], self.ignored_keys)
+
     def test_destroy_pci_device_exception(self):
         v1, v2 = self._get_fake_pci_devs()
         self.assertRaises(exception.PciDeviceNotFound,
@@ -247,6 +268,28 @@ class EtcdDbPciDeviceTestCase(base.DbTestCase):
         self.dbapi.destroy_pci_device('1', 'fake_address')
         mock_delete.assert_called()
 
+    @mock.patch('zun.db.etcd.api.EtcdAPI._create_pci_device')
+    @mock.patch('zun.db.etcd.api.EtcdAPI.list_pci_devices')
+    @mock.patch.object(etcd_client, 'read')
+    @mock.patch.object(etcd_client, 'update')
+    @mock.patch.object(etcd_client, 'delete')
+    def test_bulk_update_pci_devices(self, mock_delete, mock_update,
+                                     mock_read, mock_list, mock_create):
+        mock_list.return_value = [
+            models.PciDevice(dict(fake_values, uuid='uuid1', address='a1')),
+            models.PciDevice(dict(fake_values, uuid='uuid2', address='a2'))]
+        mock_read.return_value = mock.Mock(value='{}')
+        self.dbapi.bulk_update_pci_devices(
+            'node1', {'a2': {'status': 'allocated'},
+                      'a3': {'status': 'available'}}, ['a1'])
+        self.assertEqual(1, mock_list.call_count)
+        mock_delete.assert_called_once_with('/pcidevices/uuid1')
+        mock_read.assert_called_once_with('/pcidevices/uuid2')
+        self.assertEqual(1, mock_update.call_count)
+        mock_create.assert_called_once_with(
+            {'status': 'available', 'compute_node_uuid': 'node1',
+             'address': 'a3'})
+
     @mock.patch('zun.db.etcd.api.EtcdAPI.list_pci_devices')
     def test_get_all_pci_device_by_container_uuid(self, mock_list):
         filters = {'container_uuid': 'Id64c317ff78e95af2fc'}
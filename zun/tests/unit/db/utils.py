@@ -138,6 +138,7 @@ def get_test_image(**kwargs):
         'tag': kwargs.get('tag', 'latest'),
         'image_id': kwargs.get('image_id', 'sha256:c54a2cc56cbb2f0400'),
         'size': kwargs.get('size', '1848'),
+        'status': kwargs.get('status'),
         'project_id': kwargs.get('project_id', 'fake_project'),
         'user_id': kwargs.get('user_id', 'fake_user'),
         'created_at': kwargs.get('created_at'),
@@ -327,6 +328,7 @@ def get_test_compute_node(**kwargs):
         'kernel_version': kwargs.get('kernel_version',
                                      '3.10.0-123.el7.x86_64'),
         'labels': kwargs.get('labels', {"dev.type": "product"}),
+        'images': kwargs.get('images', ['cirros:latest']),
         'created_at': kwargs.get('created_at'),
         'updated_at': kwargs.get('updated_at'),
     }
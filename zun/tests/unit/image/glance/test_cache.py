@@ -0,0 +1,114 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import mock
+
+import zun.conf
+from zun.image.glance import cache
+from zun.tests import base
+
+CONF = zun.conf.CONF
+
+
+class TestImageCache(base.BaseTestCase):
+    def setUp(self):
+        super(TestImageCache, self).setUp()
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        self.cache = cache.ImageCache()
+
+    def _add_image(self, image_id, data, repo=None, last_used=None):
+        with self.cache.open_for_write(image_id) as fd:
+            fd.write(data)
+        path = self.cache.get_path(image_id)
+        self.cache.record(path, repo or image_id)
+        if last_used is not None:
+            os.utime(path + cache.META_SUFFIX, (last_used, last_used))
+        return path
+
+    def test_verify_hashes_once(self):
+        data = b'image data'
+        checksum = hashlib.md5(data).hexdigest()
+        path = self._add_image('1234', data)
+        with mock.patch('hashlib.md5', wraps=hashlib.md5) as mock_md5:
+            self.assertTrue(self.cache.verify(path, 'repo', checksum))
+            self.assertTrue(self.cache.verify(path, 'repo', checksum))
+        self.assertEqual(1, mock_md5.call_count)
+        self.assertEqual(checksum, self.cache._read_meta(path)['checksum'])
+
+    def test_verify_checksum_mismatch(self):
+        path = self._add_image('1234', b'image data')
+        self.assertFalse(self.cache.verify(path, 'repo', 'wrong'))
+        self.assertIsNone(self.cache._read_meta(path)['checksum'])
+
+    def test_verify_rehashes_modified_file(self):
+        data = b'image data'
+        checksum = hashlib.md5(data).hexdigest()
+        path = self._add_image('1234', data)
+        self.assertTrue(self.cache.verify(path, 'repo', checksum))
+        with open(path, 'ab') as fd:
+            fd.write(b'corrupted')
+        self.assertFalse(self.cache.verify(path, 'repo', checksum))
+
+    def test_verify_missing_file(self):
+        self.assertFalse(self.cache.verify(self.cache.get_path('1234'),
+                                           'repo', 'xxx'))
+
+    def test_record_loaded(self):
+        self.assertIsNone(self.cache.get_loaded('1234', 'abc'))
+        self.cache.record_loaded('1234', 'repo', 'abc', 'repo:latest')
+        self.assertEqual('repo:latest', self.cache.get_loaded('1234', 'abc'))
+        # A record for different image content is stale.
+        self.assertIsNone(self.cache.get_loaded('1234', 'def'))
+
+    def test_evict_loaded_records(self):
+        CONF.set_override('images_cache_max_size', 1, group='glance')
+        mb = 1024 * 1024
+        self.cache.record_loaded('old', 'old', 'abc', 'old:latest')
+        old = os.path.join(self.test_dir, 'old' + cache.LOADED_SUFFIX)
+        os.utime(old, (100, 100))
+        self.cache.record_loaded('used', 'used', 'abc', 'used:latest')
+        used = os.path.join(self.test_dir, 'used' + cache.LOADED_SUFFIX)
+        os.utime(used, (100, 100))
+        image = self._add_image('image', b'x' * mb, last_used=200)
+        newest = self._add_image('newest', b'x' * (mb // 2), last_used=300)
+
+        evicted = self.cache.evict({'used'}, keep=newest)
+
+        self.assertEqual([old, image], evicted)
+        self.assertEqual('used:latest', self.cache.get_loaded('used', 'abc'))
+
+    def test_evict_unlimited(self):
+        self._add_image('1', b'x' * 1024)
+        self.assertEqual([], self.cache.evict(set()))
+
+    def test_evict_lru(self):
+        CONF.set_override('images_cache_max_size', 1, group='glance')
+        mb = 1024 * 1024
+        old = self._add_image('old', b'x' * (mb // 2), last_used=100)
+        used = self._add_image('used', b'x' * (mb // 2), last_used=200)
+        new = self._add_image('new', b'x' * (mb // 2), last_used=300)
+        newest = self._add_image('newest', b'x' * (mb // 2), last_used=400)
+
+        evicted = self.cache.evict({'used'}, keep=newest)
+
+        self.assertEqual([old, new], evicted)
+        self.assertFalse(os.path.exists(old))
+        self.assertFalse(os.path.exists(old + cache.META_SUFFIX))
+        self.assertTrue(os.path.exists(used))
+        self.assertTrue(os.path.exists(newest))
@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
 import mock
 import os
 import shutil
@@ -19,6 +20,7 @@ import tempfile
 
 from zun.common import exception
 import zun.conf
+from zun.image.glance import cache
 from zun.image.glance import driver
 from zun.tests import base
 
@@ -54,13 +56,28 @@ class TestDriver(base.BaseTestCase):
         mock_should_pull_image.return_value = False
         mock_search.return_value = {'image': 'nginx', 'path': 'xyz',
                                     'checksum': 'xxx'}
-        mock_open_file = mock.mock_open()
-        with mock.patch('zun.image.glance.driver.open', mock_open_file):
+        with mock.patch.object(cache.ImageCache, 'verify',
+                               return_value=False) as mock_verify:
             self.assertEqual(({'image': 'nginx', 'path': 'xyz',
                                'checksum': 'xxx'}, True),
                              self.driver.pull_image(None, 'nonexisting',
                                                     'tag', 'never'))
-        mock_open_file.assert_any_call('xyz', 'rb')
+        mock_verify.assert_called_once_with('xyz', 'nonexisting', 'xxx')
+
+    @mock.patch.object(driver.GlanceDriver,
+                       '_search_image_on_host')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_verified_locally(self, mock_find_image,
+                                         mock_search):
+        image = {'image': 'nginx', 'path': 'xyz', 'checksum': 'xxx'}
+        mock_search.return_value = image
+        with mock.patch.object(cache.ImageCache, 'verify',
+                               return_value=True) as mock_verify:
+            self.assertEqual((image, True),
+                             self.driver.pull_image(None, 'nginx',
+                                                    'tag', 'always'))
+        mock_verify.assert_called_once_with('xyz', 'nginx', 'xxx')
+        self.assertFalse(mock_find_image.called)
 
     @mock.patch.object(driver.GlanceDriver,
                        '_search_image_on_host')
@@ -72,12 +89,11 @@ class TestDriver(base.BaseTestCase):
         mock_should_pull_image.return_value = True
         mock_search.return_value = {'image': 'nginx', 'path': 'xyz',
                                     'checksum': 'xxx'}
-        mock_open_file = mock.mock_open()
-        with mock.patch('zun.image.glance.driver.open', mock_open_file):
-            mock_find_image.side_effect = Exception
+        mock_find_image.side_effect = Exception
+        with mock.patch.object(cache.ImageCache, 'verify',
+                               return_value=False):
             self.assertRaises(exception.ZunException, self.driver.pull_image,
                               None, 'nonexisting', 'tag', 'always')
-        mock_open_file.assert_any_call('xyz', 'rb')
 
     @mock.patch.object(driver.GlanceDriver,
                        '_search_image_on_host')
@@ -91,21 +107,197 @@ class TestDriver(base.BaseTestCase):
                                             'checksum': 'xxx'}
         image_meta = mock.MagicMock()
         image_meta.id = '1234'
+        image_meta.checksum = hashlib.md5(b'content').hexdigest()
         mock_find_image.return_value = image_meta
-        mock_download_image.return_value = 'content'
         CONF.set_override('images_directory', self.test_dir, group='glance')
         out_path = os.path.join(self.test_dir, '1234' + '.tar')
-        mock_open_file = mock.mock_open()
-        with mock.patch('zun.image.glance.driver.open', mock_open_file):
+        mock_download_image.return_value = [b'con', b'tent']
+        with mock.patch.object(cache.ImageCache, 'verify',
+                               return_value=False):
             ret = self.driver.pull_image(None, 'image', 'latest', 'always')
-        mock_open_file.assert_any_call('xyz', 'rb')
-        mock_open_file.assert_any_call(out_path, 'wb')
+        with open(out_path, 'rb') as fd:
+            self.assertEqual(b'content', fd.read())
+        meta = self.driver._cache._read_meta(out_path)
+        self.assertEqual('image', meta['repo'])
+        self.assertEqual(image_meta.checksum, meta['checksum'])
         self.assertTrue(mock_search_on_host.called)
         self.assertTrue(mock_should_pull_image.called)
         self.assertTrue(mock_find_image.called)
         self.assertTrue(mock_download_image.called)
         self.assertEqual(({'image': 'image', 'path': out_path}, False), ret)
 
+    @mock.patch('zun.image.glance.utils.download_image_in_chunks')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_checksum_mismatch(self, mock_find_image,
+                                          mock_download_image):
+        image_meta = mock.MagicMock()
+        image_meta.id = '1234'
+        image_meta.checksum = hashlib.md5(b'content').hexdigest()
+        mock_find_image.return_value = image_meta
+        mock_download_image.return_value = [b'corrupted']
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        self.assertRaises(exception.ZunException, self.driver.pull_image,
+                          None, 'image', 'latest', 'always')
+        self.assertEqual([], os.listdir(self.test_dir))
+
+    @mock.patch('zun.image.glance.utils.download_image_in_chunks')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_stream(self, mock_find_image, mock_download_image):
+        CONF.set_override('stream_images', True, group='glance')
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        image_meta = mock.MagicMock()
+        image_meta.id = '1234'
+        image_meta.checksum = hashlib.md5(b'content').hexdigest()
+        mock_find_image.return_value = image_meta
+        mock_download_image.return_value = iter([b'con', b'tent'])
+        loaded = []
+
+        def fake_load_image(data):
+            loaded.append(data.read())
+            return 'cirros:latest'
+
+        ret = self.driver.pull_image(None, 'image', 'latest', 'always',
+                                     load_image=fake_load_image)
+        self.assertEqual(({'image': 'image', 'path': None,
+                           'loaded_image': 'cirros:latest'}, True), ret)
+        self.assertEqual([b'content'], loaded)
+        # The temporary file is gone once the image is loaded.
+        self.assertEqual(['1234.loaded'], os.listdir(self.test_dir))
+
+    @mock.patch('zun.image.glance.utils.download_image_in_chunks')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_stream_already_loaded(self, mock_find_image,
+                                              mock_download_image):
+        CONF.set_override('stream_images', True, group='glance')
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        image_meta = mock.MagicMock()
+        image_meta.id = '1234'
+        image_meta.checksum = hashlib.md5(b'content').hexdigest()
+        mock_find_image.return_value = image_meta
+        self.driver._cache.record_loaded('1234', 'image',
+                                         image_meta.checksum,
+                                         'cirros:latest')
+        load_image = mock.Mock()
+        image_exists = mock.Mock(return_value=True)
+
+        ret = self.driver.pull_image(None, 'image', 'latest', 'always',
+                                     load_image=load_image,
+                                     image_exists=image_exists)
+        self.assertEqual(({'image': 'image', 'path': None,
+                           'checksum': image_meta.checksum,
+                           'loaded_image': 'cirros:latest'}, True), ret)
+        image_exists.assert_called_once_with('cirros:latest')
+        self.assertFalse(load_image.called)
+        self.assertFalse(mock_download_image.called)
+
+    @mock.patch('zun.image.glance.utils.download_image_in_chunks')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_stream_loaded_image_removed(self, mock_find_image,
+                                                    mock_download_image):
+        CONF.set_override('stream_images', True, group='glance')
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        image_meta = mock.MagicMock()
+        image_meta.id = '1234'
+        image_meta.checksum = hashlib.md5(b'content').hexdigest()
+        mock_find_image.return_value = image_meta
+        mock_download_image.return_value = iter([b'con', b'tent'])
+        self.driver._cache.record_loaded('1234', 'image',
+                                         image_meta.checksum,
+                                         'cirros:latest')
+        self.assertTrue(self.driver._cache.get_loaded('1234',
+                                                      image_meta.checksum))
+        load_image = mock.Mock(return_value='cirros:latest')
+        image_exists = mock.Mock(return_value=False)
+
+        ret = self.driver.pull_image(None, 'image', 'latest', 'always',
+                                     load_image=load_image,
+                                     image_exists=image_exists)
+        self.assertEqual(({'image': 'image', 'path': None,
+                           'loaded_image': 'cirros:latest'}, True), ret)
+        self.assertTrue(load_image.called)
+
+    @mock.patch('zun.image.glance.utils.download_image_in_chunks')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_stream_checksum_mismatch(self, mock_find_image,
+                                                 mock_download_image):
+        CONF.set_override('stream_images', True, group='glance')
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        image_meta = mock.MagicMock()
+        image_meta.id = '1234'
+        image_meta.checksum = hashlib.md5(b'content').hexdigest()
+        mock_find_image.return_value = image_meta
+        mock_download_image.return_value = iter([b'cor', b'rupted'])
+        load_image = mock.Mock()
+
+        self.assertRaises(exception.ImageChecksumMismatch,
+                          self.driver.pull_image, None, 'image', 'latest',
+                          'always', load_image=load_image)
+        # A corrupted image is never handed over to the container driver.
+        self.assertFalse(load_image.called)
+        self.assertEqual(1, mock_download_image.call_count)
+        self.assertEqual([], os.listdir(self.test_dir))
+
+    @mock.patch('zun.image.glance.utils.download_image_in_chunks')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_stream_without_checksum(self, mock_find_image,
+                                                mock_download_image):
+        CONF.set_override('stream_images', True, group='glance')
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        image_meta = mock.MagicMock()
+        image_meta.id = '1234'
+        image_meta.checksum = None
+        mock_find_image.return_value = image_meta
+        mock_download_image.return_value = iter([b'content'])
+        load_image = mock.Mock()
+
+        ret = self.driver.pull_image(None, 'image', 'latest', 'always',
+                                     load_image=load_image)
+        out_path = os.path.join(self.test_dir, '1234.tar')
+        self.assertEqual(({'image': 'image', 'path': out_path}, False), ret)
+        self.assertFalse(load_image.called)
+
+    @mock.patch('zun.image.glance.utils.download_image_in_chunks')
+    @mock.patch('zun.image.glance.utils.find_image')
+    def test_pull_image_stream_fallback(self, mock_find_image,
+                                        mock_download_image):
+        CONF.set_override('stream_images', True, group='glance')
+        CONF.set_override('images_directory', self.test_dir, group='glance')
+        image_meta = mock.MagicMock()
+        image_meta.id = '1234'
+        image_meta.checksum = hashlib.md5(b'content').hexdigest()
+        mock_find_image.return_value = image_meta
+        mock_download_image.side_effect = lambda ctx, img_id: iter(
+            [b'con', b'tent'])
+        load_image = mock.Mock(side_effect=exception.DockerError)
+
+        ret = self.driver.pull_image(None, 'image', 'latest', 'always',
+                                     load_image=load_image)
+        out_path = os.path.join(self.test_dir, '1234.tar')
+        self.assertEqual(({'image': 'image', 'path': out_path}, False), ret)
+        self.assertEqual(2, mock_download_image.call_count)
+
+    @mock.patch('zun.image.glance.utils.find_images')
+    @mock.patch.object(cache.ImageCache, 'evict')
+    @mock.patch('zun.objects.Container.list_by_host')
+    def test_evict_images(self, mock_list, mock_evict, mock_find):
+        CONF.set_override('images_cache_max_size', 1, group='glance')
+        mock_list.return_value = [
+            mock.Mock(image='cirros:latest', image_driver='glance'),
+            mock.Mock(image='busybox', image_driver=None),
+            mock.Mock(image='nginx', image_driver='docker')]
+        self.driver._evict_images(keep='xyz')
+        mock_evict.assert_called_once_with({'cirros', 'busybox'},
+                                           keep='xyz')
+        self.assertFalse(mock_find.called)
+
+    @mock.patch.object(cache.ImageCache, 'evict')
+    @mock.patch('zun.objects.Container.list_by_host')
+    def test_evict_images_list_failed(self, mock_list, mock_evict):
+        CONF.set_override('images_cache_max_size', 1, group='glance')
+        mock_list.side_effect = Exception
+        self.driver._evict_images(keep='xyz')
+        self.assertFalse(mock_evict.called)
+
     @mock.patch('zun.common.utils.should_pull_image')
     def test_pull_image_not_found(self, mock_should_pull_image):
         mock_should_pull_image.return_value = True
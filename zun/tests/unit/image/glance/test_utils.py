@@ -0,0 +1,93 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+import zun.conf
+from zun.image.glance import utils
+from zun.tests import base
+
+CONF = zun.conf.CONF
+
+
+@mock.patch.dict(utils._LOOKUP_CACHE, clear=True)
+@mock.patch.object(utils, 'create_glanceclient')
+class TestFindImages(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestFindImages, self).setUp()
+        self.context = mock.Mock(project_id='fake_project')
+        self.image = mock.Mock(container_format='docker')
+        self.image.name = 'cirros'
+
+    def test_find_images_filters_by_name(self, mock_client):
+        glance = mock_client.return_value
+        glance.images.list.return_value = [self.image]
+        images = utils.find_images(self.context, 'cirros', exact_match=True)
+        self.assertEqual([self.image], images)
+        glance.images.list.assert_called_once_with(
+            filters={'container_format': 'docker', 'name': 'cirros'})
+
+    def test_find_images_not_exact_match(self, mock_client):
+        glance = mock_client.return_value
+        glance.images.list.return_value = [self.image]
+        images = utils.find_images(self.context, 'cir', exact_match=False)
+        self.assertEqual([self.image], images)
+        glance.images.list.assert_called_once_with(
+            filters={'container_format': 'docker'})
+        self.assertEqual({}, utils._LOOKUP_CACHE)
+
+    def test_find_images_cached(self, mock_client):
+        glance = mock_client.return_value
+        glance.images.list.return_value = [self.image]
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        images = utils.find_images(self.context, 'cirros', exact_match=True)
+        self.assertEqual([self.image], images)
+        self.assertEqual(1, glance.images.list.call_count)
+
+        other_context = mock.Mock(project_id='other_project')
+        utils.find_images(other_context, 'cirros', exact_match=True)
+        self.assertEqual(2, glance.images.list.call_count)
+
+    @mock.patch('time.time')
+    def test_find_images_cache_expires(self, mock_time, mock_client):
+        CONF.set_override('image_lookup_cache_ttl', 10, group='glance')
+        glance = mock_client.return_value
+        glance.images.list.return_value = [self.image]
+        mock_time.return_value = 100
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        mock_time.return_value = 111
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        self.assertEqual(2, glance.images.list.call_count)
+
+    def test_find_images_miss_not_cached(self, mock_client):
+        glance = mock_client.return_value
+        glance.images.list.return_value = []
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        self.assertEqual(2, glance.images.list.call_count)
+
+    def test_find_images_cache_disabled(self, mock_client):
+        CONF.set_override('image_lookup_cache_ttl', 0, group='glance')
+        glance = mock_client.return_value
+        glance.images.list.return_value = [self.image]
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        self.assertEqual(2, glance.images.list.call_count)
+
+    def test_upload_invalidates_cache(self, mock_client):
+        glance = mock_client.return_value
+        glance.images.list.return_value = [self.image]
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        utils.upload_image_data(self.context, 'image-id', 'data')
+        utils.find_images(self.context, 'cirros', exact_match=True)
+        self.assertEqual(2, glance.images.list.call_count)
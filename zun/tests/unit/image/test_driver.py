@@ -12,6 +12,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import mock
+
 import zun.conf
 from zun.image import driver
 from zun.tests import base
@@ -31,3 +33,20 @@ class TestDriver(base.BaseTestCase):
     def test_load_image_driver(self):
         CONF.set_override('images_directory', None, group='glance')
         self.assertTrue(driver.load_image_driver, 'glance.GlanceDriver')
+
+    @mock.patch.dict(driver._IMAGE_DRIVERS, clear=True)
+    @mock.patch.object(driver, 'load_image_driver')
+    def test_get_image_driver(self, mock_load):
+        first = driver.get_image_driver('docker')
+        second = driver.get_image_driver('docker')
+        self.assertIs(first, second)
+        mock_load.assert_called_once_with('docker')
+
+    @mock.patch.dict(driver._IMAGE_DRIVERS, clear=True)
+    @mock.patch.object(driver, 'load_image_driver')
+    def test_init_image_drivers(self, mock_load):
+        CONF.set_override('image_driver_list', ['glance', 'docker'])
+        driver.init_image_drivers()
+        self.assertEqual(['docker', 'glance'],
+                         sorted(driver._IMAGE_DRIVERS.keys()))
+        self.assertEqual(2, mock_load.call_count)
@@ -118,6 +118,18 @@ class TestComputeNodeObject(base.DbTestCase):
                     {'hostname': 'myhostname'})
                 self.assertEqual(self.context, compute_node._context)
 
+    def test_save_without_changes(self):
+        uuid = self.fake_compute_node['uuid']
+        with mock.patch.object(self.dbapi, 'get_compute_node',
+                               autospec=True) as mock_get:
+            mock_get.return_value = self.fake_compute_node
+            with mock.patch.object(self.dbapi, 'update_compute_node',
+                                   autospec=True) as mock_update:
+                compute_node = objects.ComputeNode.get_by_uuid(
+                    self.context, uuid)
+                compute_node.save()
+                self.assertFalse(mock_update.called)
+
     def test_refresh(self):
         uuid = self.fake_compute_node['uuid']
         hostname = self.fake_compute_node['hostname']
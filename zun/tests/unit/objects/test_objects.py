@@ -346,7 +346,7 @@ class TestObject(test_base.TestCase, _TestObject):
 object_data = {
     'Container': '1.23-4469205888f8aec51af98375eef6b81a',
     'VolumeMapping': '1.1-50df6202f7846a136a91444c38eba841',
-    'Image': '1.0-0b976be24f4f6ee0d526e5c981ce0633',
+    'Image': '1.1-4c29350d403410364850d5e92098f567',
     'MyObj': '1.0-34c4b1aadefd177b13f9a2f894cc23cd',
     'NUMANode': '1.0-cba878b70b2f8b52f1e031b41ac13b4e',
     'NUMATopology': '1.0-b54086eda7e4b2e6145ecb6ee2c925ab',
@@ -355,7 +355,7 @@ object_data = {
     'ZunService': '1.1-b1549134bfd5271daec417ca8cabc77e',
     'Capsule': '1.3-f4c6b8fede0fa9488fc4f77b97601654',
     'PciDevice': '1.1-6e3f0851ad1cf12583e6af4df1883979',
-    'ComputeNode': '1.9-e8536102d3b28cb3378e9e26f508cd72',
+    'ComputeNode': '1.10-8a897aad0e2b6573db037800425f0c43',
     'PciDevicePool': '1.0-3f5ddc3ff7bfa14da7f6c7e9904cc000',
     'PciDevicePoolList': '1.0-15ecf022a68ddbb8c2a6739cfc9f8f5e',
     'ContainerPCIRequest': '1.0-b060f9f9f734bedde79a71a4d3112ee0',
@@ -104,14 +104,10 @@ class PciDevTrackerTestCase(base.DbTestCase):
     def _fake_get_pci_devices(self, node_id):
                 return self.fake_devs
 
-    def _fake_pci_device_update(self, node_id, address, value):
-        self.update_called += 1
-        self.called_values = value
-        fake_return = copy.deepcopy(fake_db_dev)
-        return fake_return
-
-    def _fake_pci_device_destroy(self, node_id, address):
-        self.destroy_called += 1
+    def _fake_pci_devices_bulk_update(self, node_id, updates, deletes):
+        self.bulk_update_called += 1
+        self.updated = dict(updates)
+        self.deleted = list(deletes)
 
     def _create_tracker(self, fake_devs):
         self.fake_devs = fake_devs
@@ -274,26 +270,31 @@ class PciDevTrackerTestCase(base.DbTestCase):
         self.assertEqual(vfs[0].parent_device, pf)
 
     def test_save(self):
-        self.stub_out('zun.db.api.update_pci_device',
-                      self._fake_pci_device_update)
+        self.stub_out('zun.db.api.bulk_update_pci_devices',
+                      self._fake_pci_devices_bulk_update)
         fake_pci_v3 = dict(fake_pci, address='0000:00:00.2', vendor_id='v3')
         fake_pci_devs = [copy.deepcopy(fake_pci), copy.deepcopy(fake_pci_2),
                          copy.deepcopy(fake_pci_v3)]
         self.tracker._set_hvdevs(fake_pci_devs)
-        self.update_called = 0
+        self.bulk_update_called = 0
+        self.tracker.save()
+        self.assertEqual(1, self.bulk_update_called)
+        self.assertEqual(3, len(self.updated))
+        self.assertEqual([], self.deleted)
+
+        # Nothing changed since the last save.
         self.tracker.save()
-        self.assertEqual(self.update_called, 3)
+        self.assertEqual(1, self.bulk_update_called)
 
     def test_save_removed(self):
-        self.stub_out('zun.db.api.update_pci_device',
-                      self._fake_pci_device_update)
-        self.stub_out('zun.db.api.destroy_pci_device',
-                      self._fake_pci_device_destroy)
+        self.stub_out('zun.db.api.bulk_update_pci_devices',
+                      self._fake_pci_devices_bulk_update)
         self.assertEqual(len(self.tracker.pci_devs), 3)
         dev = self.tracker.pci_devs[0]
-        self.destroy_called = 0
-        self.update_called = 0
+        self.bulk_update_called = 0
         dev.remove()
         self.tracker.save()
         self.assertEqual(len(self.tracker.pci_devs), 2)
-        self.assertEqual(self.destroy_called, 1)
+        self.assertEqual(1, self.bulk_update_called)
+        self.assertEqual([dev.address], self.deleted)
+        self.assertNotIn(dev.address, self.tracker.pci_devs_by_addr)
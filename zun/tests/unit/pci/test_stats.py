@@ -118,6 +118,64 @@ class PciDeviceStatsTestCase(base.TestCase):
         self.assertEqual(set([d['vendor_id'] for d in new_stats]),
                          set(['v1', 'v2', 'v3']))
 
+    def test_support_requests(self):
+        requests = [objects.ContainerPCIRequest(count=1,
+                    spec=[{'vendor_id': 'v1'}]),
+                    objects.ContainerPCIRequest(count=1,
+                    spec=[{'vendor_id': 'v2'}])]
+        self.assertTrue(self.pci_stats.support_requests(requests))
+        self.assertEqual(3, len(self.pci_stats.pools))
+        self.assertEqual(set([1, 2]),
+                         set([d['count'] for d in self.pci_stats]))
+
+    def test_support_requests_failed(self):
+        requests = [objects.ContainerPCIRequest(count=2,
+                    spec=[{'vendor_id': 'v2'}])]
+        self.assertFalse(self.pci_stats.support_requests(requests))
+
+    def test_support_requests_numa(self):
+        cells = [objects.NUMANode(id=1, cpuset=set(), pinned_cpus=set())]
+        requests = [objects.ContainerPCIRequest(count=1,
+                    spec=[{'vendor_id': 'v1'}])]
+        self.assertFalse(self.pci_stats.support_requests(requests, cells))
+        requests = [objects.ContainerPCIRequest(count=1,
+                    spec=[{'vendor_id': 'v2'}])]
+        self.assertTrue(self.pci_stats.support_requests(requests, cells))
+
+    def test_apply_requests(self):
+        requests = [objects.ContainerPCIRequest(count=1,
+                    spec=[{'vendor_id': 'v1'}]),
+                    objects.ContainerPCIRequest(count=1,
+                    spec=[{'vendor_id': 'v2'}])]
+        self.pci_stats.apply_requests(requests)
+        self.assertEqual(2, len(self.pci_stats.pools))
+        self.assertEqual(set([1]),
+                         set([d['count'] for d in self.pci_stats]))
+
+        # The pool of v2 is gone, so the same spec no longer matches.
+        self.assertFalse(self.pci_stats.support_requests(requests))
+
+    def test_apply_requests_failed(self):
+        requests = [objects.ContainerPCIRequest(count=1,
+                    spec=[{'vendor_id': 'v1'}]),
+                    objects.ContainerPCIRequest(count=2,
+                    spec=[{'vendor_id': 'v2'}])]
+        self.assertRaises(exception.PciDeviceRequestFailed,
+                          self.pci_stats.apply_requests,
+                          requests)
+        # Nothing is consumed when a request cannot be met.
+        self.assertEqual(set([1, 2]),
+                         set([d['count'] for d in self.pci_stats]))
+
+    def test_add_device_new_pool_matches_spec(self):
+        requests = [objects.ContainerPCIRequest(count=1,
+                    spec=[{'product_id': 'p5'}])]
+        self.assertFalse(self.pci_stats.support_requests(requests))
+        dev = objects.PciDevice.create(
+            None, dict(fake_pci_1, product_id='p5', address='0000:00:00.5'))
+        self.pci_stats.add_device(dev)
+        self.assertTrue(self.pci_stats.support_requests(requests))
+
     @mock.patch(
         'zun.pci.whitelist.Whitelist._parse_white_list_from_config')
     def test_white_list_parsing(self, mock_whitelist_parse):
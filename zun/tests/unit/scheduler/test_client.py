@@ -45,3 +45,30 @@ class SchedulerClientTestCase(base.TestCase):
         fake_args = ['ctxt', 'fake_containers', 'fake_extra_spec']
         self.client.select_destinations(*fake_args)
         mock_select_destinations.assert_called_once_with(*fake_args)
+
+    @mock.patch('zun.scheduler.rpcapi.API.select_destinations')
+    def test_select_destinations_with_scheduler_service(
+            self, mock_select_destinations):
+        CONF.set_override('use_scheduler_service', True, group='scheduler')
+        client = self.client_cls()
+        self.assertIsNone(client.driver)
+        fake_args = ['ctxt', 'fake_containers', 'fake_extra_spec']
+        client.select_destinations(*fake_args)
+        mock_select_destinations.assert_called_once_with(*fake_args)
+
+    @mock.patch('zun.scheduler.rpcapi.API.update_compute_node')
+    def test_update_resource_with_scheduler_service(self,
+                                                    mock_update_node):
+        CONF.set_override('use_scheduler_service', True, group='scheduler')
+        client = self.client_cls()
+        node = mock.Mock(hostname='fake-host')
+        node.obj_get_changes.return_value = {'mem_used': 512}
+        client.update_resource(node)
+        node.save.assert_called_once_with()
+        mock_update_node.assert_called_once_with(
+            mock.ANY, 'fake-host', {'mem_used': 512})
+
+        # Nothing is sent when the node did not change.
+        node.obj_get_changes.return_value = {}
+        client.update_resource(node)
+        self.assertEqual(1, mock_update_node.call_count)
@@ -58,9 +58,11 @@ class FilterSchedulerTestCase(base.TestCase):
         node1.mem_total = 1024 * 128
         node1.mem_used = 1024 * 4
         node1.mem_free = 1024 * 124
+        node1.total_containers = 0
         node1.hostname = 'host1'
         node1.numa_topology = None
         node1.labels = {}
+        node1.images = []
         node1.pci_device_pools = None
         node2 = objects.ComputeNode(self.context)
         node2.cpus = 48
@@ -68,9 +70,11 @@ class FilterSchedulerTestCase(base.TestCase):
         node2.mem_total = 1024 * 128
         node2.mem_used = 1024 * 4
         node2.mem_free = 1024 * 124
+        node2.total_containers = 0
         node2.hostname = 'host2'
         node2.numa_topology = None
         node2.labels = {}
+        node2.images = []
         node2.pci_device_pools = None
         node3 = objects.ComputeNode(self.context)
         node3.cpus = 48
@@ -78,9 +82,11 @@ class FilterSchedulerTestCase(base.TestCase):
         node3.mem_total = 1024 * 128
         node3.mem_used = 1024 * 4
         node3.mem_free = 1024 * 124
+        node3.total_containers = 0
         node3.hostname = 'host3'
         node3.numa_topology = None
         node3.labels = {}
+        node3.images = []
         node3.pci_device_pools = None
         node4 = objects.ComputeNode(self.context)
         node4.cpus = 48
@@ -88,9 +94,11 @@ class FilterSchedulerTestCase(base.TestCase):
         node4.mem_total = 1024 * 128
         node4.mem_used = 1024 * 4
         node4.mem_free = 1024 * 124
+        node4.total_containers = 0
         node4.hostname = 'host4'
         node4.numa_topology = None
         node4.labels = {}
+        node4.images = []
         node4.pci_device_pools = None
         nodes = [node1, node2, node3, node4]
         mock_compute_list.return_value = nodes
@@ -127,3 +135,90 @@ class FilterSchedulerTestCase(base.TestCase):
         self.assertRaises(exception.NoValidHost,
                           self.driver.select_destinations, self.context,
                           containers, extra_spec)
+
+    def _fake_node(self, hostname, mem_used):
+        node = objects.ComputeNode(self.context)
+        node.cpus = 48
+        node.cpu_used = 0.0
+        node.mem_total = 1024
+        node.mem_used = mem_used
+        node.mem_free = 1024 - mem_used
+        node.total_containers = 0
+        node.hostname = hostname
+        node.numa_topology = None
+        node.labels = {}
+        node.images = []
+        node.pci_device_pools = None
+        return node
+
+    @mock.patch.object(servicegroup.ServiceGroup, 'service_is_up',
+                       mock.Mock(return_value=True))
+    @mock.patch.object(objects.ComputeNode, 'list')
+    @mock.patch.object(objects.ZunService, 'list_by_binary')
+    @mock.patch('random.choice')
+    def test_select_destinations_consumes_resources(self, mock_random_choice,
+                                                    mock_list_by_binary,
+                                                    mock_compute_list):
+        mock_list_by_binary.return_value = [FakeService('service1', 'host1'),
+                                            FakeService('service2', 'host2')]
+        mock_compute_list.return_value = [self._fake_node('host1', 512),
+                                          self._fake_node('host2', 0)]
+        mock_random_choice.side_effect = lambda hosts: hosts[0]
+        containers = [objects.Container(self.context,
+                                        **utils.get_test_container(
+                                            memory='512M'))
+                      for i in range(3)]
+
+        dests = self.driver.select_destinations(self.context, containers, {})
+
+        # The containers are spread over the hosts, and host1 only has room
+        # for one of them.
+        self.assertEqual(['host2', 'host1', 'host2'],
+                         [dest['host'] for dest in dests])
+        self.assertEqual(1, mock_compute_list.call_count)
+
+    @mock.patch.object(servicegroup.ServiceGroup, 'service_is_up',
+                       mock.Mock(return_value=True))
+    @mock.patch.object(objects.ComputeNode, 'list')
+    @mock.patch.object(objects.ZunService, 'list_by_binary')
+    def test_select_destinations_partial_failure(self, mock_list_by_binary,
+                                                 mock_compute_list):
+        mock_list_by_binary.return_value = [FakeService('service1', 'host1')]
+        mock_compute_list.return_value = [self._fake_node('host1', 512)]
+        containers = [objects.Container(self.context,
+                                        **utils.get_test_container(
+                                            memory='512M'))
+                      for i in range(2)]
+
+        with mock.patch.object(self.driver.host_manager,
+                               'reset') as mock_reset:
+            self.assertRaises(exception.NoValidHost,
+                              self.driver.select_destinations, self.context,
+                              containers, {})
+        mock_reset.assert_called_once_with()
+
+    @mock.patch.object(servicegroup.ServiceGroup, 'service_is_up',
+                       mock.Mock(return_value=True))
+    @mock.patch.object(objects.ComputeNode, 'list')
+    @mock.patch.object(objects.ZunService, 'list_by_binary')
+    @mock.patch('random.choice')
+    def test_select_destinations_host_subset_size(self, mock_random_choice,
+                                                  mock_list_by_binary,
+                                                  mock_compute_list):
+        self.config(host_subset_size=2, group='scheduler')
+        mock_list_by_binary.return_value = [FakeService('service1', 'host1'),
+                                            FakeService('service2', 'host2'),
+                                            FakeService('service3', 'host3')]
+        mock_compute_list.return_value = [self._fake_node('host1', 512),
+                                          self._fake_node('host2', 0),
+                                          self._fake_node('host3', 256)]
+        mock_random_choice.side_effect = lambda hosts: hosts[-1]
+        containers = [objects.Container(self.context,
+                                        **utils.get_test_container())]
+
+        dests = self.driver.select_destinations(self.context, containers, {})
+
+        self.assertEqual('host3', dests[0]['host'])
+        hosts = mock_random_choice.call_args[0][0]
+        self.assertEqual(['host2', 'host3'],
+                         [host.hostname for host in hosts])
@@ -0,0 +1,176 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import mock
+from oslo_utils import timeutils
+
+from zun.common import context
+import zun.conf
+from zun import objects
+from zun.scheduler import host_manager
+from zun.tests import base
+from zun.tests.unit.db import utils
+from zun.tests.unit.scheduler.fakes import FakeService
+
+CONF = zun.conf.CONF
+
+
+def _fake_node(hostname, updated_at, mem_used=1024):
+    node = objects.ComputeNode()
+    node.hostname = hostname
+    node.cpus = 8
+    node.cpu_used = 0.0
+    node.mem_total = 1024 * 8
+    node.mem_used = mem_used
+    node.mem_free = node.mem_total - mem_used
+    node.total_containers = 0
+    node.numa_topology = None
+    node.labels = {}
+    node.images = []
+    node.pci_device_pools = None
+    node.created_at = datetime.datetime(2018, 1, 1)
+    node.updated_at = updated_at
+    return node
+
+
+class HostManagerTestCase(base.TestCase):
+
+    def setUp(self):
+        super(HostManagerTestCase, self).setUp()
+        self.context = context.RequestContext('fake_user', 'fake_project')
+        self.host_manager = host_manager.HostManager()
+        self.t1 = datetime.datetime(2018, 1, 1, 0, 0, 1)
+        self.t2 = datetime.datetime(2018, 1, 1, 0, 0, 2)
+        self.now = datetime.datetime(2018, 1, 1, 0, 1, 0)
+        p = mock.patch.object(timeutils, 'utcnow', return_value=self.now)
+        p.start()
+        self.addCleanup(p.stop)
+        p = mock.patch.object(objects.ZunService, 'list_by_binary')
+        self.mock_services = p.start()
+        self.addCleanup(p.stop)
+        self.mock_services.return_value = [FakeService('service1', 'host1'),
+                                           FakeService('service2', 'host2')]
+        p = mock.patch.object(objects.ComputeNode, 'list')
+        self.mock_nodes = p.start()
+        self.addCleanup(p.stop)
+        self.mock_nodes.return_value = [_fake_node('host1', self.t1),
+                                        _fake_node('host2', self.t1),
+                                        _fake_node('host3', self.t1)]
+
+    def _get_states(self):
+        states = self.host_manager.get_all_host_states(self.context)
+        return {state.hostname: state for state in states}
+
+    def test_get_all_host_states(self):
+        states = self._get_states()
+        # host3 does not run a compute service.
+        self.assertEqual(set(['host1', 'host2']), set(states))
+        self.assertEqual('host1', states['host1'].service.host)
+        self.mock_nodes.assert_called_once_with(self.context)
+
+    def test_states_are_reused(self):
+        CONF.set_override('host_state_refresh_interval', 600,
+                          group='scheduler')
+        states = self._get_states()
+        self.assertEqual(states, self._get_states())
+        self.assertEqual(1, self.mock_nodes.call_count)
+        self.assertEqual(1, self.mock_services.call_count)
+
+    def test_incremental_refresh(self):
+        CONF.set_override('host_state_refresh_interval', 0,
+                          group='scheduler')
+        states = self._get_states()
+        states['host1'].mem_used += 512
+        states['host2'].mem_used += 512
+
+        # Only host2 changed since the last refresh. host1 is listed again
+        # within the margin, but its fields did not change.
+        self.mock_nodes.return_value = [_fake_node('host1', self.t1),
+                                        _fake_node('host2', self.t2, 2048)]
+        new_states = self._get_states()
+        self.mock_nodes.assert_called_with(
+            self.context,
+            filters={'updated_since': self.now - datetime.timedelta(
+                seconds=CONF.scheduler.host_state_refresh_margin)})
+        self.assertIs(states['host1'], new_states['host1'])
+        self.assertEqual(1024 + 512, new_states['host1'].mem_used)
+        self.assertEqual(2048, new_states['host2'].mem_used)
+
+    def test_incremental_refresh_same_updated_at(self):
+        CONF.set_override('host_state_refresh_interval', 0,
+                          group='scheduler')
+        states = self._get_states()
+        states['host1'].mem_used += 512
+
+        # The timestamps are too coarse to tell the updates apart.
+        self.mock_nodes.return_value = [_fake_node('host1', self.t1, 2048)]
+        states = self._get_states()
+        self.assertEqual(2048, states['host1'].mem_used)
+
+    def test_refresh_margin(self):
+        CONF.set_override('host_state_refresh_interval', 0,
+                          group='scheduler')
+        CONF.set_override('host_state_refresh_margin', 0, group='scheduler')
+        self._get_states()
+        self._get_states()
+        self.mock_nodes.assert_called_with(
+            self.context, filters={'updated_since': self.now})
+
+    def test_full_refresh_at_max_age(self):
+        CONF.set_override('host_state_refresh_interval', 0,
+                          group='scheduler')
+        CONF.set_override('host_state_max_age', 0, group='scheduler')
+        self._get_states()
+        self.mock_nodes.return_value = [_fake_node('host1', self.t1)]
+        states = self._get_states()
+        self.assertEqual(set(['host1']), set(states))
+        self.mock_nodes.assert_called_with(self.context)
+
+    def test_reset(self):
+        CONF.set_override('host_state_refresh_interval', 0,
+                          group='scheduler')
+        states = self._get_states()
+        states['host1'].mem_used += 512
+        self.host_manager.reset()
+        states = self._get_states()
+        self.mock_nodes.assert_called_with(self.context)
+        self.assertEqual(1024, states['host1'].mem_used)
+
+    def test_update_compute_node(self):
+        CONF.set_override('host_state_refresh_interval', 600,
+                          group='scheduler')
+        self._get_states()
+        self.host_manager.update_compute_node(
+            'host1', {'mem_used': 2048, 'images': ['cirros:latest'],
+                      'uuid': 'ignored'})
+        # Unknown hosts are loaded by the next full refresh.
+        self.host_manager.update_compute_node('host4', {'mem_used': 2048})
+        states = self._get_states()
+        self.assertEqual(2048, states['host1'].mem_used)
+        self.assertTrue(states['host1'].has_image('cirros'))
+        self.assertEqual(1024, states['host2'].mem_used)
+        self.assertNotIn('host4', states)
+        self.assertEqual(1, self.mock_nodes.call_count)
+
+    def test_consume_from_request(self):
+        states = self._get_states()
+        container = objects.Container(self.context,
+                                      **utils.get_test_container(
+                                          memory='512M', cpu=1.5))
+        states['host1'].consume_from_request(container, {})
+        self.assertEqual(1024 + 512, states['host1'].mem_used)
+        self.assertEqual(1024 * 7 - 512, states['host1'].mem_free)
+        self.assertEqual(1.5, states['host1'].cpu_used)
+        self.assertTrue(states['host1'].has_image('ubuntu'))
+        self.assertFalse(states['host2'].has_image('ubuntu'))
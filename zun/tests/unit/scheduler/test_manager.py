@@ -0,0 +1,47 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+import zun.conf
+from zun.scheduler import manager
+from zun.tests import base
+from zun.tests.unit.scheduler import fakes
+
+CONF = zun.conf.CONF
+
+
+class SchedulerManagerTestCase(base.TestCase):
+
+    def setUp(self):
+        super(SchedulerManagerTestCase, self).setUp()
+        CONF.set_override('driver', 'fake_scheduler', group='scheduler')
+        self.manager = manager.Manager()
+
+    def test_init_loads_driver(self):
+        self.assertIsInstance(self.manager.driver, fakes.FakeScheduler)
+
+    def test_select_destinations(self):
+        with mock.patch.object(self.manager.driver,
+                               'select_destinations') as mock_select:
+            dests = self.manager.select_destinations(
+                self.context, ['fake_container'], {})
+        mock_select.assert_called_once_with(self.context, ['fake_container'],
+                                            {})
+        self.assertEqual(mock_select.return_value, dests)
+
+    def test_update_compute_node(self):
+        with mock.patch.object(self.manager.driver,
+                               'update_compute_node') as mock_update:
+            self.manager.update_compute_node(self.context, 'fake-host',
+                                             {'mem_used': 512})
+        mock_update.assert_called_once_with('fake-host', {'mem_used': 512})
@@ -0,0 +1,40 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from zun.scheduler import rpcapi
+from zun.tests import base
+
+
+class TestAPI(base.TestCase):
+
+    def setUp(self):
+        super(TestAPI, self).setUp()
+        self.scheduler_rpcapi = rpcapi.API()
+
+    @mock.patch('zun.common.rpc_service.API._call')
+    def test_select_destinations(self, mock_rpc_call):
+        self.scheduler_rpcapi.select_destinations(
+            self.context, ['fake_container'], {'hints': None})
+        mock_rpc_call.assert_called_once_with(
+            self.context, None, 'select_destinations',
+            containers=['fake_container'], extra_spec={'hints': None})
+
+    def test_update_compute_node(self):
+        with mock.patch.object(self.scheduler_rpcapi, '_client') as client:
+            self.scheduler_rpcapi.update_compute_node(
+                self.context, 'fake-host', {'mem_used': 512})
+        client.prepare.assert_called_once_with(fanout=True)
+        client.prepare.return_value.cast.assert_called_once_with(
+            self.context, 'update_compute_node', hostname='fake-host',
+            changes={'mem_used': 512})
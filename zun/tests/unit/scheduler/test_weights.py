@@ -0,0 +1,69 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+Tests For Scheduler weighing support.
+"""
+
+from zun.scheduler import base_weights
+from zun.scheduler import weights
+from zun.tests import base
+from zun.tests.unit.scheduler import fakes
+
+
+class FakeWeigher(weights.BaseHostWeigher):
+    def __init__(self, multiplier=1.0):
+        self.multiplier = multiplier
+
+    def weight_multiplier(self):
+        return self.multiplier
+
+    def _weigh_object(self, host_state, container, extra_spec):
+        return host_state.mem_total
+
+
+class TestWeighedObject(base.TestCase):
+
+    def test_normalize(self):
+        self.assertEqual((), base_weights.normalize([]))
+        self.assertEqual([0, 0, 0], base_weights.normalize([5, 5, 5]))
+        self.assertEqual([0.0, 0.5, 1.0],
+                         base_weights.normalize([1, 2, 3]))
+        self.assertEqual([0.5, 0.75, 1.0],
+                         base_weights.normalize([2, 3, 4], minval=0))
+        self.assertEqual([0.0, 0.25, 0.5],
+                         base_weights.normalize([0, 1, 2], maxval=4))
+
+    def test_all_weighers(self):
+        classes = weights.all_weighers()
+        class_names = [cls.__name__ for cls in classes]
+        self.assertIn('RAMWeigher', class_names)
+        self.assertIn('CPUWeigher', class_names)
+        self.assertIn('ContainerCountWeigher', class_names)
+        self.assertIn('LabelWeigher', class_names)
+        self.assertIn('ImageWeigher', class_names)
+
+    def test_get_weighed_objects(self):
+        hosts = [fakes.FakeHostState('host1', {'mem_total': 1024}),
+                 fakes.FakeHostState('host2', {'mem_total': 3072}),
+                 fakes.FakeHostState('host3', {'mem_total': 2048})]
+        weighers = [FakeWeigher(2.0), FakeWeigher(-1.0), FakeWeigher(0)]
+        weighed_hosts = weights.HostWeightHandler().get_weighed_objects(
+            weighers, hosts, None, {})
+        self.assertEqual(['host2', 'host3', 'host1'],
+                         [w.obj.hostname for w in weighed_hosts])
+        self.assertEqual([1.0, 0.5, 0.0],
+                         [w.weight for w in weighed_hosts])
+        self.assertIsInstance(weighed_hosts[0], weights.WeighedHost)
+
+    def test_get_weighed_objects_no_hosts(self):
+        self.assertEqual([], weights.HostWeightHandler().get_weighed_objects(
+            [FakeWeigher()], [], None, {}))
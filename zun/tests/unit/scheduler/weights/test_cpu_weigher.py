@@ -0,0 +1,51 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from zun.common import context
+import zun.conf
+from zun import objects
+from zun.scheduler import weights
+from zun.scheduler.weights import cpu
+from zun.tests import base
+from zun.tests.unit.scheduler import fakes
+
+CONF = zun.conf.CONF
+
+
+class TestCPUWeigher(base.TestCase):
+
+    def setUp(self):
+        super(TestCPUWeigher, self).setUp()
+        self.context = context.RequestContext('fake_user', 'fake_project')
+        self.weight_handler = weights.HostWeightHandler()
+        self.weighers = [cpu.CPUWeigher()]
+        self.container = objects.Container(self.context)
+
+    def _get_weighed_hosts(self):
+        hosts = [
+            fakes.FakeHostState('host1', {'cpus': 8, 'cpu_used': 6.0}),
+            fakes.FakeHostState('host2', {'cpus': 8, 'cpu_used': 0.0}),
+        ]
+        return self.weight_handler.get_weighed_objects(
+            self.weighers, hosts, self.container, {})
+
+    def test_default_of_spreading_first(self):
+        weighed_hosts = self._get_weighed_hosts()
+        self.assertEqual(['host2', 'host1'],
+                         [w.obj.hostname for w in weighed_hosts])
+        self.assertEqual([1.0, 0.25], [w.weight for w in weighed_hosts])
+
+    def test_cpu_weigher_multiplier_negative(self):
+        CONF.set_override('cpu_weight_multiplier', -1.0, group='scheduler')
+        weighed_hosts = self._get_weighed_hosts()
+        self.assertEqual(['host1', 'host2'],
+                         [w.obj.hostname for w in weighed_hosts])
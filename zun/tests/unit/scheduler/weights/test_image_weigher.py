@@ -0,0 +1,54 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from zun.common import context
+import zun.conf
+from zun import objects
+from zun.scheduler import weights
+from zun.scheduler.weights import image
+from zun.tests import base
+from zun.tests.unit.scheduler import fakes
+
+CONF = zun.conf.CONF
+
+
+class TestImageWeigher(base.TestCase):
+
+    def setUp(self):
+        super(TestImageWeigher, self).setUp()
+        self.context = context.RequestContext('fake_user', 'fake_project')
+        self.weight_handler = weights.HostWeightHandler()
+        self.weighers = [image.ImageWeigher()]
+        self.hosts = [
+            fakes.FakeHostState('host1', {'images': {'ubuntu:16.04'}}),
+            fakes.FakeHostState('host2', {'images': {'cirros:latest'}}),
+        ]
+
+    def _get_weighed_hosts(self, image_ref):
+        container = objects.Container(self.context, image=image_ref)
+        return self.weight_handler.get_weighed_objects(
+            self.weighers, self.hosts, container, {})
+
+    def test_hosts_with_the_image_win(self):
+        weighed_hosts = self._get_weighed_hosts('cirros')
+        self.assertEqual(['host2', 'host1'],
+                         [w.obj.hostname for w in weighed_hosts])
+        self.assertEqual([1.0, 0.0], [w.weight for w in weighed_hosts])
+
+    def test_image_missing_everywhere(self):
+        weighed_hosts = self._get_weighed_hosts('ubuntu:18.04')
+        self.assertEqual([0.0, 0.0], [w.weight for w in weighed_hosts])
+
+    def test_image_weigher_multiplier_zero(self):
+        CONF.set_override('image_weight_multiplier', 0, group='scheduler')
+        weighed_hosts = self._get_weighed_hosts('cirros')
+        self.assertEqual([0.0, 0.0], [w.weight for w in weighed_hosts])
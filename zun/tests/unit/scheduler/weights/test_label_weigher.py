@@ -0,0 +1,53 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from zun.common import context
+from zun import objects
+from zun.scheduler import weights
+from zun.scheduler.weights import label
+from zun.tests import base
+from zun.tests.unit.scheduler import fakes
+
+
+class TestLabelWeigher(base.TestCase):
+
+    def setUp(self):
+        super(TestLabelWeigher, self).setUp()
+        self.context = context.RequestContext('fake_user', 'fake_project')
+        self.weight_handler = weights.HostWeightHandler()
+        self.weighers = [label.LabelWeigher()]
+        self.container = objects.Container(self.context)
+        self.hosts = [
+            fakes.FakeHostState('host1', {'labels': {'type': 'ssd'}}),
+            fakes.FakeHostState('host2', {'labels': {'type': 'ssd',
+                                                     'zone': 'a'}}),
+            fakes.FakeHostState('host3', {'labels': None}),
+        ]
+
+    def _get_weighed_hosts(self, hints):
+        extra_spec = {'hints': hints}
+        return self.weight_handler.get_weighed_objects(
+            self.weighers, self.hosts, self.container, extra_spec)
+
+    def test_hosts_with_more_labels_win(self):
+        weighed_hosts = self._get_weighed_hosts({'label:type': 'ssd',
+                                                 'label:zone': 'a',
+                                                 'other': 'hint'})
+        self.assertEqual(['host2', 'host1', 'host3'],
+                         [w.obj.hostname for w in weighed_hosts])
+        self.assertEqual([1.0, 0.5, 0.0],
+                         [w.weight for w in weighed_hosts])
+
+    def test_no_label_hints(self):
+        weighed_hosts = self._get_weighed_hosts(None)
+        self.assertEqual([0.0, 0.0, 0.0],
+                         [w.weight for w in weighed_hosts])
@@ -0,0 +1,106 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+
+import mock
+from oslo_utils import timeutils
+
+import zun.conf
+from zun import objects
+from zun.service import periodic
+from zun.tests import base
+from zun.tests.unit.db import utils
+
+CONF = zun.conf.CONF
+
+
+class TestContainerStateSyncPeriodicJob(base.TestCase):
+
+    def setUp(self):
+        super(TestContainerStateSyncPeriodicJob, self).setUp()
+        self.job = periodic.ContainerStateSyncPeriodicJob(CONF)
+        self.job.driver = mock.MagicMock()
+        self.job.event_watcher = mock.MagicMock(connected=True)
+
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    @mock.patch.object(objects.Capsule, 'list')
+    @mock.patch.object(objects.Container, 'list_by_host')
+    def test_sync_container_state(self, mock_list_by_host,
+                                  mock_capsule_list, mock_get_container):
+        container = objects.Container(
+            self.context, **utils.get_test_container(host=CONF.host))
+        mock_list_by_host.return_value = [container]
+        capsule = objects.Capsule(self.context, **utils.get_test_capsule(
+            host=CONF.host, containers_uuids=['sandbox-uuid',
+                                              container.uuid]))
+        moved = objects.Capsule(self.context, **utils.get_test_capsule(
+            host=CONF.host, containers_uuids=['sandbox-uuid', 'moved-uuid']))
+        mock_capsule_list.return_value = [capsule, moved]
+        mock_get_container.return_value = objects.Container(
+            self.context, **utils.get_test_container(host='other-host'))
+
+        with mock.patch.object(objects.Capsule, 'save') as mock_save:
+            self.job.sync_container_state(self.context)
+            mock_save.assert_called_once_with(self.context)
+
+        mock_list_by_host.assert_called_once_with(self.context, CONF.host)
+        self.job.driver.update_containers_states.assert_called_once_with(
+            self.context, [container])
+        mock_capsule_list.assert_called_once_with(
+            self.context, filters={'host': CONF.host})
+        # Only the container which is not on this host is loaded.
+        mock_get_container.assert_called_once_with(self.context,
+                                                   'moved-uuid')
+        self.assertEqual(CONF.host, capsule.host)
+        self.assertEqual('other-host', moved.host)
+
+    def test_full_sync_needed_without_watcher(self):
+        self.job.event_watcher = None
+        self.job._last_full_sync = timeutils.utcnow()
+        self.assertTrue(self.job._full_sync_needed())
+
+    def test_full_sync_needed_with_watcher(self):
+        now = timeutils.utcnow()
+        self.job.event_watcher.connected_since = now - datetime.timedelta(
+            seconds=10)
+        self.job._last_full_sync = now
+        self.assertFalse(self.job._full_sync_needed())
+
+        self.job._last_full_sync = now - datetime.timedelta(
+            seconds=self.job.sync_interval + 1)
+        self.job.event_watcher.connected_since = (
+            self.job._last_full_sync - datetime.timedelta(seconds=1))
+        self.assertTrue(self.job._full_sync_needed())
+
+    def test_full_sync_needed_after_reconnect(self):
+        now = timeutils.utcnow()
+        self.job._last_full_sync = now - datetime.timedelta(seconds=10)
+        self.job.event_watcher.connected_since = now
+        self.assertTrue(self.job._full_sync_needed())
+
+    @mock.patch.object(objects.Container, 'get_by_uuid')
+    @mock.patch.object(objects.Capsule, 'list')
+    @mock.patch.object(objects.Container, 'list_by_host')
+    def test_sync_capsule_being_created(self, mock_list_by_host,
+                                        mock_capsule_list,
+                                        mock_get_container):
+        mock_list_by_host.return_value = []
+        capsule = objects.Capsule(self.context, **utils.get_test_capsule(
+            host=CONF.host, containers_uuids=['sandbox-uuid', 'new-uuid']))
+        mock_capsule_list.return_value = [capsule]
+        mock_get_container.return_value = objects.Container(
+            self.context, **utils.get_test_container(host=None))
+        with mock.patch.object(objects.Capsule, 'save') as mock_save:
+            self.job.sync_container_state(self.context)
+        self.assertFalse(mock_save.called)
+        self.assertEqual(CONF.host, capsule.host)